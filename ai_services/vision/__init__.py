@@ -1,5 +1,14 @@
 # Computer Vision Service Module
-
-from .vision_processor import VisionProcessor, vision_processor
+#
+# Exports are resolved lazily so that OCR worker processes (started with the
+# 'spawn' context) can import vision.ocr_workers without loading every model.
 
 __all__ = ['VisionProcessor', 'vision_processor']
+
+
+def __getattr__(name):
+    if name in __all__:
+        from .vision_processor import VisionProcessor, vision_processor
+        globals().update(VisionProcessor=VisionProcessor, vision_processor=vision_processor)
+        return globals()[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,64 @@
+"""
+OCR worker process helpers for EduAI Enhanced
+Each worker process owns its own EasyOCR reader; PyTorch models are not
+safe to share between threads, so independent OCR requests are spread
+across processes instead.
+
+This module deliberately avoids importing vision_processor: workers are
+started with the 'spawn' context and must not load the full model stack.
+"""
+
+import os
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+try:
+    import easyocr
+except ImportError:
+    easyocr = None
+
+try:
+    import pytesseract
+except ImportError:
+    pytesseract = None
+
+_reader = None
+
+
+def _init_worker_reader(languages: List[str]) -> None:
+    """Construit le lecteur EasyOCR une seule fois par processus worker"""
+    global _reader
+
+    gpu = False
+    try:
+        import torch
+        if torch.cuda.is_available():
+            gpu = True
+            # Répartit les workers sur les GPU disponibles
+            device_count = torch.cuda.device_count()
+            if device_count > 1:
+                torch.cuda.set_device(os.getpid() % device_count)
+    except ImportError:
+        pass
+
+    if easyocr is not None:
+        _reader = easyocr.Reader(languages, gpu=gpu)
+
+
+def _run_easyocr(image_array: np.ndarray) -> Optional[List[Dict[str, Any]]]:
+    """Exécute EasyOCR dans le worker; None si aucun lecteur n'est disponible"""
+    if _reader is None:
+        return None
+
+    return [
+        {"bbox": [[float(x), float(y)] for x, y in bbox], "text": text, "confidence": float(confidence)}
+        for bbox, text, confidence in _reader.readtext(image_array)
+    ]
+
+
+def _run_tesseract(image_array: np.ndarray) -> str:
+    """Exécute Tesseract dans le worker"""
+    if pytesseract is None:
+        return ""
+    return pytesseract.image_to_string(image_array)
@@ -5,9 +5,21 @@ educational augmented reality and visual assistance
 """
 
 import asyncio
+import atexit
+import bisect
+import contextlib
+import hashlib
+import multiprocessing
+import os
+import re
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import cached_property
+from statistics import fmean
 import cv2
 import numpy as np
-from typing import Dict, List, Optional, Any, Tuple
+from typing import Dict, List, Optional, Any, Tuple, Union, ClassVar, FrozenSet
 import torch
 import torchvision.transforms as transforms
 from transformers import (
@@ -15,13 +27,17 @@ from transformers import (
     TrOCRProcessor, VisionEncoderDecoderModel,
     DetrImageProcessor, DetrForObjectDetection
 )
+from transformers.modeling_outputs import BaseModelOutput
+from transformers.models.detr.modeling_detr import DetrObjectDetectionOutput
 from PIL import Image, ImageDraw, ImageFont
 import io
 import logging
 import base64
-from datetime import datetime
+from datetime import datetime, timezone
 import json
 
+from .ocr_workers import _init_worker_reader, _run_easyocr, _run_tesseract
+
 # Imports avec gestion d'erreur pour les modules optionnels
 try:
     import mediapipe as mp
@@ -55,8 +71,251 @@ except ImportError:
     ULTRALYTICS_AVAILABLE = False
     print("⚠️ Ultralytics non disponible")
 
+try:
+    import kornia
+    KORNIA_AVAILABLE = True
+except ImportError:
+    kornia = None
+    KORNIA_AVAILABLE = False
+    print("⚠️ Kornia non disponible")
+
+try:
+    import onnxruntime as ort
+    from onnxruntime.quantization import (
+        CalibrationDataReader, QuantFormat, QuantType, quantize_dynamic, quantize_static
+    )
+    ONNXRUNTIME_AVAILABLE = True
+except ImportError:
+    ort = None
+    CalibrationDataReader = object
+    ONNXRUNTIME_AVAILABLE = False
+    print("⚠️ ONNX Runtime non disponible")
+
+try:
+    from turbojpeg import TurboJPEG, TJPF_RGB
+    TURBOJPEG_AVAILABLE = True
+except ImportError:
+    TurboJPEG = None
+    TURBOJPEG_AVAILABLE = False
+    print("⚠️ PyTurboJPEG non disponible")
+
+try:
+    import pybase64
+    PYBASE64_AVAILABLE = True
+except ImportError:
+    pybase64 = None
+    PYBASE64_AVAILABLE = False
+    print("⚠️ pybase64 non disponible")
+
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    ahocorasick = None
+    AHOCORASICK_AVAILABLE = False
+    print("⚠️ pyahocorasick non disponible")
+
 logger = logging.getLogger(__name__)
 
+VISION_MODEL_CACHE = os.getenv("VISION_MODEL_CACHE", "models")
+
+# Images de calibration pour la quantification statique INT8 de YOLO
+YOLO_CALIBRATION_DIR = os.getenv("YOLO_CALIBRATION_DIR")
+YOLO_CALIBRATION_IMAGES = 100
+YOLO_IMAGE_SIZE = 640
+
+# Micro-batching de la détection d'objets
+DETECTION_MAX_BATCH = 8
+DETECTION_BATCH_WINDOW_MS = 15
+
+# Confiance EasyOCR au-delà de laquelle Tesseract et TrOCR ne sont pas essayés
+OCR_CONFIDENCE_THRESHOLD = 0.75
+# Longueur minimale d'un texte Tesseract avant de tenter TrOCR
+OCR_MIN_TEXT_LENGTH = 10
+
+# Pool OCR partagé par toutes les instances: un lecteur EasyOCR par processus
+_OCR_POOL: Optional[ProcessPoolExecutor] = None
+_OCR_POOL_LOCK = threading.Lock()
+
+def _shared_ocr_pool() -> Optional[ProcessPoolExecutor]:
+    """Crée au premier appel le pool de workers EasyOCR/Tesseract (EASYOCR_WORKERS=0: aucun)"""
+    global _OCR_POOL
+    with _OCR_POOL_LOCK:
+        if _OCR_POOL is None:
+            ocr_workers = int(os.getenv("EASYOCR_WORKERS", "2"))
+            if ocr_workers > 0 and (EASYOCR_AVAILABLE or PYTESSERACT_AVAILABLE):
+                _OCR_POOL = ProcessPoolExecutor(
+                    max_workers=ocr_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_worker_reader,
+                    initargs=(['en', 'fr', 'es', 'de'],)
+                )
+        return _OCR_POOL
+
+@atexit.register
+def shutdown_ocr_pool() -> None:
+    """Arrête le pool OCR partagé sans attendre les tâches en cours"""
+    global _OCR_POOL
+    with _OCR_POOL_LOCK:
+        if _OCR_POOL is not None:
+            _OCR_POOL.shutdown(wait=False, cancel_futures=True)
+            _OCR_POOL = None
+
+# Nombre d'images dont la caption et les objets restent mémorisés
+INFERENCE_CACHE_SIZE = 64
+
+class CudaGraphEncoder:
+    """Rejoue un graphe CUDA capturé pour un encodeur vision à forme d'entrée fixe
+
+    Les entrées de forme différente (ou l'absence de GPU) passent par le
+    forward classique de l'encodeur.
+    """
+    
+    def __init__(self, encoder: torch.nn.Module, input_shape: Tuple[int, ...], device: torch.device):
+        self.encoder = encoder
+        self.input_shape = tuple(input_shape)
+        self.graph = None
+        self._lock = threading.Lock()
+        
+        if device.type != "cuda":
+            return
+        
+        try:
+            self.static_input = torch.zeros(self.input_shape, device=device)
+            
+            # Warmup sur un stream dédié, requis avant la capture
+            warmup_stream = torch.cuda.Stream()
+            warmup_stream.wait_stream(torch.cuda.current_stream())
+            with torch.no_grad(), torch.cuda.stream(warmup_stream):
+                for _ in range(3):
+                    encoder(pixel_values=self.static_input)
+            torch.cuda.current_stream().wait_stream(warmup_stream)
+            torch.cuda.synchronize()
+            
+            graph = torch.cuda.CUDAGraph()
+            with torch.no_grad(), torch.cuda.graph(graph):
+                self.static_output = encoder(pixel_values=self.static_input)[0]
+            self.graph = graph
+        except Exception as e:
+            logger.warning(f"CUDA graph capture failed, using eager encoder: {e}")
+            self.graph = None
+    
+    def __call__(self, pixel_values: torch.Tensor) -> torch.Tensor:
+        """Renvoie le last_hidden_state de l'encodeur"""
+        if self.graph is None or tuple(pixel_values.shape) != self.input_shape:
+            with torch.no_grad():
+                return self.encoder(pixel_values=pixel_values)[0]
+        
+        with self._lock:
+            self.static_input.copy_(pixel_values)
+            self.graph.replay()
+            return self.static_output.clone()
+
+class _PixelValuesWrapper(torch.nn.Module):
+    """Expose les sorties d'un modèle HF sous forme de tuple pour l'export ONNX"""
+    
+    def __init__(self, model: torch.nn.Module, output_names: Tuple[str, ...]):
+        super().__init__()
+        self.model = model
+        self.output_names = output_names
+    
+    def forward(self, pixel_values: torch.Tensor):
+        outputs = self.model(pixel_values=pixel_values)
+        return tuple(outputs[name] for name in self.output_names)
+
+class OrtInt8Model:
+    """Modèle vision exporté en ONNX et quantifié INT8 (dynamique) pour le CPU
+
+    L'export et la quantification sont faits une seule fois puis mis en cache
+    dans VISION_MODEL_CACHE.
+    """
+    
+    def __init__(self, model: torch.nn.Module, name: str, sample_input: torch.Tensor,
+                 output_names: Tuple[str, ...], dynamic_axes: Optional[Dict[str, Dict[int, str]]] = None):
+        onnx_path = os.path.join(VISION_MODEL_CACHE, f"{name}.onnx")
+        int8_path = os.path.join(VISION_MODEL_CACHE, f"{name}_int8.onnx")
+        
+        if not os.path.exists(int8_path):
+            os.makedirs(VISION_MODEL_CACHE, exist_ok=True)
+            torch.onnx.export(
+                _PixelValuesWrapper(model, output_names),
+                (sample_input,),
+                onnx_path,
+                input_names=["pixel_values"],
+                output_names=list(output_names),
+                dynamic_axes=dynamic_axes,
+                opset_version=17
+            )
+            quantize_dynamic(onnx_path, int8_path, weight_type=QuantType.QInt8)
+        
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        self.session = ort.InferenceSession(int8_path, options, providers=["CPUExecutionProvider"])
+    
+    def run(self, pixel_values: torch.Tensor) -> List[torch.Tensor]:
+        outputs = self.session.run(None, {"pixel_values": pixel_values.cpu().numpy()})
+        return [torch.from_numpy(output) for output in outputs]
+    
+    def __call__(self, pixel_values: torch.Tensor) -> torch.Tensor:
+        """Renvoie la première sortie (last_hidden_state pour un encodeur)"""
+        return self.run(pixel_values)[0]
+
+class _YoloCalibrationReader(CalibrationDataReader):
+    """Fournit des images du corpus pédagogique à quantize_static (NCHW, [0, 1])"""
+    
+    def __init__(self, image_dir: str, input_name: str):
+        paths = sorted(
+            os.path.join(image_dir, filename) for filename in os.listdir(image_dir)
+            if filename.lower().endswith((".jpg", ".jpeg", ".png"))
+        )
+        self._paths = iter(paths[:YOLO_CALIBRATION_IMAGES])
+        self._input_name = input_name
+    
+    def get_next(self) -> Optional[Dict[str, np.ndarray]]:
+        for path in self._paths:
+            image = cv2.imread(path)
+            if image is None:
+                continue
+            image = cv2.resize(image, (YOLO_IMAGE_SIZE, YOLO_IMAGE_SIZE))
+            tensor = cv2.cvtColor(image, cv2.COLOR_BGR2RGB).transpose(2, 0, 1)[None]
+            return {self._input_name: np.ascontiguousarray(tensor, dtype=np.float32) / 255.0}
+        return None
+
+def _export_yolo_int8(yolo_model) -> str:
+    """Exporte YOLO en ONNX puis le quantifie en INT8; renvoie le chemin du modèle
+    
+    La quantification est statique (QDQ) si YOLO_CALIBRATION_DIR est fourni,
+    dynamique sinon. Les métadonnées Ultralytics (noms de classes, stride...)
+    sont recopiées pour que YOLO(int8_path) produise les mêmes résultats.
+    """
+    import onnx
+    
+    int8_path = os.path.join(VISION_MODEL_CACHE, "yolov8n_int8.onnx")
+    if os.path.exists(int8_path):
+        return int8_path
+    
+    os.makedirs(VISION_MODEL_CACHE, exist_ok=True)
+    onnx_path = yolo_model.export(format="onnx", imgsz=YOLO_IMAGE_SIZE, dynamic=True)
+    
+    if YOLO_CALIBRATION_DIR and os.path.isdir(YOLO_CALIBRATION_DIR):
+        input_name = onnx.load(onnx_path, load_external_data=False).graph.input[0].name
+        quantize_static(
+            onnx_path, int8_path,
+            _YoloCalibrationReader(YOLO_CALIBRATION_DIR, input_name),
+            quant_format=QuantFormat.QDQ,
+            activation_type=QuantType.QUInt8,
+            weight_type=QuantType.QInt8
+        )
+    else:
+        quantize_dynamic(onnx_path, int8_path, weight_type=QuantType.QUInt8)
+    
+    source = onnx.load(onnx_path)
+    quantized = onnx.load(int8_path)
+    if not quantized.metadata_props:
+        quantized.metadata_props.extend(source.metadata_props)
+        onnx.save(quantized, int8_path)
+    return int8_path
+
 class AdvancedLearningVisualization:
     """Advanced visualization engine for learning processes"""
     
@@ -170,6 +429,9 @@ class AdvancedLearningVisualization:
 class MetacognitionEngine:
     """Revolutionary metacognition system for AI-driven learning"""
     
+    _SELF_CORRECT_RE = re.compile(r"\b(actually|wait|correction)\b", re.IGNORECASE)
+    _WHY_RE = re.compile(r"\bwhy\b", re.IGNORECASE)
+    
     def __init__(self):
         self.thinking_patterns = {}
         self.learning_strategies = {}
@@ -222,11 +484,10 @@ class MetacognitionEngine:
         time_spent = session.get("time_metrics", {})
         
         patterns = {
-            "response_depth": np.mean([len(r.get("content", "").split()) for r in responses]) if responses else 0,
-            "reflection_frequency": len([r for r in responses if "why" in r.get("content", "").lower()]),
-            "question_asking": len([r for r in responses if "?" in r.get("content", "")]),
-            "self_correction": len([r for r in responses if any(word in r.get("content", "").lower() 
-                                                               for word in ["actually", "wait", "correction"])]),
+            "response_depth": (sum(len(r.get("content", "").split()) for r in responses) / len(responses)) if responses else 0,
+            "reflection_frequency": sum(1 for r in responses if self._WHY_RE.search(r.get("content", ""))),
+            "question_asking": sum(1 for r in responses if "?" in r.get("content", "")),
+            "self_correction": sum(1 for r in responses if self._SELF_CORRECT_RE.search(r.get("content", ""))),
             "thinking_speed": time_spent.get("average_response_time", 30)
         }
         
@@ -260,7 +521,7 @@ class MetacognitionEngine:
             }
         
         # Overall strategy assessment
-        overall_effectiveness = np.mean(list(s["effectiveness"] for s in strategy_effectiveness.values())) if strategy_effectiveness else 0.5
+        overall_effectiveness = fmean(s["effectiveness"] for s in strategy_effectiveness.values()) if strategy_effectiveness else 0.5
         
         return {
             "individual_strategies": strategy_effectiveness,
@@ -383,12 +644,30 @@ class MetacognitionEngine:
 class VisionProcessor:
     """Advanced Vision Processor for Visual Learning"""
     
+    _DEFAULT_FONT: ClassVar[ImageFont.ImageFont] = ImageFont.load_default()
+    
     def __init__(self):
         self.device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
+        self._io_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="vision-io")
+        self._decode_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="vision-decode")
+        # Inférence hors de la boucle d'événements: un seul thread sur GPU, un par cœur sur CPU
+        self._infer_pool = ThreadPoolExecutor(
+            max_workers=1 if self.device.type == "cuda" else (os.cpu_count() or 1),
+            thread_name_prefix="vision-infer"
+        )
+        self._turbo_jpeg = self._create_turbo_jpeg()
+        self._ocr_stream = torch.cuda.Stream() if self.device.type == "cuda" else None
+        self._detect_queue: Optional[asyncio.Queue] = None
+        self._detection_task: Optional[asyncio.Task] = None
+        self._detection_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._inference_cache: "OrderedDict[bytes, Dict[str, Any]]" = OrderedDict()
+        # Sérialise le chargement paresseux de TrOCR et EasyOCR entre threads
+        self._ocr_load_lock = threading.Lock()
         self.learning_viz = AdvancedLearningVisualization()
         self.metacognition_engine = MetacognitionEngine()
         self._initialize_models()
         self.educational_objects = self._load_educational_objects_catalog()
+        self._aho = self._build_educational_automaton()
         
     def _initialize_models(self):
         """Initialize all computer vision models"""
@@ -397,23 +676,21 @@ class VisionProcessor:
             self.image_caption_processor = BlipProcessor.from_pretrained("Salesforce/blip-image-captioning-base")
             self.image_caption_model = BlipForConditionalGeneration.from_pretrained("Salesforce/blip-image-captioning-base")
             
-            # Advanced OCR model (TrOCR)
-            try:
-                self.ocr_processor = TrOCRProcessor.from_pretrained("microsoft/trocr-base-printed")
-                self.ocr_model = VisionEncoderDecoderModel.from_pretrained("microsoft/trocr-base-printed")
-            except Exception as e:
-                logger.warning(f"TrOCR model not available: {e}")
-                self.ocr_processor = None
-                self.ocr_model = None
+            # Advanced OCR model (TrOCR) and in-process EasyOCR are loaded lazily
+            # off the event loop, see _load_ocr_model
             
             # Object detection model (DETR)
             try:
                 self.object_processor = DetrImageProcessor.from_pretrained("facebook/detr-resnet-50")
                 self.object_model = DetrForObjectDetection.from_pretrained("facebook/detr-resnet-50")
+                # Table des classes indexée par entier (évite un hachage par détection)
+                id2label = self.object_model.config.id2label
+                self._id2label = [id2label.get(i, "unknown") for i in range(max(id2label) + 1)]
             except Exception as e:
                 logger.warning(f"DETR model not available: {e}")
                 self.object_processor = None
                 self.object_model = None
+                self._id2label = []
             
             # YOLO for fast detection
             try:
@@ -433,12 +710,18 @@ class VisionProcessor:
                 logger.warning(f"MediaPipe not available: {e}")
                 self.mp_hands = None
             
-            # EasyOCR for multilingual OCR
+            # EasyOCR for multilingual OCR, one reader per worker process
+            # (pool shared by every VisionProcessor, see _shared_ocr_pool)
+            self._ocr_pool = None
             try:
-                self.easy_ocr_reader = easyocr.Reader(['en', 'fr', 'es', 'de'])
+                self._ocr_pool = _shared_ocr_pool()
             except Exception as e:
-                logger.warning(f"EasyOCR not available: {e}")
-                self.easy_ocr_reader = None
+                logger.warning(f"EasyOCR worker pool not available: {e}")
+            
+            self._move_models_to_device()
+            self._capture_cuda_graphs()
+            self._load_cpu_int8_sessions()
+            self._quantize_cpu_models()
             
             logger.info("Computer vision models initialized successfully")
             
@@ -446,6 +729,157 @@ class VisionProcessor:
             logger.error(f"Error initializing vision models: {e}")
             raise
 
+    def close(self):
+        """Arrête les pools de threads de l'instance (le pool OCR partagé est
+        arrêté par shutdown_ocr_pool, enregistré avec atexit)"""
+        for pool in (self._io_pool, self._decode_pool, self._infer_pool):
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def _move_models_to_device(self):
+        """Place les modèles transformers sur le device en mode inférence"""
+        for model in (self.image_caption_model, self.object_model):
+            if model is not None:
+                model.to(self.device).eval()
+
+    def _capture_cuda_graphs(self):
+        """Capture des graphes CUDA pour les encodeurs à taille d'entrée fixe (BLIP, TrOCR)
+
+        DETR redimensionne selon le ratio de l'image: sa forme d'entrée n'est pas
+        fixe, il reste donc en exécution classique.
+        """
+        self._blip_encoder = None
+        if self.device.type != "cuda":
+            return
+        
+        self._blip_encoder = CudaGraphEncoder(
+            self.image_caption_model.vision_model,
+            self._encoder_input_shape(self.image_caption_processor),
+            self.device
+        )
+
+    @staticmethod
+    def _encoder_input_shape(processor) -> Tuple[int, int, int, int]:
+        size = processor.image_processor.size
+        return (1, 3, size["height"], size["width"])
+
+    @cached_property
+    def _trocr(self) -> Tuple[Optional[TrOCRProcessor], Optional[VisionEncoderDecoderModel], Optional[CudaGraphEncoder]]:
+        """Charge TrOCR au premier usage: (processor, modèle, encodeur graphe CUDA)"""
+        try:
+            processor = TrOCRProcessor.from_pretrained("microsoft/trocr-base-printed")
+            model = VisionEncoderDecoderModel.from_pretrained("microsoft/trocr-base-printed")
+            model.to(self.device).eval()
+        except Exception as e:
+            logger.warning(f"TrOCR model not available: {e}")
+            return None, None, None
+        
+        encoder = None
+        if self.device.type == "cuda":
+            encoder = CudaGraphEncoder(model.encoder, self._encoder_input_shape(processor), self.device)
+        return processor, model, encoder
+
+    @property
+    def ocr_processor(self) -> Optional[TrOCRProcessor]:
+        return self._trocr[0]
+
+    @property
+    def ocr_model(self) -> Optional[VisionEncoderDecoderModel]:
+        return self._trocr[1]
+
+    @property
+    def _trocr_encoder(self) -> Optional[CudaGraphEncoder]:
+        return self._trocr[2]
+
+    @cached_property
+    def easy_ocr_reader(self) -> Optional[Any]:
+        """Lecteur EasyOCR en processus, chargé au premier usage sans pool de workers"""
+        if self._ocr_pool is not None or not EASYOCR_AVAILABLE:
+            return None
+        try:
+            return easyocr.Reader(['en', 'fr', 'es', 'de'])
+        except Exception as e:
+            logger.warning(f"EasyOCR not available: {e}")
+            return None
+
+    async def _load_ocr_model(self, name: str) -> Any:
+        """Renvoie un modèle OCR paresseux (`_trocr`, `easy_ocr_reader`), chargé dans le pool d'I/O"""
+        if name not in self.__dict__:
+            await asyncio.get_running_loop().run_in_executor(
+                self._io_pool, self._load_ocr_model_sync, name
+            )
+        return self.__dict__[name]
+
+    def _load_ocr_model_sync(self, name: str) -> Any:
+        with self._ocr_load_lock:
+            return getattr(self, name)
+
+    async def _trocr_available(self) -> bool:
+        processor, model, _ = await self._load_ocr_model("_trocr")
+        return processor is not None and model is not None
+
+    def _load_cpu_int8_sessions(self):
+        """Sessions ONNX Runtime INT8 pour YOLO, l'encodeur BLIP et DETR sans GPU"""
+        self._detr_ort = None
+        if self.device.type != "cpu" or not ONNXRUNTIME_AVAILABLE:
+            return
+        
+        if self.yolo_model is not None:
+            try:
+                from ultralytics import YOLO
+                # Ultralytics sert le modèle ONNX via onnxruntime et renvoie les
+                # mêmes objets Results (boxes.cls/conf/xyxy) que le modèle PyTorch
+                self.yolo_model = YOLO(_export_yolo_int8(self.yolo_model), task="detect")
+            except Exception as e:
+                logger.warning(f"YOLO INT8 export failed, using FP32: {e}")
+        
+        try:
+            size = self.image_caption_processor.image_processor.size
+            self._blip_encoder = OrtInt8Model(
+                self.image_caption_model.vision_model,
+                "blip_vision",
+                torch.zeros(1, 3, size["height"], size["width"]),
+                ("last_hidden_state",),
+                {"pixel_values": {0: "batch"}}
+            )
+        except Exception as e:
+            logger.warning(f"BLIP INT8 export failed, using FP32: {e}")
+        
+        if self.object_model is not None:
+            try:
+                self._detr_ort = OrtInt8Model(
+                    self.object_model,
+                    "detr_resnet50",
+                    torch.zeros(1, 3, 800, 800),
+                    ("logits", "pred_boxes"),
+                    {"pixel_values": {0: "batch", 2: "height", 3: "width"}}
+                )
+            except Exception as e:
+                logger.warning(f"DETR INT8 export failed, using FP32: {e}")
+
+    def _quantize_cpu_models(self):
+        """Quantification dynamique INT8 des couches Linear de BLIP et DETR sur CPU
+
+        Seules les couches Linear sont quantifiées: LayerNorm et embeddings
+        restent en FP32. Les parties déjà servies par ONNX Runtime sont laissées
+        telles quelles.
+        """
+        if self.device.type != "cpu":
+            return
+        
+        def quantize(module: torch.nn.Module) -> torch.nn.Module:
+            return torch.ao.quantization.quantize_dynamic(module, {torch.nn.Linear}, dtype=torch.qint8)
+        
+        try:
+            if isinstance(self._blip_encoder, OrtInt8Model):
+                self.image_caption_model.text_decoder = quantize(self.image_caption_model.text_decoder)
+            else:
+                self.image_caption_model = quantize(self.image_caption_model)
+            
+            if self.object_model is not None and self._detr_ort is None:
+                self.object_model = quantize(self.object_model)
+        except Exception as e:
+            logger.warning(f"INT8 dynamic quantization failed, using FP32: {e}")
+
     async def analyze_image(self, image_data: bytes, analysis_type: str = "comprehensive") -> Dict[str, Any]:
         """Analyse complète d'une image pour le contexte éducatif"""
         try:
@@ -454,26 +888,48 @@ class VisionProcessor:
             if image is None:
                 return {"error": "Image non valide"}
             
+            # Vue NumPy calculée une fois et partagée par les étapes qui en ont besoin
+            image_array = np.asarray(image)
+            
             analysis_result = {
                 "image_info": await self._get_image_info(image),
-                "timestamp": datetime.now().isoformat()
+                "timestamp": datetime.now(timezone.utc).isoformat()
             }
             
+            # Caption et objets calculés une seule fois, puis partagés
+            caption_result = None
+            objects_result = None
+            cached = self._get_cached_inference(image_data)
+            
+            if analysis_type in ["comprehensive", "caption", "scene"]:
+                caption_result = cached.get("caption") or await self._generate_image_caption(image)
+                if caption_result.get("confidence"):
+                    cached["caption"] = caption_result
+            
+            if analysis_type in ["comprehensive", "objects", "educational", "scene"]:
+                objects_result = cached.get("objects") or await self._detect_objects(image)
+                if "detection_method" in objects_result:
+                    cached["objects"] = objects_result
+            
             # Analyse selon le type demandé
             if analysis_type in ["comprehensive", "caption"]:
-                analysis_result["caption"] = await self._generate_image_caption(image)
+                analysis_result["caption"] = caption_result
             
             if analysis_type in ["comprehensive", "objects"]:
-                analysis_result["objects"] = await self._detect_objects(image)
+                analysis_result["objects"] = objects_result
             
             if analysis_type in ["comprehensive", "text"]:
-                analysis_result["text_content"] = await self._extract_text_from_image(image)
+                analysis_result["text_content"] = await self._extract_text_from_image(image, image_array)
             
             if analysis_type in ["comprehensive", "educational"]:
-                analysis_result["educational_analysis"] = await self._analyze_educational_content(image)
+                analysis_result["educational_analysis"] = await self._analyze_educational_content(
+                    objects_result.get("objects", [])
+                )
             
             if analysis_type in ["comprehensive", "scene"]:
-                analysis_result["scene_analysis"] = await self._analyze_scene_context(image)
+                analysis_result["scene_analysis"] = await self._analyze_scene_context(
+                    caption_result.get("caption", ""), objects_result.get("objects", [])
+                )
             
             # Génération d'insights éducatifs
             analysis_result["educational_insights"] = await self._generate_educational_insights(analysis_result)
@@ -491,8 +947,11 @@ class VisionProcessor:
             if image is None:
                 return {"error": "Image non valide"}
             
-            # Préprocessing pour l'écriture manuscrite
-            processed_image = await self._preprocess_for_handwriting(image)
+            # Préprocessing pour l'écriture manuscrite (sur GPU si Kornia est disponible)
+            if KORNIA_AVAILABLE:
+                processed_image = await self._preprocess_for_handwriting(self._decode_to_gpu(image))
+            else:
+                processed_image = await self._preprocess_for_handwriting(image)
             
             handwriting_result = {
                 "detected_text": "",
@@ -503,10 +962,10 @@ class VisionProcessor:
             }
             
             # OCR avec TrOCR (spécialisé pour l'écriture)
-            if self.ocr_processor and self.ocr_model:
-                pixel_values = self.ocr_processor(processed_image, return_tensors="pt").pixel_values
-                generated_ids = self.ocr_model.generate(pixel_values)
-                generated_text = self.ocr_processor.batch_decode(generated_ids, skip_special_tokens=True)[0]
+            if await self._trocr_available():
+                generated_text = await asyncio.get_running_loop().run_in_executor(
+                    self._infer_pool, self._run_trocr, processed_image
+                )
                 handwriting_result["detected_text"] = generated_text
                 handwriting_result["confidence"] = 0.8  # Score approximatif
             
@@ -541,15 +1000,15 @@ class VisionProcessor:
             if image is None:
                 return {"error": "Image non valide"}
             
-            # Conversion en format OpenCV
-            cv_image = cv2.cvtColor(np.array(image), cv2.COLOR_RGB2BGR)
+            # MediaPipe attend du RGB: l'image chargée l'est déjà
+            rgb_image = np.asarray(image)
             
             gesture_result = {
                 "gesture_type": gesture_type,
                 "detected_gestures": [],
                 "confidence": 0,
                 "educational_context": {},
-                "timestamp": datetime.now().isoformat()
+                "timestamp": datetime.now(timezone.utc).isoformat()
             }
             
             if gesture_type == "hands":
@@ -559,7 +1018,7 @@ class VisionProcessor:
                     max_num_hands=2,
                     min_detection_confidence=0.5
                 ) as hands:
-                    results = hands.process(cv2.cvtColor(cv_image, cv2.COLOR_BGR2RGB))
+                    results = hands.process(rgb_image)
                     
                     if results.multi_hand_landmarks:
                         for hand_landmarks in results.multi_hand_landmarks:
@@ -574,7 +1033,7 @@ class VisionProcessor:
                     model_complexity=2,
                     min_detection_confidence=0.5
                 ) as pose:
-                    results = pose.process(cv2.cvtColor(cv_image, cv2.COLOR_BGR2RGB))
+                    results = pose.process(rgb_image)
                     
                     if results.pose_landmarks:
                         pose_analysis = await self._analyze_pose_landmarks(results.pose_landmarks)
@@ -607,7 +1066,7 @@ class VisionProcessor:
                 "structure_analysis": {},
                 "educational_elements": {},
                 "accessibility": {},
-                "timestamp": datetime.now().isoformat()
+                "timestamp": datetime.now(timezone.utc).isoformat()
             }
             
             # Extraction de texte multi-méthodes
@@ -654,7 +1113,7 @@ class VisionProcessor:
                 "interactive_elements": [],
                 "explanatory_text": {},
                 "related_concepts": [],
-                "timestamp": datetime.now().isoformat()
+                "timestamp": datetime.now(timezone.utc).isoformat()
             }
             
             # Détection d'éléments pertinents pour le concept
@@ -711,15 +1170,15 @@ class VisionProcessor:
                 "comparison": {},
                 "score": 0,
                 "feedback": {},
-                "timestamp": datetime.now().isoformat()
+                "timestamp": datetime.now(timezone.utc).isoformat()
             }
             
-            # Analyse de l'image de référence
-            ref_analysis = await self.analyze_image(reference_image, "comprehensive")
+            # Analyse concurrente de l'image de référence et de celle de l'étudiant
+            ref_analysis, student_analysis = await asyncio.gather(
+                self.analyze_image(reference_image, "comprehensive"),
+                self.analyze_image(student_image, "comprehensive")
+            )
             assessment["reference_analysis"] = ref_analysis
-            
-            # Analyse de l'image de l'étudiant
-            student_analysis = await self.analyze_image(student_image, "comprehensive")
             assessment["student_analysis"] = student_analysis
             
             # Comparaison détaillée
@@ -746,23 +1205,23 @@ class VisionProcessor:
         """Génère une visualisation éducative basée sur un concept donné."""
         try:
             # Charger l'image
-            image = Image.open(io.BytesIO(image_data))
+            image = await self._load_image_from_bytes(image_data)
+            if image is None:
+                return {"error": "Image non valide"}
             draw = ImageDraw.Draw(image)
-            font = ImageFont.load_default()
+            font = self._DEFAULT_FONT
 
             # Ajouter des annotations éducatives
             draw.text((10, 10), f"Concept: {concept}", fill="black", font=font)
             draw.text((10, 30), f"Langue: {language}", fill="black", font=font)
 
-            # Convertir l'image en base64
-            buffered = io.BytesIO()
-            image.save(buffered, format="PNG")
-            encoded_image = base64.b64encode(buffered.getvalue()).decode("utf-8")
+            # Convertir l'image en base64 (encodage PNG hors de la boucle d'événements)
+            encoded_image = await self._image_to_base64(image)
 
             return {
                 "success": True,
                 "visualization": encoded_image,
-                "timestamp": datetime.now().isoformat()
+                "timestamp": datetime.now(timezone.utc).isoformat()
             }
         except Exception as e:
             logger.error(f"Erreur lors de la génération de la visualisation éducative: {e}")
@@ -797,7 +1256,7 @@ class VisionProcessor:
             return {
                 "success": True,
                 "analysis": analysis_result,
-                "timestamp": datetime.now().isoformat()
+                "timestamp": datetime.now(timezone.utc).isoformat()
             }
         except Exception as e:
             logger.error(f"Erreur lors de l'analyse multimodale: {e}")
@@ -806,16 +1265,139 @@ class VisionProcessor:
     # Méthodes utilitaires privées
 
     async def _load_image_from_bytes(self, image_data: bytes) -> Optional[Image.Image]:
-        """Charge une image depuis des bytes"""
+        """Charge une image depuis des bytes (décodage dans un pool de threads)"""
         try:
-            image = Image.open(io.BytesIO(image_data))
-            if image.mode != 'RGB':
-                image = image.convert('RGB')
-            return image
+            return await asyncio.get_running_loop().run_in_executor(
+                self._decode_pool, self._decode_sync, image_data
+            )
         except Exception as e:
             logger.error(f"Erreur lors du chargement d'image: {e}")
             return None
 
+    @staticmethod
+    def _create_turbo_jpeg() -> Optional[Any]:
+        """Instancie le décodeur libjpeg-turbo si la bibliothèque est présente"""
+        if not TURBOJPEG_AVAILABLE:
+            return None
+        try:
+            return TurboJPEG()
+        except Exception as e:
+            logger.warning(f"libjpeg-turbo not available: {e}")
+            return None
+
+    def _decode_sync(self, image_data: bytes) -> Image.Image:
+        """Décode une image en RGB; libjpeg-turbo pour le JPEG, Pillow sinon"""
+        if self._turbo_jpeg is not None and image_data[:2] == b"\xff\xd8":
+            array = self._turbo_jpeg.decode(image_data, pixel_format=TJPF_RGB)
+            image = Image.fromarray(array, 'RGB')
+            # Comme Image.open, pour les appelants qui lisent image.format
+            image.format = "JPEG"
+            return image
+        
+        image = Image.open(io.BytesIO(image_data))
+        # Image.open est paresseux: décoder ici, dans le pool, et non au premier
+        # accès aux pixels sur la boucle d'événements
+        image.load()
+        if image.mode != 'RGB':
+            image = image.convert('RGB')
+        return image
+
+    @staticmethod
+    def _b64encode(data: Any) -> str:
+        if PYBASE64_AVAILABLE:
+            return pybase64.b64encode_as_string(data)
+        return base64.b64encode(data).decode("ascii")
+
+    @classmethod
+    def _encode_png_base64(cls, image: Union[Image.Image, np.ndarray]) -> str:
+        """Encode une image (PIL ou tableau RGB) en PNG puis en base64
+
+        Les tableaux NumPy passent par cv2.imencode. Pour PIL, le tampon BytesIO
+        est lu sans copie; pybase64 (SIMD) produit directement la chaîne finale.
+        """
+        if isinstance(image, np.ndarray):
+            ok, png = cv2.imencode(".png", cv2.cvtColor(image, cv2.COLOR_RGB2BGR))
+            if not ok:
+                raise ValueError("PNG encoding failed")
+            return cls._b64encode(png)
+        
+        buffered = io.BytesIO()
+        image.save(buffered, format="PNG")
+        with buffered.getbuffer() as png_view:
+            return cls._b64encode(png_view)
+
+    async def _image_to_base64(self, image: Union[Image.Image, np.ndarray]) -> str:
+        """Encode une image en PNG base64 hors de la boucle d'événements"""
+        return await asyncio.get_running_loop().run_in_executor(
+            self._decode_pool, self._encode_png_base64, image
+        )
+
+    async def _create_annotated_image(self, image: Image.Image,
+                                      annotations: List[Dict[str, Any]]) -> np.ndarray:
+        """Dessine les annotations (bbox + libellé) avec OpenCV, renvoie un tableau RGB"""
+        return await asyncio.get_running_loop().run_in_executor(
+            self._decode_pool, self._draw_annotations, image, annotations
+        )
+
+    @staticmethod
+    def _draw_annotations(image: Image.Image, annotations: List[Dict[str, Any]]) -> np.ndarray:
+        canvas = np.array(image)
+        for annotation in annotations:
+            bbox = annotation.get("bbox")
+            if not bbox or len(bbox) < 4:
+                continue
+            x1, y1, x2, y2 = (int(round(value)) for value in bbox[:4])
+            cv2.rectangle(canvas, (x1, y1), (x2, y2), (0, 255, 0), 2)
+            label = annotation.get("label") or annotation.get("object") or ""
+            if label:
+                cv2.putText(canvas, str(label), (x1, max(y1 - 5, 10)), cv2.FONT_HERSHEY_SIMPLEX,
+                            0.5, (0, 255, 0), 1, cv2.LINE_AA)
+        return canvas
+
+    def _get_cached_inference(self, image_data: bytes) -> Dict[str, Any]:
+        """Résultats caption/objets mémorisés pour une image déjà analysée (LRU)"""
+        key = hashlib.blake2b(image_data, digest_size=16).digest()
+        entry = self._inference_cache.get(key)
+        if entry is None:
+            entry = {}
+            self._inference_cache[key] = entry
+            if len(self._inference_cache) > INFERENCE_CACHE_SIZE:
+                self._inference_cache.popitem(last=False)
+        else:
+            self._inference_cache.move_to_end(key)
+        return entry
+
+    def _decode_to_gpu(self, image: Image.Image) -> torch.Tensor:
+        """Convertit une image PIL en tenseur (1, 3, H, W) normalisé sur le device"""
+        array = np.asarray(image, dtype=np.uint8)
+        tensor = torch.from_numpy(array).to(self.device, non_blocking=True)
+        return tensor.permute(2, 0, 1).unsqueeze(0).float().div_(255.0)
+
+    async def _preprocess_for_handwriting(self, image: Any) -> Image.Image:
+        """Prépare l'image pour la reconnaissance d'écriture manuscrite
+
+        Accepte un tenseur (B, 3, H, W) déjà sur le device (chemin Kornia) ou une
+        image PIL (chemin OpenCV). Renvoie une image PIL RGB binarisée pour TrOCR.
+        """
+        if isinstance(image, torch.Tensor):
+            with torch.no_grad():
+                gray = kornia.color.rgb_to_grayscale(image)
+                gray = kornia.enhance.equalize_clahe(gray, clip_limit=2.0, grid_size=(8, 8))
+                gray = kornia.filters.gaussian_blur2d(gray, (3, 3), (1.0, 1.0))
+                # Seuillage adaptatif: pixel comparé à la moyenne locale 11x11
+                local_mean = kornia.filters.box_blur(gray, (11, 11))
+                binary = (gray > local_mean - 2.0 / 255.0).to(torch.uint8).mul_(255)
+            array = binary[0, 0].cpu().numpy()
+            return Image.fromarray(array).convert('RGB')
+
+        gray = cv2.cvtColor(np.asarray(image), cv2.COLOR_RGB2GRAY)
+        gray = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8, 8)).apply(gray)
+        gray = cv2.GaussianBlur(gray, (3, 3), 1.0)
+        binary = cv2.adaptiveThreshold(
+            gray, 255, cv2.ADAPTIVE_THRESH_MEAN_C, cv2.THRESH_BINARY, 11, 2
+        )
+        return Image.fromarray(binary).convert('RGB')
+
     async def _get_image_info(self, image: Image.Image) -> Dict[str, Any]:
         """Obtient les informations de base de l'image"""
         return {
@@ -823,15 +1405,15 @@ class VisionProcessor:
             "height": image.height,
             "format": image.format,
             "mode": image.mode,
-            "size_bytes": len(image.tobytes()) if hasattr(image, 'tobytes') else 0
+            "size_bytes": image.width * image.height * len(image.getbands())
         }
 
     async def _generate_image_caption(self, image: Image.Image) -> Dict[str, Any]:
         """Génère une description de l'image"""
         try:
-            inputs = self.image_caption_processor(image, return_tensors="pt")
-            out = self.image_caption_model.generate(**inputs, max_length=50)
-            caption = self.image_caption_processor.decode(out[0], skip_special_tokens=True)
+            caption = await asyncio.get_running_loop().run_in_executor(
+                self._infer_pool, self._generate_image_caption_sync, image
+            )
             
             return {
                 "caption": caption,
@@ -842,43 +1424,122 @@ class VisionProcessor:
             logger.error(f"Erreur génération caption: {e}")
             return {"caption": "Unable to generate caption", "confidence": 0}
 
-    async def _detect_objects(self, image: Image.Image) -> Dict[str, Any]:
-        """Détecte les objets dans l'image"""
-        detected_objects = []
+    def _autocast(self):
+        """Précision mixte FP16 sur GPU; sans effet sur CPU"""
+        if self.device.type == "cuda":
+            return torch.autocast("cuda", dtype=torch.float16)
+        return contextlib.nullcontext()
+
+    def _generate_image_caption_sync(self, image: Image.Image) -> str:
+        with torch.inference_mode():
+            inputs = self.image_caption_processor(image, return_tensors="pt").to(self.device, non_blocking=True)
+            with self._autocast():
+                if self._blip_encoder is not None:
+                    out = self._blip_generate_from_encoder(inputs.pixel_values, max_length=50)
+                else:
+                    out = self.image_caption_model.generate(**inputs, max_length=50)
+        return self.image_caption_processor.decode(out[0], skip_special_tokens=True)
+
+    def _blip_generate_from_encoder(self, pixel_values: torch.Tensor, **generate_kwargs) -> torch.Tensor:
+        """Génération BLIP avec l'encodeur vision rejoué depuis son graphe CUDA
+
+        Reprend BlipForConditionalGeneration.generate, en remplaçant l'appel
+        au vision_model par le graphe capturé.
+        """
+        model = self.image_caption_model
+        text_config = model.config.text_config
+        image_embeds = self._blip_encoder(pixel_values)
+        image_attention_mask = torch.ones(image_embeds.shape[:-1], dtype=torch.long, device=image_embeds.device)
         
+        input_ids = torch.full(
+            (pixel_values.shape[0], 1), text_config.bos_token_id, dtype=torch.long, device=image_embeds.device
+        )
+        return model.text_decoder.generate(
+            input_ids=input_ids,
+            eos_token_id=text_config.sep_token_id,
+            pad_token_id=text_config.pad_token_id,
+            encoder_hidden_states=image_embeds,
+            encoder_attention_mask=image_attention_mask,
+            **generate_kwargs
+        )
+
+    def _run_trocr(self, image: Union[Image.Image, np.ndarray]) -> str:
+        """Reconnaissance TrOCR d'une image (encodeur via graphe CUDA si disponible)"""
+        pixel_values = self.ocr_processor(image, return_tensors="pt").pixel_values
+        return self._trocr_generate(pixel_values)[0]
+
+    def _trocr_generate(self, pixel_values: torch.Tensor) -> List[str]:
+        """Génère le texte TrOCR pour un lot de pixel_values (B, 3, H, W)
+
+        Sur GPU, la copie hôte→device et l'inférence sont placées sur un stream
+        dédié afin de ne pas sérialiser avec le reste du travail GPU.
+        """
+        with torch.inference_mode(), self._autocast():
+            if self._ocr_stream is not None:
+                with torch.cuda.stream(self._ocr_stream):
+                    pixel_values = pixel_values.pin_memory().to(self.device, non_blocking=True)
+                    generated_ids = self._trocr_forward(pixel_values)
+                self._ocr_stream.synchronize()
+            else:
+                generated_ids = self._trocr_forward(pixel_values.to(self.device))
+        return self.ocr_processor.batch_decode(generated_ids, skip_special_tokens=True)
+
+    def _trocr_forward(self, pixel_values: torch.Tensor) -> torch.Tensor:
+        if self._trocr_encoder is not None:
+            encoder_outputs = BaseModelOutput(last_hidden_state=self._trocr_encoder(pixel_values))
+            return self.ocr_model.generate(encoder_outputs=encoder_outputs)
+        return self.ocr_model.generate(pixel_values)
+
+    def _preprocess_region(self, image: Image.Image, bbox: List[List[float]]) -> torch.Tensor:
+        """Découpe une région de texte et la prépare pour TrOCR"""
+        xs = [point[0] for point in bbox]
+        ys = [point[1] for point in bbox]
+        crop = image.crop((int(min(xs)), int(min(ys)), int(max(xs)) + 1, int(max(ys)) + 1))
+        return self.ocr_processor(crop, return_tensors="pt").pixel_values
+
+    async def _extract_text_comprehensive(self, image: Image.Image) -> Dict[str, Any]:
+        """Extraction de texte multi-méthodes avec relecture TrOCR par région
+
+        Les régions détectées sont découpées et prétraitées en parallèle dans un
+        pool de threads, puis reconnues en un seul lot TrOCR.
+        """
+        text_results = await self._extract_text_from_image(image)
+        regions = [region for region in text_results.get("text_regions", []) if region.get("bbox")]
+        
+        if regions and await self._trocr_available():
+            try:
+                loop = asyncio.get_running_loop()
+                pixel_batches = await asyncio.gather(*(
+                    loop.run_in_executor(self._io_pool, self._preprocess_region, image, region["bbox"])
+                    for region in regions
+                ))
+                region_texts = await loop.run_in_executor(
+                    self._infer_pool, self._trocr_generate, torch.cat(pixel_batches)
+                )
+                for region, region_text in zip(regions, region_texts):
+                    region["trocr_text"] = region_text
+                text_results["methods_used"].append("TrOCR")
+            except Exception as e:
+                logger.debug(f"TrOCR region pass failed: {e}")
+        
+        return text_results
+
+    async def _detect_objects(self, image: Image.Image) -> Dict[str, Any]:
+        """Détecte les objets dans l'image
+
+        Les appels concurrents sont regroupés par _detection_batcher en un seul
+        forward YOLO/DETR.
+        """
         try:
-            # Détection avec YOLO si disponible
-            if self.yolo_model:
-                results = self.yolo_model(image)
-                for result in results:
-                    boxes = result.boxes
-                    if boxes is not None:
-                        for box in boxes:
-                            detected_objects.append({
-                                "class": result.names[int(box.cls)],
-                                "confidence": float(box.conf),
-                                "bbox": box.xyxy.tolist()[0],
-                                "method": "YOLO"
-                            })
-            
-            # Détection avec DETR si YOLO non disponible
-            elif self.object_processor and self.object_model:
-                inputs = self.object_processor(images=image, return_tensors="pt")
-                outputs = self.object_model(**inputs)
-                
-                # Post-processing DETR
-                target_sizes = torch.tensor([image.size[::-1]])
-                results = self.object_processor.post_process_object_detection(
-                    outputs, target_sizes=target_sizes, threshold=0.5
-                )[0]
-                
-                for score, label, box in zip(results["scores"], results["labels"], results["boxes"]):
-                    detected_objects.append({
-                        "class": self.object_model.config.id2label[label.item()],
-                        "confidence": score.item(),
-                        "bbox": box.tolist(),
-                        "method": "DETR"
-                    })
+            loop = asyncio.get_running_loop()
+            if self._detection_task is None or self._detection_task.done() or self._detection_loop is not loop:
+                self._detect_queue = asyncio.Queue()
+                self._detection_loop = loop
+                self._detection_task = loop.create_task(self._detection_batcher())
+            
+            future = loop.create_future()
+            await self._detect_queue.put((image, future))
+            detected_objects = await future
             
             return {
                 "objects": detected_objects,
@@ -890,7 +1551,103 @@ class VisionProcessor:
             logger.error(f"Erreur détection objets: {e}")
             return {"objects": [], "total_objects": 0}
 
-    async def _extract_text_from_image(self, image: Image.Image) -> Dict[str, Any]:
+    async def _detection_batcher(self):
+        """Regroupe les demandes de détection arrivées dans la même fenêtre"""
+        loop = asyncio.get_running_loop()
+        window = DETECTION_BATCH_WINDOW_MS / 1000
+        
+        while True:
+            batch = [await self._detect_queue.get()]
+            deadline = loop.time() + window
+            while len(batch) < DETECTION_MAX_BATCH:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._detect_queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            
+            try:
+                results = await loop.run_in_executor(
+                    self._infer_pool, self._run_detection_batch, [image for image, _ in batch]
+                )
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            
+            for (_, future), detected_objects in zip(batch, results):
+                if not future.done():
+                    future.set_result(detected_objects)
+
+    def _run_detection_batch(self, images: List[Image.Image]) -> List[List[Dict[str, Any]]]:
+        """Détection d'objets sur un lot d'images, un résultat par image"""
+        batch_objects = [[] for _ in images]
+        
+        # Détection avec YOLO si disponible
+        if self.yolo_model:
+            results = self.yolo_model(images)
+            for detected_objects, result in zip(batch_objects, results):
+                boxes = result.boxes
+                if boxes is not None:
+                    # Une conversion tenseur→liste par champ plutôt qu'une par boîte
+                    names = result.names
+                    cls_ids = boxes.cls.int().tolist()
+                    confidences = boxes.conf.tolist()
+                    xyxys = boxes.xyxy.tolist()
+                    for cls_id, confidence, bbox in zip(cls_ids, confidences, xyxys):
+                        detected_objects.append({
+                            "class": names[cls_id],
+                            "confidence": confidence,
+                            "bbox": bbox,
+                            "method": "YOLO"
+                        })
+        
+        # Détection avec DETR si YOLO non disponible
+        elif self.object_processor and self.object_model:
+            with torch.inference_mode():
+                if self._detr_ort is not None:
+                    # Le modèle ONNX n'a pas d'entrée pixel_mask: un lot d'images de
+                    # tailles différentes serait complété par des zones prises pour
+                    # des pixels réels. Une image par passe, sans padding.
+                    per_image = [
+                        self._detr_ort.run(self.object_processor(images=image, return_tensors="pt")["pixel_values"])
+                        for image in images
+                    ]
+                    outputs = DetrObjectDetectionOutput(
+                        logits=torch.cat([logits for logits, _ in per_image]),
+                        pred_boxes=torch.cat([pred_boxes for _, pred_boxes in per_image])
+                    )
+                else:
+                    inputs = self.object_processor(images=images, return_tensors="pt").to(self.device, non_blocking=True)
+                    with self._autocast():
+                        outputs = self.object_model(**inputs)
+                
+                # Post-processing DETR
+                target_sizes = torch.tensor([image.size[::-1] for image in images], device=self.device)
+                results = self.object_processor.post_process_object_detection(
+                    outputs, target_sizes=target_sizes, threshold=0.5
+                )
+            
+            id2label = self._id2label
+            for detected_objects, result in zip(batch_objects, results):
+                scores = result["scores"].tolist()
+                labels = result["labels"].tolist()
+                boxes = result["boxes"].tolist()
+                for score, label, box in zip(scores, labels, boxes):
+                    detected_objects.append({
+                        "class": id2label[label],
+                        "confidence": score,
+                        "bbox": box,
+                        "method": "DETR"
+                    })
+        
+        return batch_objects
+
+    async def _extract_text_from_image(self, image: Image.Image,
+                                       image_array: Optional[np.ndarray] = None) -> Dict[str, Any]:
         """Extrait le texte de l'image avec plusieurs méthodes"""
         text_results = {
             "extracted_text": "",
@@ -900,60 +1657,80 @@ class VisionProcessor:
         }
         
         try:
+            if image_array is None:
+                image_array = np.asarray(image)
+            loop = asyncio.get_running_loop()
+
             # Méthode 1: EasyOCR (multilingue)
-            if self.easy_ocr_reader:
+            easy_ocr_reader = None if self._ocr_pool else await self._load_ocr_model("easy_ocr_reader")
+            if self._ocr_pool or easy_ocr_reader:
                 try:
-                    results = self.easy_ocr_reader.readtext(np.array(image))
-                    easy_ocr_text = " ".join([result[1] for result in results])
-                    text_results["extracted_text"] = easy_ocr_text
-                    text_results["methods_used"].append("EasyOCR")
-                    
-                    # Régions de texte
-                    for result in results:
-                        text_results["text_regions"].append({
-                            "text": result[1],
-                            "bbox": result[0],
-                            "confidence": result[2]
-                        })
+                    if self._ocr_pool:
+                        regions = await loop.run_in_executor(self._ocr_pool, _run_easyocr, image_array)
+                    else:
+                        ocr_results = await loop.run_in_executor(
+                            self._infer_pool, easy_ocr_reader.readtext, image_array
+                        )
+                        regions = [
+                            {"bbox": result[0], "text": result[1], "confidence": result[2]}
+                            for result in ocr_results
+                        ]
+                    if regions is not None:
+                        text_results["extracted_text"] = " ".join(region["text"] for region in regions)
+                        text_results["methods_used"].append("EasyOCR")
+                        
+                        # Régions de texte
+                        text_results["text_regions"].extend(regions)
                 except Exception as e:
                     logger.debug(f"EasyOCR failed: {e}")
             
-            # Méthode 2: Tesseract (fallback)
-            if not text_results["extracted_text"]:
-                try:
-                    tesseract_text = pytesseract.image_to_string(image)
-                    text_results["extracted_text"] = tesseract_text.strip()
-                    text_results["methods_used"].append("Tesseract")
-                except Exception as e:
-                    logger.debug(f"Tesseract failed: {e}")
+            # Confiance EasyOCR: au-delà du seuil, les méthodes suivantes sont ignorées
+            regions = text_results["text_regions"]
+            if regions:
+                confidences = np.fromiter(
+                    (region["confidence"] for region in regions), dtype=np.float32, count=len(regions)
+                )
+                text_results["confidence"] = float(confidences.mean())
+            if text_results["extracted_text"] and text_results["confidence"] >= OCR_CONFIDENCE_THRESHOLD:
+                return text_results
+            
+            # Méthode 2: Tesseract (EasyOCR absent, vide ou peu sûr)
+            tesseract_text = ""
+            try:
+                if self._ocr_pool:
+                    tesseract_text = await loop.run_in_executor(self._ocr_pool, _run_tesseract, image_array)
+                else:
+                    tesseract_text = await loop.run_in_executor(
+                        self._infer_pool, pytesseract.image_to_string, image
+                    )
+                tesseract_text = tesseract_text.strip()
+                text_results["methods_used"].append("Tesseract")
+                if len(tesseract_text) >= OCR_MIN_TEXT_LENGTH or not text_results["extracted_text"]:
+                    text_results["extracted_text"] = tesseract_text
+                    text_results["confidence"] = 0.7 if tesseract_text else 0
+            except Exception as e:
+                logger.debug(f"Tesseract failed: {e}")
             
-            # Méthode 3: TrOCR pour écriture manuscrite
-            if not text_results["extracted_text"] and self.ocr_processor and self.ocr_model:
+            # Méthode 3: TrOCR pour écriture manuscrite, si le texte obtenu reste trop court
+            if len(text_results["extracted_text"]) < OCR_MIN_TEXT_LENGTH and await self._trocr_available():
                 try:
-                    pixel_values = self.ocr_processor(image, return_tensors="pt").pixel_values
-                    generated_ids = self.ocr_model.generate(pixel_values)
-                    trocr_text = self.ocr_processor.batch_decode(generated_ids, skip_special_tokens=True)[0]
-                    text_results["extracted_text"] = trocr_text
+                    trocr_text = await loop.run_in_executor(self._infer_pool, self._run_trocr, image_array)
                     text_results["methods_used"].append("TrOCR")
+                    if len(trocr_text) > len(text_results["extracted_text"]):
+                        text_results["extracted_text"] = trocr_text
+                        text_results["confidence"] = 0.7
                 except Exception as e:
                     logger.debug(f"TrOCR failed: {e}")
             
-            # Calcul de confiance moyenne
-            if text_results["text_regions"]:
-                avg_confidence = sum(region["confidence"] for region in text_results["text_regions"]) / len(text_results["text_regions"])
-                text_results["confidence"] = avg_confidence
-            else:
-                text_results["confidence"] = 0.7 if text_results["extracted_text"] else 0
-            
             return text_results
             
         except Exception as e:
             logger.error(f"Erreur extraction texte: {e}")
             return text_results
 
-    def _load_educational_objects_catalog(self) -> Dict[str, List[str]]:
-        """Charge le catalogue d'objets éducatifs"""
-        return {
+    def _load_educational_objects_catalog(self) -> Dict[str, FrozenSet[str]]:
+        """Charge le catalogue d'objets éducatifs, normalisé en minuscules"""
+        catalog = {
             "mathematics": ["calculator", "ruler", "compass", "protractor", "graph", "equation"],
             "science": ["microscope", "beaker", "molecule", "atom", "cell", "laboratory"],
             "geography": ["map", "globe", "mountain", "river", "country", "continent"],
@@ -962,12 +1739,65 @@ class VisionProcessor:
             "art": ["brush", "paint", "canvas", "sculpture", "drawing", "palette"],
             "music": ["instrument", "note", "staff", "piano", "guitar", "violin"]
         }
+        return {
+            subject: frozenset(keyword.lower() for keyword in keywords)
+            for subject, keywords in catalog.items()
+        }
 
-    async def _analyze_educational_content(self, image: Image.Image) -> Dict[str, Any]:
-        """Analyse le contenu éducatif de l'image"""
-        # Obtenir la détection d'objets
-        objects_result = await self._detect_objects(image)
-        detected_objects = [obj["class"] for obj in objects_result.get("objects", [])]
+    def _build_educational_automaton(self) -> Optional[Any]:
+        """Compile le catalogue d'objets éducatifs en un automate Aho-Corasick"""
+        if not AHOCORASICK_AVAILABLE:
+            return None
+        
+        automaton = ahocorasick.Automaton()
+        keywords: Dict[str, set] = {}
+        for subject, objects in self.educational_objects.items():
+            for keyword in objects:
+                keywords.setdefault(keyword, set()).add(subject)
+        for keyword, subjects in keywords.items():
+            automaton.add_word(keyword, frozenset(subjects))
+        automaton.make_automaton()
+        return automaton
+
+    def _match_educational_subjects(self, detected_objects: List[str]) -> List[Tuple[str, List[str]]]:
+        """Associe les objets détectés aux matières du catalogue
+
+        Renvoie (matière, objets correspondants) dans l'ordre du catalogue.
+        """
+        if self._aho is None:
+            lowered = [obj.lower() for obj in detected_objects]
+            matched = []
+            for subject, keywords in self.educational_objects.items():
+                matches = [
+                    obj for obj, obj_lower in zip(detected_objects, lowered)
+                    if any(keyword in obj_lower for keyword in keywords)
+                ]
+                if matches:
+                    matched.append((subject, matches))
+            return matched
+        
+        # Un seul parcours de l'automate sur les noms concaténés
+        starts = []
+        offset = 0
+        for obj in detected_objects:
+            starts.append(offset)
+            offset += len(obj) + 1
+        haystack = "\n".join(obj.lower() for obj in detected_objects)
+        
+        object_subjects: List[set] = [set() for _ in detected_objects]
+        for end_index, subjects in self._aho.iter(haystack):
+            object_subjects[bisect.bisect_right(starts, end_index) - 1].update(subjects)
+        
+        matched = []
+        for subject in self.educational_objects:
+            matches = [obj for obj, subjects in zip(detected_objects, object_subjects) if subject in subjects]
+            if matches:
+                matched.append((subject, matches))
+        return matched
+
+    async def _analyze_educational_content(self, objects: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Analyse le contenu éducatif à partir des objets détectés"""
+        detected_objects = [obj["class"] for obj in objects]
         
         educational_analysis = {
             "subjects": [],
@@ -977,11 +1807,9 @@ class VisionProcessor:
         }
         
         # Correspondance avec les objets éducatifs
-        for subject, objects in self.educational_objects.items():
-            matches = [obj for obj in detected_objects if any(edu_obj in obj.lower() for edu_obj in objects)]
-            if matches:
-                educational_analysis["subjects"].append(subject)
-                educational_analysis["educational_objects"].extend(matches)
+        for subject, matches in self._match_educational_subjects(detected_objects):
+            educational_analysis["subjects"].append(subject)
+            educational_analysis["educational_objects"].extend(matches)
         
         # Estimation de la valeur éducative
         educational_analysis["educational_value"] = min(100, len(educational_analysis["educational_objects"]) * 20)
@@ -996,21 +1824,17 @@ class VisionProcessor:
         
         return educational_analysis
 
-    async def _analyze_scene_context(self, image: Image.Image) -> Dict[str, Any]:
-        """Analyse le contexte de la scène"""
-        # Obtenir la description et les objets
-        caption_result = await self._generate_image_caption(image)
-        objects_result = await self._detect_objects(image)
-        
+    async def _analyze_scene_context(self, caption: str, objects: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Analyse le contexte de la scène à partir de la description et des objets"""
         scene_analysis = {
             "environment": "unknown",
-            "context": caption_result.get("caption", ""),
+            "context": caption,
             "setting": "unknown",
             "appropriateness": "suitable"
         }
         
         # Déterminer l'environnement basé sur les objets détectés
-        detected_classes = [obj["class"] for obj in objects_result.get("objects", [])]
+        detected_classes = [obj["class"] for obj in objects]
         
         if any(cls in detected_classes for cls in ["desk", "chair", "board", "classroom"]):
             scene_analysis["environment"] = "classroom"
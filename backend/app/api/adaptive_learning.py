@@ -6,6 +6,15 @@ from fastapi import APIRouter, HTTPException, Depends, BackgroundTasks
 from pydantic import BaseModel
 from typing import Dict, Any, List, Optional
 from datetime import datetime
+import base64
+import binascii
+
+try:
+    import pybase64
+    PYBASE64_AVAILABLE = True
+except ImportError:
+    pybase64 = None
+    PYBASE64_AVAILABLE = False
 
 from ..core.event_sourcing import (
     EventType, LearningEvent, event_publisher, learning_projection,
@@ -17,6 +26,9 @@ from ..core.orchestration import (
 
 router = APIRouter(prefix="/api/adaptive", tags=["Adaptive Learning"])
 
+# Émotions comptées comme positives dans la stabilité émotionnelle
+_POSITIVE_EMOTIONS = frozenset({"joy", "excitement", "confidence", "satisfaction"})
+
 
 class LearningInteractionRequest(BaseModel):
     user_id: str
@@ -157,14 +169,18 @@ async def orchestrate_adaptive_learning(request: AdaptiveLearningRequest):
 async def orchestrate_multimodal_analysis(request: MultimodalAnalysisRequest):
     """Orchestrer une analyse multimodale"""
     try:
-        # Préparer les données multimodales
+        # Préparer les données multimodales: chaque charge base64 est décodée une
+        # seule fois à l'entrée pour rejeter les données corrompues; le broker
+        # transporte du JSON, la chaîne d'origine est donc transmise avec sa taille
         multimodal_data = {}
         if request.text:
             multimodal_data["text"] = request.text
         if request.image_data:
             multimodal_data["image"] = request.image_data
+            multimodal_data["image_size"] = len(_decode_b64(request.image_data, "image_data"))
         if request.audio_data:
             multimodal_data["audio"] = request.audio_data
+            multimodal_data["audio_size"] = len(_decode_b64(request.audio_data, "audio_data"))
         
         # Lancer le workflow multimodal
         result = await service_orchestrator.orchestrate_ai_workflow(
@@ -179,6 +195,8 @@ async def orchestrate_multimodal_analysis(request: MultimodalAnalysisRequest):
             "insights": extract_multimodal_insights(result)
         }
         
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Erreur: {str(e)}")
 
@@ -219,6 +237,16 @@ async def get_services_health():
 
 # Fonctions utilitaires
 
+def _decode_b64(payload: str, field: str) -> bytes:
+    """Décoder une charge base64 (pybase64 SIMD si disponible), 400 si invalide"""
+    try:
+        if PYBASE64_AVAILABLE:
+            return pybase64.b64decode(payload, validate=True)
+        return base64.b64decode(payload, validate=True)
+    except (binascii.Error, ValueError):
+        raise HTTPException(status_code=400, detail=f"{field} n'est pas un base64 valide")
+
+
 def calculate_mastery_level(exercise_result: Dict[str, Any]) -> float:
     """Calculer le niveau de maîtrise d'une compétence"""
     score = exercise_result.get("score", 0.0)
@@ -298,8 +326,11 @@ def calculate_emotional_stability(emotion_patterns: Dict[str, int]) -> float:
     if not emotion_patterns:
         return 0.5
     
-    positive_emotions = ["joy", "excitement", "confidence", "satisfaction"]
-    total_emotions = sum(emotion_patterns.values())
-    positive_count = sum(emotion_patterns.get(emotion, 0) for emotion in positive_emotions)
+    total_emotions = 0
+    positive_count = 0
+    for emotion, count in emotion_patterns.items():
+        total_emotions += count
+        if emotion in _POSITIVE_EMOTIONS:
+            positive_count += count
     
     return positive_count / total_emotions if total_emotions > 0 else 0.5
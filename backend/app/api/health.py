@@ -3,25 +3,55 @@
 Monitoring de santé pour tous les services et dépendances
 """
 
-from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel
-from typing import Dict, Any, Optional, List
-from datetime import datetime, timedelta
+from fastapi import APIRouter, Response
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel, ConfigDict, TypeAdapter
+from typing import Dict, Any, Optional, List, Tuple
+from datetime import datetime, timedelta, timezone
 import asyncio
+import functools
+import os
 import time
 import logging
+import httpx
 import psutil
 import platform
 from enum import Enum
 
 # Configuration des health checks
-from backend.app.core.config import settings
-from backend.app.core.database import db
-from backend.app.core.cache import redis_client
+from ..core.config import settings
+from ..core.database import get_database, get_redis
 
-router = APIRouter()
+router = APIRouter(default_response_class=ORJSONResponse)
 logger = logging.getLogger("health")
 
+HEALTH_CACHE_KEY = "health:full"
+
+# Mémo local (par worker) devant le cache Redis; HEALTH_LOCAL_CACHE=0 le désactive
+HEALTH_LOCAL_CACHE = os.getenv("HEALTH_LOCAL_CACHE", "1") != "0"
+HEALTH_LOCAL_CACHE_TTL = 1.0
+
+# Client HTTP partagé par les checks: pool keep-alive, pas de handshake TLS par sonde.
+# Créé par HealthChecker (start() ou premier usage) et fermé par stop().
+def _new_http_client() -> httpx.AsyncClient:
+    return httpx.AsyncClient(http2=True, timeout=5.0, limits=httpx.Limits(max_keepalive_connections=8))
+
+_OPENAI_HEADERS = (
+    {"Authorization": f"Bearer {settings.openai_api_key}"}
+    if getattr(settings, 'openai_api_key', None) else None
+)
+# Récupération d'un seul modèle: réponse de quelques octets au lieu de la liste complète
+_OPENAI_PROBE_URL = f"https://api.openai.com/v1/models/{getattr(settings, 'openai_model', 'gpt-4')}"
+
+# Échéance globale de check_all_services (secondes)
+HEALTH_CHECK_DEADLINE = 3.0
+
+# Périodes des tâches de fond (secondes)
+CPU_SAMPLE_INTERVAL = 5.0
+DBSTATS_INTERVAL = 60.0
+OPENAI_POLL_INTERVAL = 60.0
+PROCESS_COUNT_TTL = 5.0
+
 class HealthStatus(str, Enum):
     """États de santé possibles"""
     HEALTHY = "healthy"
@@ -29,8 +59,36 @@ class HealthStatus(str, Enum):
     UNHEALTHY = "unhealthy"
     UNKNOWN = "unknown"
 
+# Services dont l'échec rend tout le système unhealthy
+_CRITICAL_SERVICES = frozenset({"database", "redis"})
+
+# Seuils d'usage (%) -> statut: (borne supérieure exclue, statut, message)
+StatusTable = Tuple[Tuple[float, HealthStatus, str], ...]
+
+_DISK_STATUS_TABLE: StatusTable = (
+    (80, HealthStatus.HEALTHY, "Disk space sufficient"),
+    (90, HealthStatus.DEGRADED, "Disk space getting low"),
+    (float("inf"), HealthStatus.UNHEALTHY, "Disk space critically low")
+)
+_MEMORY_STATUS_TABLE: StatusTable = (
+    (70, HealthStatus.HEALTHY, "Memory usage normal"),
+    (85, HealthStatus.DEGRADED, "Memory usage elevated"),
+    (float("inf"), HealthStatus.UNHEALTHY, "Memory usage critical")
+)
+_CPU_STATUS_TABLE: StatusTable = (
+    (70, HealthStatus.HEALTHY, "CPU usage normal"),
+    (85, HealthStatus.DEGRADED, "CPU usage elevated"),
+    (float("inf"), HealthStatus.UNHEALTHY, "CPU usage critical")
+)
+
+def _classify(percent: float, table: StatusTable) -> Tuple[HealthStatus, str]:
+    """Statut et message du premier seuil que l'usage n'atteint pas"""
+    return next((status, message) for threshold, status, message in table if percent < threshold)
+
 class ServiceHealth(BaseModel):
     """État de santé d'un service"""
+    model_config = ConfigDict(frozen=True, extra="forbid")
+    
     status: HealthStatus
     response_time_ms: float
     message: Optional[str] = None
@@ -39,6 +97,8 @@ class ServiceHealth(BaseModel):
     
 class SystemHealth(BaseModel):
     """État de santé du système"""
+    model_config = ConfigDict(frozen=True, extra="forbid")
+    
     status: HealthStatus
     timestamp: datetime
     uptime_seconds: float
@@ -46,59 +106,190 @@ class SystemHealth(BaseModel):
     environment: str
     services: Dict[str, ServiceHealth]
     system_metrics: Dict[str, Any]
+    cached: bool = False
+    checked_at: datetime
+
+# Adaptateurs construits une fois à l'import pour (dé)sérialiser sans repasser par le schéma
+_SERVICE_HEALTH_TA = TypeAdapter(ServiceHealth)
+_SYSTEM_HEALTH_TA = TypeAdapter(SystemHealth)
+
+def cached_in_redis(key: str):
+    """Met en cache un SystemHealth dans Redis pendant settings.health_cache_ttl
+    
+    Une panne Redis ne fait que désactiver le cache: le check est alors
+    recalculé à chaque appel.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs) -> SystemHealth:
+            try:
+                cached = await get_redis().get(key)
+                if cached:
+                    return _SYSTEM_HEALTH_TA.validate_json(cached).model_copy(update={"cached": True})
+            except Exception as e:
+                logger.warning(f"Health cache unavailable: {e}")
+            
+            health = await func(*args, **kwargs)
+            
+            try:
+                await get_redis().set(key, _SYSTEM_HEALTH_TA.dump_json(health), ex=settings.health_cache_ttl)
+            except Exception as e:
+                logger.warning(f"Could not cache health result: {e}")
+            
+            return health
+        return wrapper
+    return decorator
+
+def memoized_locally(ttl: float):
+    """Réutilise le dernier SystemHealth du worker pendant ttl secondes"""
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(self, *args, **kwargs) -> SystemHealth:
+            if not HEALTH_LOCAL_CACHE:
+                return await func(self, *args, **kwargs)
+            
+            if self._cached and time.monotonic() - self._cached[0] < ttl:
+                return self._cached[1]
+            
+            health = await func(self, *args, **kwargs)
+            self._cached = (time.monotonic(), health)
+            return health
+        return wrapper
+    return decorator
 
 class HealthChecker:
     """Classe principale pour les vérifications de santé"""
     
     def __init__(self):
-        self.start_time = datetime.utcnow()
+        self.start_time = datetime.now(timezone.utc)
         self.service_checkers = {
             "database": self._check_database,
-            "redis": self._check_redis,
+            "redis": self._check_redis_ping,
             "ai_services": self._check_ai_services,
             "external_apis": self._check_external_apis,
             "disk_space": self._check_disk_space,
             "memory": self._check_memory,
             "cpu": self._check_cpu
         }
+        
+        # Amorce psutil: les appels suivants mesurent depuis cet instant
+        psutil.cpu_percent(interval=None)
+        self._last_cpu: Optional[float] = None
+        self._last_dbstats: Optional[Dict[str, Any]] = None
+        self._openai_ok: Optional[bool] = None
+        self._background_tasks: List[asyncio.Task] = []
+        self._cached: Optional[Tuple[float, SystemHealth]] = None
+        
+        # Métriques constantes pendant toute la vie du processus
+        self._static_metrics = {
+            "platform": platform.system(),
+            "platform_version": platform.version(),
+            "python_version": platform.python_version(),
+            "architecture": platform.architecture()[0],
+            "hostname": platform.node(),
+            "boot_time": datetime.fromtimestamp(psutil.boot_time()).isoformat()
+        }
+        self._process_count = (float("-inf"), 0)
+        self._http: Optional[httpx.AsyncClient] = None
+    
+    @property
+    def http(self) -> httpx.AsyncClient:
+        """Client HTTP partagé, recréé s'il a été fermé par un lifespan précédent"""
+        if self._http is None or self._http.is_closed:
+            self._http = _new_http_client()
+        return self._http
+    
+    def start(self):
+        """Démarrer les tâches de fond (idempotent, appelé par le lifespan)"""
+        if self._http is None or self._http.is_closed:
+            self._http = _new_http_client()
+        if not self._background_tasks:
+            self._background_tasks = [
+                asyncio.create_task(self._cpu_sampler()),
+                asyncio.create_task(self._dbstats_collector())
+            ]
+            if _OPENAI_HEADERS:
+                self._background_tasks.append(asyncio.create_task(self._openai_poller()))
+    
+    async def stop(self):
+        """Arrêter les tâches de fond et fermer le client HTTP partagé"""
+        for task in self._background_tasks:
+            task.cancel()
+        await asyncio.gather(*self._background_tasks, return_exceptions=True)
+        self._background_tasks = []
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
+    
+    async def _cpu_sampler(self):
+        """Échantillonne l'usage CPU sans bloquer le thread de la boucle"""
+        while True:
+            await asyncio.sleep(CPU_SAMPLE_INTERVAL)
+            self._last_cpu = await asyncio.to_thread(psutil.cpu_percent, None)
+    
+    async def _dbstats_collector(self):
+        """Collecte dbstats hors du chemin des sondes"""
+        while True:
+            try:
+                self._last_dbstats = await self._fetch_dbstats()
+            except Exception as e:
+                logger.warning(f"Could not collect dbstats: {e}")
+            await asyncio.sleep(DBSTATS_INTERVAL)
+    
+    async def _openai_poller(self):
+        """Sonde l'API OpenAI hors du chemin des health checks"""
+        while True:
+            try:
+                response = await self.http.get(_OPENAI_PROBE_URL, headers=_OPENAI_HEADERS)
+                self._openai_ok = response.status_code == 200
+            except Exception as e:
+                logger.warning(f"OpenAI probe failed: {e}")
+                self._openai_ok = False
+            await asyncio.sleep(OPENAI_POLL_INTERVAL)
+    
+    async def _fetch_dbstats(self) -> Dict[str, Any]:
+        """Statistiques de la base"""
+        stats = await get_database().command("dbstats")
+        return {
+            "collections": stats.get("collections", 0),
+            "data_size_mb": round(stats.get("dataSize", 0) / 1024 / 1024, 2),
+            "index_size_mb": round(stats.get("indexSize", 0) / 1024 / 1024, 2)
+        }
     
+    @memoized_locally(HEALTH_LOCAL_CACHE_TTL)
+    @cached_in_redis(HEALTH_CACHE_KEY)
     async def check_all_services(self) -> SystemHealth:
         """Vérifier tous les services"""
-        start_time = time.time()
+        now = datetime.now(timezone.utc)
         
-        # Exécuter tous les checks en parallèle
-        tasks = {
-            name: self._run_check_with_timeout(checker, timeout=10.0)
+        # Exécuter tous les checks en parallèle sous une échéance globale:
+        # un check lent ne retarde pas la réponse au-delà de HEALTH_CHECK_DEADLINE
+        tasks = [
+            asyncio.create_task(self._run_named(name, checker, HEALTH_CHECK_DEADLINE, now))
             for name, checker in self.service_checkers.items()
-        }
-        
-        results = await asyncio.gather(*tasks.values(), return_exceptions=True)
+        ]
+        done, pending = await asyncio.wait(tasks, timeout=HEALTH_CHECK_DEADLINE)
+        for task in pending:
+            task.cancel()
         
-        # Combiner les résultats
-        services = {}
-        for (name, _), result in zip(tasks.items(), results):
-            if isinstance(result, Exception):
-                services[name] = ServiceHealth(
-                    status=HealthStatus.UNHEALTHY,
-                    response_time_ms=0.0,
-                    message=f"Check failed: {str(result)}",
-                    last_checked=datetime.utcnow()
-                )
-            else:
-                services[name] = result
+        # Chaque tâche renvoie (nom, résultat): pas d'appariement par position
+        services = dict(task.result() for task in done)
+        for name in self.service_checkers.keys() - services.keys():
+            services[name] = self._timed_out(HEALTH_CHECK_DEADLINE, now)
         
         # Déterminer le statut global
         overall_status = self._calculate_overall_status(services)
         
         # Métriques système
-        system_metrics = self._get_system_metrics()
+        system_metrics = await self._get_system_metrics()
         
         # Temps de fonctionnement
-        uptime = (datetime.utcnow() - self.start_time).total_seconds()
+        uptime = (now - self.start_time).total_seconds()
         
         return SystemHealth(
             status=overall_status,
-            timestamp=datetime.utcnow(),
+            timestamp=now,
+            checked_at=now,
             uptime_seconds=uptime,
             version=getattr(settings, 'app_version', '1.0.0'),
             environment=getattr(settings, 'environment', 'development'),
@@ -106,82 +297,146 @@ class HealthChecker:
             system_metrics=system_metrics
         )
     
-    async def _run_check_with_timeout(self, checker, timeout: float) -> ServiceHealth:
-        """Exécuter un check avec timeout"""
+    async def check_readiness(self) -> SystemHealth:
+        """Vérifier uniquement les dépendances critiques (ping MongoDB et Redis)"""
+        now = datetime.now(timezone.utc)
+        
+        database, redis = await asyncio.gather(
+            self._bounded(self._check_database, 5.0, "database", now),
+            self._bounded(self._check_redis_ping, 5.0, "redis", now)
+        )
+        services = {"database": database, "redis": redis}
+        
+        return SystemHealth(
+            status=self._calculate_overall_status(services),
+            timestamp=now,
+            checked_at=now,
+            uptime_seconds=(now - self.start_time).total_seconds(),
+            version=getattr(settings, 'app_version', '1.0.0'),
+            environment=getattr(settings, 'environment', 'development'),
+            services=services,
+            system_metrics={}
+        )
+    
+    @staticmethod
+    def _timed_out(timeout: float, now: datetime) -> ServiceHealth:
+        """Résultat d'un check qui a dépassé son échéance"""
+        return ServiceHealth(
+            status=HealthStatus.UNHEALTHY,
+            response_time_ms=timeout * 1000,
+            message=f"Health check timed out after {timeout}s",
+            last_checked=now
+        )
+    
+    async def _run_named(self, name: str, checker, timeout: float, now: datetime) -> Tuple[str, ServiceHealth]:
+        """Exécuter un check et renvoyer son résultat accompagné de son nom"""
+        return name, await self._bounded(checker, timeout, name, now)
+    
+    async def _bounded(self, checker, timeout: float, name: str, now: datetime) -> ServiceHealth:
+        """Exécuter un check avec une échéance propre"""
         try:
-            return await asyncio.wait_for(checker(), timeout=timeout)
-        except asyncio.TimeoutError:
+            async with asyncio.timeout(timeout):
+                return await checker(now=now)
+        except TimeoutError:
+            return self._timed_out(timeout, now)
+        except Exception as e:
+            logger.error(f"Health check '{name}' failed: {e}")
             return ServiceHealth(
                 status=HealthStatus.UNHEALTHY,
-                response_time_ms=timeout * 1000,
-                message=f"Health check timed out after {timeout}s",
-                last_checked=datetime.utcnow()
+                response_time_ms=0.0,
+                message=f"Check failed: {str(e)}",
+                last_checked=now
             )
     
-    async def _check_database(self) -> ServiceHealth:
-        """Vérifier la santé de MongoDB"""
-        start_time = time.time()
+    async def _check_database(self, full: bool = False, now: Optional[datetime] = None) -> ServiceHealth:
+        """Vérifier la santé de MongoDB (lecture seule)
+        
+        Seul un ping est envoyé; dbstats n'est interrogé que si full=True,
+        sinon la dernière collecte de fond est reprise.
+        """
+        now = now or datetime.now(timezone.utc)
+        start_time = time.perf_counter()
         
         try:
             # Test de connexion basique
-            await db.command("ping")
-            
-            # Test d'écriture/lecture
-            test_doc = {"test": True, "timestamp": datetime.utcnow()}
-            result = await db.health_test.insert_one(test_doc)
-            await db.health_test.delete_one({"_id": result.inserted_id})
+            await get_database().command("ping")
             
-            # Statistiques de la base
-            stats = await db.command("dbstats")
+            if full:
+                stats = await self._fetch_dbstats()
+            else:
+                stats = self._last_dbstats or {}
             
-            response_time = (time.time() - start_time) * 1000
+            response_time = (time.perf_counter() - start_time) * 1000
             
             return ServiceHealth(
                 status=HealthStatus.HEALTHY,
                 response_time_ms=response_time,
                 message="Database connection successful",
-                details={
-                    "collections": stats.get("collections", 0),
-                    "data_size_mb": round(stats.get("dataSize", 0) / 1024 / 1024, 2),
-                    "index_size_mb": round(stats.get("indexSize", 0) / 1024 / 1024, 2)
-                },
-                last_checked=datetime.utcnow()
+                details=stats,
+                last_checked=now
             )
             
         except Exception as e:
-            response_time = (time.time() - start_time) * 1000
+            response_time = (time.perf_counter() - start_time) * 1000
             return ServiceHealth(
                 status=HealthStatus.UNHEALTHY,
                 response_time_ms=response_time,
                 message=f"Database check failed: {str(e)}",
-                last_checked=datetime.utcnow()
+                last_checked=now
             )
     
-    async def _check_redis(self) -> ServiceHealth:
-        """Vérifier la santé de Redis"""
-        start_time = time.time()
+    async def _check_redis_ping(self, now: Optional[datetime] = None) -> ServiceHealth:
+        """Vérifier que Redis répond (PING seul)"""
+        now = now or datetime.now(timezone.utc)
+        start_time = time.perf_counter()
         
         try:
-            # Test ping
-            pong = await redis_client.ping()
-            if not pong:
+            if not await get_redis().ping():
                 raise Exception("Redis ping failed")
             
-            # Test set/get
+            return ServiceHealth(
+                status=HealthStatus.HEALTHY,
+                response_time_ms=(time.perf_counter() - start_time) * 1000,
+                message="Redis ping successful",
+                last_checked=now
+            )
+            
+        except Exception as e:
+            return ServiceHealth(
+                status=HealthStatus.UNHEALTHY,
+                response_time_ms=(time.perf_counter() - start_time) * 1000,
+                message=f"Redis check failed: {str(e)}",
+                last_checked=now
+            )
+    
+    async def _check_redis(self, now: Optional[datetime] = None) -> ServiceHealth:
+        """Vérifier la santé de Redis en détail (réservé à /health/redis)"""
+        now = now or datetime.now(timezone.utc)
+        start_time = time.perf_counter()
+        
+        try:
             test_key = "health_check_test"
             test_value = f"test_{int(time.time())}"
             
-            await redis_client.set(test_key, test_value, ex=10)
-            retrieved_value = await redis_client.get(test_key)
-            await redis_client.delete(test_key)
+            # Ping, set/get/delete et INFO en un seul aller-retour
+            # (INFO sans section: plusieurs sections exigent Redis 7+)
+            async with get_redis().pipeline(transaction=False) as pipe:
+                pipe.ping()
+                pipe.set(test_key, test_value, ex=10)
+                pipe.get(test_key)
+                pipe.delete(test_key)
+                pipe.info()
+                pong, _, retrieved_value, _, info = await pipe.execute()
             
-            if retrieved_value.decode() != test_value:
-                raise Exception("Redis set/get test failed")
+            if not pong:
+                raise Exception("Redis ping failed")
             
-            # Informations Redis
-            info = await redis_client.info()
+            if isinstance(retrieved_value, bytes):
+                retrieved_value = retrieved_value.decode()
+            if retrieved_value != test_value:
+                raise Exception("Redis set/get test failed")
             
-            response_time = (time.time() - start_time) * 1000
+            response_time = (time.perf_counter() - start_time) * 1000
             
             return ServiceHealth(
                 status=HealthStatus.HEALTHY,
@@ -193,37 +448,35 @@ class HealthChecker:
                     "connected_clients": info.get("connected_clients", 0),
                     "total_commands_processed": info.get("total_commands_processed", 0)
                 },
-                last_checked=datetime.utcnow()
+                last_checked=now
             )
             
         except Exception as e:
-            response_time = (time.time() - start_time) * 1000
+            response_time = (time.perf_counter() - start_time) * 1000
             return ServiceHealth(
                 status=HealthStatus.UNHEALTHY,
                 response_time_ms=response_time,
                 message=f"Redis check failed: {str(e)}",
-                last_checked=datetime.utcnow()
+                last_checked=now
             )
     
-    async def _check_ai_services(self) -> ServiceHealth:
+    async def _check_ai_services(self, now: Optional[datetime] = None) -> ServiceHealth:
         """Vérifier la santé des services IA"""
-        start_time = time.time()
+        now = now or datetime.now(timezone.utc)
+        start_time = time.perf_counter()
         
         try:
             # Vérifier si le service IA est accessible
-            import httpx
-            
             ai_service_url = getattr(settings, 'ai_service_url', 'http://localhost:8001')
             
-            async with httpx.AsyncClient(timeout=5.0) as client:
-                response = await client.get(f"{ai_service_url}/health")
-                
-                if response.status_code != 200:
-                    raise Exception(f"AI service returned status {response.status_code}")
-                
-                ai_health = response.json()
+            response = await self.http.get(f"{ai_service_url}/health")
             
-            response_time = (time.time() - start_time) * 1000
+            if response.status_code != 200:
+                raise Exception(f"AI service returned status {response.status_code}")
+            
+            ai_health = response.json()
+            
+            response_time = (time.perf_counter() - start_time) * 1000
             
             return ServiceHealth(
                 status=HealthStatus.HEALTHY,
@@ -234,11 +487,11 @@ class HealthChecker:
                     "models_loaded": ai_health.get("models_loaded", 0),
                     "gpu_available": ai_health.get("gpu_available", False)
                 },
-                last_checked=datetime.utcnow()
+                last_checked=now
             )
             
         except Exception as e:
-            response_time = (time.time() - start_time) * 1000
+            response_time = (time.perf_counter() - start_time) * 1000
             
             # Service IA non accessible n'est pas critique
             status = HealthStatus.DEGRADED if "Connection" in str(e) else HealthStatus.UNHEALTHY
@@ -247,36 +500,27 @@ class HealthChecker:
                 status=status,
                 response_time_ms=response_time,
                 message=f"AI services check failed: {str(e)}",
-                last_checked=datetime.utcnow()
+                last_checked=now
             )
     
-    async def _check_external_apis(self) -> ServiceHealth:
+    async def _check_external_apis(self, now: Optional[datetime] = None) -> ServiceHealth:
         """Vérifier la santé des APIs externes"""
-        start_time = time.time()
+        now = now or datetime.now(timezone.utc)
+        start_time = time.perf_counter()
         
         checks = {}
         overall_healthy = True
         
         try:
-            import httpx
-            
-            # Check OpenAI API si configuré
-            if hasattr(settings, 'openai_api_key') and settings.openai_api_key:
-                try:
-                    async with httpx.AsyncClient(timeout=5.0) as client:
-                        response = await client.get(
-                            "https://api.openai.com/v1/models",
-                            headers={"Authorization": f"Bearer {settings.openai_api_key}"}
-                        )
-                        checks["openai"] = response.status_code == 200
-                except:
-                    checks["openai"] = False
-                    overall_healthy = False
+            # Check OpenAI API si configuré: dernier résultat du poller de fond
+            if _OPENAI_HEADERS and self._openai_ok is not None:
+                checks["openai"] = self._openai_ok
+                overall_healthy = self._openai_ok
             
             # Check autres APIs critiques
             # Ajouter ici d'autres vérifications d'APIs externes
             
-            response_time = (time.time() - start_time) * 1000
+            response_time = (time.perf_counter() - start_time) * 1000
             
             status = HealthStatus.HEALTHY if overall_healthy else HealthStatus.DEGRADED
             
@@ -285,25 +529,26 @@ class HealthChecker:
                 response_time_ms=response_time,
                 message="External APIs checked",
                 details=checks,
-                last_checked=datetime.utcnow()
+                last_checked=now
             )
             
         except Exception as e:
-            response_time = (time.time() - start_time) * 1000
+            response_time = (time.perf_counter() - start_time) * 1000
             return ServiceHealth(
                 status=HealthStatus.DEGRADED,
                 response_time_ms=response_time,
                 message=f"External API checks failed: {str(e)}",
                 details=checks,
-                last_checked=datetime.utcnow()
+                last_checked=now
             )
     
-    async def _check_disk_space(self) -> ServiceHealth:
+    async def _check_disk_space(self, now: Optional[datetime] = None) -> ServiceHealth:
         """Vérifier l'espace disque"""
-        start_time = time.time()
+        now = now or datetime.now(timezone.utc)
+        start_time = time.perf_counter()
         
         try:
-            disk_usage = psutil.disk_usage('/')
+            disk_usage = await asyncio.to_thread(psutil.disk_usage, '/')
             
             total_gb = disk_usage.total / (1024**3)
             used_gb = disk_usage.used / (1024**3)
@@ -311,17 +556,9 @@ class HealthChecker:
             usage_percent = (used_gb / total_gb) * 100
             
             # Déterminer le statut basé sur l'usage
-            if usage_percent < 80:
-                status = HealthStatus.HEALTHY
-                message = "Disk space sufficient"
-            elif usage_percent < 90:
-                status = HealthStatus.DEGRADED
-                message = "Disk space getting low"
-            else:
-                status = HealthStatus.UNHEALTHY
-                message = "Disk space critically low"
+            status, message = _classify(usage_percent, _DISK_STATUS_TABLE)
             
-            response_time = (time.time() - start_time) * 1000
+            response_time = (time.perf_counter() - start_time) * 1000
             
             return ServiceHealth(
                 status=status,
@@ -333,24 +570,25 @@ class HealthChecker:
                     "free_gb": round(free_gb, 2),
                     "usage_percent": round(usage_percent, 2)
                 },
-                last_checked=datetime.utcnow()
+                last_checked=now
             )
             
         except Exception as e:
-            response_time = (time.time() - start_time) * 1000
+            response_time = (time.perf_counter() - start_time) * 1000
             return ServiceHealth(
                 status=HealthStatus.UNKNOWN,
                 response_time_ms=response_time,
                 message=f"Could not check disk space: {str(e)}",
-                last_checked=datetime.utcnow()
+                last_checked=now
             )
     
-    async def _check_memory(self) -> ServiceHealth:
+    async def _check_memory(self, now: Optional[datetime] = None) -> ServiceHealth:
         """Vérifier l'utilisation mémoire"""
-        start_time = time.time()
+        now = now or datetime.now(timezone.utc)
+        start_time = time.perf_counter()
         
         try:
-            memory = psutil.virtual_memory()
+            memory = await asyncio.to_thread(psutil.virtual_memory)
             
             usage_percent = memory.percent
             available_gb = memory.available / (1024**3)
@@ -358,17 +596,9 @@ class HealthChecker:
             used_gb = memory.used / (1024**3)
             
             # Déterminer le statut
-            if usage_percent < 70:
-                status = HealthStatus.HEALTHY
-                message = "Memory usage normal"
-            elif usage_percent < 85:
-                status = HealthStatus.DEGRADED
-                message = "Memory usage elevated"
-            else:
-                status = HealthStatus.UNHEALTHY
-                message = "Memory usage critical"
+            status, message = _classify(usage_percent, _MEMORY_STATUS_TABLE)
             
-            response_time = (time.time() - start_time) * 1000
+            response_time = (time.perf_counter() - start_time) * 1000
             
             return ServiceHealth(
                 status=status,
@@ -380,40 +610,33 @@ class HealthChecker:
                     "available_gb": round(available_gb, 2),
                     "usage_percent": round(usage_percent, 2)
                 },
-                last_checked=datetime.utcnow()
+                last_checked=now
             )
             
         except Exception as e:
-            response_time = (time.time() - start_time) * 1000
+            response_time = (time.perf_counter() - start_time) * 1000
             return ServiceHealth(
                 status=HealthStatus.UNKNOWN,
                 response_time_ms=response_time,
                 message=f"Could not check memory: {str(e)}",
-                last_checked=datetime.utcnow()
+                last_checked=now
             )
     
-    async def _check_cpu(self) -> ServiceHealth:
+    async def _check_cpu(self, now: Optional[datetime] = None) -> ServiceHealth:
         """Vérifier l'utilisation CPU"""
-        start_time = time.time()
+        now = now or datetime.now(timezone.utc)
+        start_time = time.perf_counter()
         
         try:
-            # Moyenne sur 1 seconde
-            cpu_percent = psutil.cpu_percent(interval=1)
+            # Dernier échantillon du sampler de fond (démarré par le lifespan)
+            cpu_percent = self._last_cpu if self._last_cpu is not None else psutil.cpu_percent(interval=None)
             cpu_count = psutil.cpu_count()
-            load_avg = psutil.getloadavg() if hasattr(psutil, 'getloadavg') else (0, 0, 0)
+            load_avg = await asyncio.to_thread(psutil.getloadavg) if hasattr(psutil, 'getloadavg') else (0, 0, 0)
             
             # Déterminer le statut
-            if cpu_percent < 70:
-                status = HealthStatus.HEALTHY
-                message = "CPU usage normal"
-            elif cpu_percent < 85:
-                status = HealthStatus.DEGRADED
-                message = "CPU usage elevated"
-            else:
-                status = HealthStatus.UNHEALTHY
-                message = "CPU usage critical"
+            status, message = _classify(cpu_percent, _CPU_STATUS_TABLE)
             
-            response_time = (time.time() - start_time) * 1000
+            response_time = (time.perf_counter() - start_time) * 1000
             
             return ServiceHealth(
                 status=status,
@@ -426,57 +649,54 @@ class HealthChecker:
                     "load_avg_5m": round(load_avg[1], 2),
                     "load_avg_15m": round(load_avg[2], 2)
                 },
-                last_checked=datetime.utcnow()
+                last_checked=now
             )
             
         except Exception as e:
-            response_time = (time.time() - start_time) * 1000
+            response_time = (time.perf_counter() - start_time) * 1000
             return ServiceHealth(
                 status=HealthStatus.UNKNOWN,
                 response_time_ms=response_time,
                 message=f"Could not check CPU: {str(e)}",
-                last_checked=datetime.utcnow()
+                last_checked=now
             )
     
     def _calculate_overall_status(self, services: Dict[str, ServiceHealth]) -> HealthStatus:
-        """Calculer le statut global basé sur les services"""
+        """Calculer le statut global basé sur les services (une seule passe)"""
         if not services:
             return HealthStatus.UNKNOWN
         
-        statuses = [service.status for service in services.values()]
-        
-        # Si un service critique est unhealthy
-        critical_services = ["database", "redis"]
-        for service_name in critical_services:
-            if service_name in services and services[service_name].status == HealthStatus.UNHEALTHY:
-                return HealthStatus.UNHEALTHY
+        any_unhealthy = any_degraded = any_unknown = False
+        for name, service in services.items():
+            status = service.status
+            if status == HealthStatus.UNHEALTHY:
+                # Un service critique unhealthy suffit à conclure
+                if name in _CRITICAL_SERVICES:
+                    return HealthStatus.UNHEALTHY
+                any_unhealthy = True
+            elif status == HealthStatus.DEGRADED:
+                any_degraded = True
+            elif status != HealthStatus.HEALTHY:
+                any_unknown = True
         
-        # Si tous les services sont healthy
-        if all(status == HealthStatus.HEALTHY for status in statuses):
-            return HealthStatus.HEALTHY
-        
-        # Si au moins un service est unhealthy
-        if any(status == HealthStatus.UNHEALTHY for status in statuses):
+        if any_unhealthy:
             return HealthStatus.UNHEALTHY
-        
-        # Si au moins un service est degraded
-        if any(status == HealthStatus.DEGRADED for status in statuses):
+        if any_degraded:
             return HealthStatus.DEGRADED
-        
-        return HealthStatus.UNKNOWN
+        if any_unknown:
+            return HealthStatus.UNKNOWN
+        return HealthStatus.HEALTHY
     
-    def _get_system_metrics(self) -> Dict[str, Any]:
+    async def _get_system_metrics(self) -> Dict[str, Any]:
         """Obtenir les métriques système"""
         try:
-            return {
-                "platform": platform.system(),
-                "platform_version": platform.version(),
-                "python_version": platform.python_version(),
-                "architecture": platform.architecture()[0],
-                "hostname": platform.node(),
-                "boot_time": datetime.fromtimestamp(psutil.boot_time()).isoformat(),
-                "process_count": len(psutil.pids())
-            }
+            # Le nombre de processus parcourt /proc: mémorisé PROCESS_COUNT_TTL secondes
+            checked_at, process_count = self._process_count
+            if time.monotonic() - checked_at >= PROCESS_COUNT_TTL:
+                process_count = len(await asyncio.to_thread(psutil.pids))
+                self._process_count = (time.monotonic(), process_count)
+            
+            return {**self._static_metrics, "process_count": process_count}
         except Exception as e:
             logger.error(f"Error getting system metrics: {e}")
             return {"error": str(e)}
@@ -486,9 +706,32 @@ health_checker = HealthChecker()
 
 # Routes FastAPI
 
-@router.get("/health", response_model=SystemHealth)
+def _health_response(health: BaseModel, status_code: int = 200) -> Response:
+    """Sérialiser un modèle de santé directement en JSON via son TypeAdapter"""
+    adapter = _SYSTEM_HEALTH_TA if isinstance(health, SystemHealth) else _SERVICE_HEALTH_TA
+    return Response(content=adapter.dump_json(health), status_code=status_code, media_type="application/json")
+
+_LIVE_CONTENT = {"status": HealthStatus.HEALTHY, "message": "Service is running"}
+
+@router.get("/health", response_class=ORJSONResponse)
+@router.get("/health/live", response_class=ORJSONResponse)
+async def liveness():
+    """Liveness: le processus répond, aucune dépendance n'est interrogée (/health en est l'alias)"""
+    return _LIVE_CONTENT
+
+@router.get("/health/ready", response_model=SystemHealth, response_class=ORJSONResponse)
+async def readiness():
+    """Readiness: ping de MongoDB et Redis uniquement"""
+    health = await health_checker.check_readiness()
+    
+    if health.status == HealthStatus.UNHEALTHY:
+        return _health_response(health, 503)
+    
+    return _health_response(health)
+
+@router.get("/health/deep", response_model=SystemHealth, response_class=ORJSONResponse)
 async def health_check():
-    """Point de terminaison de santé principal"""
+    """Batterie complète des checks (services, APIs externes, système)"""
     try:
         health = await health_checker.check_all_services()
         
@@ -497,65 +740,55 @@ async def health_check():
         
         # Retourner le code HTTP approprié
         if health.status == HealthStatus.UNHEALTHY:
-            raise HTTPException(status_code=503, detail=health)
+            return _health_response(health, 503)
         elif health.status == HealthStatus.DEGRADED:
-            raise HTTPException(status_code=206, detail=health)
+            return _health_response(health, 206)
         
-        return health
+        return _health_response(health)
         
-    except HTTPException:
-        raise
     except Exception as e:
         logger.error(f"Health check failed: {e}")
-        raise HTTPException(
+        return ORJSONResponse(
             status_code=500,
-            detail={
+            content={
                 "status": HealthStatus.UNKNOWN,
                 "message": f"Health check failed: {str(e)}",
-                "timestamp": datetime.utcnow()
+                "timestamp": datetime.now(timezone.utc)
             }
         )
 
-@router.get("/health/quick")
-async def quick_health_check():
-    """Check rapide de santé (ping seulement)"""
-    return {
-        "status": HealthStatus.HEALTHY,
-        "message": "Service is running",
-        "timestamp": datetime.utcnow(),
-        "uptime_seconds": (datetime.utcnow() - health_checker.start_time).total_seconds()
-    }
+# /health/quick est servi par app.middleware.health_interceptor
 
-@router.get("/health/database")
-async def database_health():
-    """Check spécifique de la base de données"""
-    result = await health_checker._check_database()
+@router.get("/health/database", response_class=ORJSONResponse)
+async def database_health(full: bool = False):
+    """Check spécifique de la base de données (?full=1 pour dbstats à jour)"""
+    result = await health_checker._check_database(full=full)
     
     if result.status == HealthStatus.UNHEALTHY:
-        raise HTTPException(status_code=503, detail=result)
+        return _health_response(result, 503)
     
-    return result
+    return _health_response(result)
 
-@router.get("/health/redis")
+@router.get("/health/redis", response_class=ORJSONResponse)
 async def redis_health():
     """Check spécifique de Redis"""
     result = await health_checker._check_redis()
     
     if result.status == HealthStatus.UNHEALTHY:
-        raise HTTPException(status_code=503, detail=result)
+        return _health_response(result, 503)
     
-    return result
+    return _health_response(result)
 
-@router.get("/health/system")
+@router.get("/health/system", response_class=ORJSONResponse)
 async def system_health():
     """Métriques système détaillées"""
     disk_check = await health_checker._check_disk_space()
     memory_check = await health_checker._check_memory()
     cpu_check = await health_checker._check_cpu()
     
-    return {
-        "disk": disk_check,
-        "memory": memory_check,
-        "cpu": cpu_check,
-        "system_info": health_checker._get_system_metrics()
-    }
+    return ORJSONResponse(content={
+        "disk": disk_check.model_dump(mode="json"),
+        "memory": memory_check.model_dump(mode="json"),
+        "cpu": cpu_check.model_dump(mode="json"),
+        "system_info": await health_checker._get_system_metrics()
+    })
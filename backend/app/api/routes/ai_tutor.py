@@ -3,25 +3,64 @@
 API pour l'interaction avec le tuteur IA adaptatif multilingue
 """
 
-from fastapi import APIRouter, HTTPException, Depends, UploadFile, File
-from fastapi.responses import StreamingResponse
-from pydantic import BaseModel
-from typing import List, Optional, Dict, Any
+from fastapi import APIRouter, HTTPException, Depends, Request, UploadFile, File
+from fastapi.responses import ORJSONResponse, Response, StreamingResponse
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter, field_validator
+from typing import Any, AsyncIterator, Deque, Dict, List, Literal, Optional
 import asyncio
+import hashlib
 import json
+import re
+import secrets
 import time
-from datetime import datetime
+from collections import Counter, deque
+from datetime import datetime, timezone
+
+import orjson
+import redis.asyncio as aioredis
+from cachetools import TTLCache
 
 from ...core.config import get_settings
-from ...core.database import get_database, save_learning_analytics
+from ...core.database import analytics_batcher, get_database, get_redis, last_active_batcher
+from .auth import invalidate_user, user_object_id
+
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    ahocorasick = None
+    AHOCORASICK_AVAILABLE = False
 
 settings = get_settings()
-router = APIRouter()
+router = APIRouter(default_response_class=ORJSONResponse)
+
+# Extensions audio acceptées, en minuscules, résolues une seule fois
+_SUPPORTED_EXTS: tuple[str, ...] = tuple(settings.supported_audio_formats)
+
+# Réponses de /user/{user_id}/sessions déjà sérialisées, par utilisateur, pour la
+# limite par défaut seulement (les autres limites ne sont pas mises en cache).
+# Le TTL court borne l'écart avec les écritures des autres workers.
+USER_SESSIONS_CACHE_TTL = 2.0
+USER_SESSIONS_DEFAULT_LIMIT = 10
+_user_sessions_cache: TTLCache = TTLCache(maxsize=10_000, ttl=USER_SESSIONS_CACHE_TTL)
+
+# Bornes mémoire: sessions gardées par worker et messages gardés par session
+MAX_ACTIVE_SESSIONS = 10_000
+SESSION_TTL_SECONDS = 3600
+MAX_SESSION_MESSAGES = 200
+
+# Insights déjà sérialisés par utilisateur: (etag, corps JSON)
+_insights_cache: TTLCache = TTLCache(maxsize=MAX_ACTIVE_SESSIONS, ttl=SESSION_TTL_SECONDS)
+
+# Taille des blocs audio lus depuis l'upload et relayés vers les fournisseurs
+AUDIO_CHUNK_SIZE = 64 * 1024
 
 # 📝 Modèles de données
 
 class ChatMessage(BaseModel):
     """Message dans une conversation avec le tuteur IA"""
+    model_config = ConfigDict(frozen=True)
+    
     role: str  # "user" | "assistant" | "system"
     content: str
     timestamp: Optional[datetime] = None
@@ -31,13 +70,15 @@ class ChatMessage(BaseModel):
 
 class TutorRequest(BaseModel):
     """Requête au tuteur IA"""
+    model_config = ConfigDict(extra="forbid", frozen=True)
+    
     message: str
     user_id: str
     session_id: Optional[str] = None
     subject: str = "general"
     language: str = "fr"
-    difficulty_level: str = "intermediate"  # beginner, intermediate, advanced
-    learning_style: str = "mixed"  # visual, auditory, kinesthetic, mixed
+    difficulty_level: Literal["beginner", "intermediate", "advanced"] = "intermediate"
+    learning_style: Literal["visual", "auditory", "kinesthetic", "mixed"] = "mixed"
     context: Optional[Dict[str, Any]] = None
 
 class TutorResponse(BaseModel):
@@ -56,187 +97,404 @@ class LearningSession(BaseModel):
     user_id: str
     subject: str
     started_at: datetime
-    messages: List[ChatMessage] = []
-    performance_metrics: Dict[str, Any] = {}
-    emotion_timeline: List[Dict] = []
+    messages: Deque[ChatMessage] = Field(default_factory=lambda: deque(maxlen=MAX_SESSION_MESSAGES))
+    performance_metrics: Dict[str, Any] = Field(default_factory=dict)
+    emotion_timeline: List[Dict] = Field(default_factory=list)
+    
+    @field_validator("messages")
+    @classmethod
+    def _bound_messages(cls, messages: Deque[ChatMessage]) -> Deque[ChatMessage]:
+        """Ne garder que les MAX_SESSION_MESSAGES derniers messages"""
+        if messages.maxlen == MAX_SESSION_MESSAGES:
+            return messages
+        return deque(messages, maxlen=MAX_SESSION_MESSAGES)
 
-# 🗄️ Stockage temporaire des sessions (en production, utiliser Redis)
-active_sessions: Dict[str, LearningSession] = {}
+# Historique Redis décodé en un seul appel (un document JSON) plutôt que message par message
+_MESSAGES_TA = TypeAdapter(List[ChatMessage])
+
+# 🗄️ Sessions du worker courant quand Redis n'est pas connecté (LRU + TTL).
+# Avec Redis, les sessions sont toujours relues depuis Redis, seule source
+# partagée entre workers: une copie locale y serait vite périmée.
+active_sessions: TTLCache = TTLCache(maxsize=MAX_ACTIVE_SESSIONS, ttl=SESSION_TTL_SECONDS)
+# Index secondaire user_id -> sessions, les plus récentes en tête. Borné comme
+# active_sessions et réinséré à chaque nouvelle session: une entrée expire au
+# plus tôt avec la dernière session de l'utilisateur.
+_user_sessions_by_user: TTLCache = TTLCache(maxsize=MAX_ACTIVE_SESSIONS, ttl=SESSION_TTL_SECONDS)
+
+class RedisSessionStore:
+    """Sessions d'apprentissage stockées dans Redis
+    
+    - session:{sid}            hash des métadonnées
+    - session:{sid}:messages   liste de ChatMessage sérialisés (ajout O(1))
+    - user:{uid}:sessions      sorted set des sessions, score = started_at
+    - user:{uid}:emotions      compteurs d'émotions détectées
+    - user:{uid}:subjects      compteurs de sessions par sujet
+    - user:{uid}:messages      nombre total de messages
+    - user:{uid}:last_message  horodatage du dernier message (ETag des insights)
+    
+    Toutes les clés expirent après SESSION_TTL_SECONDS sans activité, comme le
+    cache local: la durée de vie est prolongée à chaque écriture.
+    """
+    
+    def __init__(self, redis: aioredis.Redis):
+        self.redis = redis
+    
+    @staticmethod
+    def _expire_keys(pipe, session: LearningSession):
+        """Prolonger la durée de vie des clés de la session et de son utilisateur"""
+        for key in (
+            f"session:{session.session_id}",
+            f"session:{session.session_id}:messages",
+            f"user:{session.user_id}:sessions",
+            f"user:{session.user_id}:emotions",
+            f"user:{session.user_id}:subjects",
+            f"user:{session.user_id}:messages",
+            f"user:{session.user_id}:last_message"
+        ):
+            pipe.expire(key, SESSION_TTL_SECONDS)
+    
+    async def create(self, session: LearningSession):
+        async with self.redis.pipeline(transaction=False) as pipe:
+            pipe.hset(f"session:{session.session_id}", mapping={
+                "session_id": session.session_id,
+                "user_id": session.user_id,
+                "subject": session.subject,
+                "started_at": session.started_at.isoformat(),
+                "performance_metrics": orjson.dumps(session.performance_metrics, default=str)
+            })
+            pipe.zadd(f"user:{session.user_id}:sessions", {session.session_id: session.started_at.timestamp()})
+            pipe.hincrby(f"user:{session.user_id}:subjects", session.subject, 1)
+            self._expire_keys(pipe, session)
+            await pipe.execute()
+    
+    async def append_messages(self, session: LearningSession, *messages: ChatMessage):
+        async with self.redis.pipeline(transaction=False) as pipe:
+            pipe.rpush(
+                f"session:{session.session_id}:messages",
+                *(message.model_dump_json() for message in messages)
+            )
+            pipe.ltrim(f"session:{session.session_id}:messages", -MAX_SESSION_MESSAGES, -1)
+            pipe.incrby(f"user:{session.user_id}:messages", len(messages))
+            pipe.set(f"user:{session.user_id}:last_message", messages[-1].timestamp.timestamp())
+            for message in messages:
+                if message.emotion_detected:
+                    pipe.hincrby(f"user:{session.user_id}:emotions", message.emotion_detected, 1)
+            self._expire_keys(pipe, session)
+            await pipe.execute()
+    
+    async def save_metrics(self, session: LearningSession):
+        async with self.redis.pipeline(transaction=False) as pipe:
+            pipe.hset(
+                f"session:{session.session_id}", "performance_metrics",
+                orjson.dumps(session.performance_metrics, default=str)
+            )
+            self._expire_keys(pipe, session)
+            await pipe.execute()
+    
+    async def load(self, session_id: str) -> Optional[LearningSession]:
+        async with self.redis.pipeline(transaction=False) as pipe:
+            pipe.hgetall(f"session:{session_id}")
+            pipe.lrange(f"session:{session_id}:messages", 0, -1)
+            meta, messages = await pipe.execute()
+        return self._to_session(meta, messages)
+    
+    async def list_for_user(self, user_id: str, limit: int) -> tuple:
+        """(nombre total de sessions, `limit` sessions les plus récentes)"""
+        async with self.redis.pipeline(transaction=False) as pipe:
+            pipe.zcard(f"user:{user_id}:sessions")
+            pipe.zrevrange(f"user:{user_id}:sessions", 0, limit - 1)
+            total, session_ids = await pipe.execute()
+        
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for session_id in session_ids:
+                pipe.hgetall(f"session:{session_id}")
+                pipe.lrange(f"session:{session_id}:messages", 0, -1)
+            results = await pipe.execute()
+        
+        sessions = [self._to_session(meta, messages) for meta, messages in zip(results[::2], results[1::2])]
+        return total, [session for session in sessions if session is not None]
+    
+    async def last_message_ts(self, user_id: str) -> Optional[str]:
+        return await self.redis.get(f"user:{user_id}:last_message")
+    
+    async def user_counters(self, user_id: str) -> Dict[str, Any]:
+        async with self.redis.pipeline(transaction=False) as pipe:
+            pipe.zcard(f"user:{user_id}:sessions")
+            pipe.get(f"user:{user_id}:messages")
+            pipe.hgetall(f"user:{user_id}:emotions")
+            pipe.hgetall(f"user:{user_id}:subjects")
+            total_sessions, total_messages, emotions, subjects = await pipe.execute()
+        return {
+            "total_sessions": total_sessions,
+            "total_messages": int(total_messages or 0),
+            "emotions": Counter({emotion: int(count) for emotion, count in emotions.items()}),
+            "subjects": Counter({subject: int(count) for subject, count in subjects.items()})
+        }
+    
+    @staticmethod
+    def _to_session(meta: Dict[str, str], messages: List[str]) -> Optional[LearningSession]:
+        if not meta:
+            return None
+        started_at = datetime.fromisoformat(meta["started_at"])
+        if started_at.tzinfo is None:
+            # Sessions écrites avant le passage à l'UTC: heure locale naïve
+            started_at = started_at.astimezone(timezone.utc)
+        return LearningSession(
+            session_id=meta["session_id"],
+            user_id=meta["user_id"],
+            subject=meta["subject"],
+            started_at=started_at,
+            messages=_MESSAGES_TA.validate_json("[" + ",".join(messages) + "]"),
+            performance_metrics=orjson.loads(meta.get("performance_metrics", "{}"))
+        )
+
+def _local_user_sessions(user_id: str) -> List[LearningSession]:
+    """Sessions encore en cache d'un utilisateur, les plus récentes en tête"""
+    session_ids = _user_sessions_by_user.get(user_id)
+    if not session_ids:
+        return []
+    
+    sessions = [active_sessions[sid] for sid in session_ids if sid in active_sessions]
+    if not sessions:
+        _user_sessions_by_user.pop(user_id, None)
+    elif len(sessions) != len(session_ids):
+        # Retirer de l'index les sessions évincées ou expirées
+        session_ids.clear()
+        session_ids.extend(session.session_id for session in sessions)
+    return sessions
+
+async def _count_new_session(user_id: str, now: datetime):
+    """Incrémenter users.total_sessions (lu tel quel par le profil) et noter l'activité"""
+    db = get_database()
+    if db is None:
+        return
+    _id = user_object_id(user_id)
+    await db.users.update_one({"_id": _id}, {"$inc": {"total_sessions": 1}})
+    # last_active passe par l'écriture groupée, comme à la connexion
+    last_active_batcher.touch(_id, now)
+    invalidate_user({"_id": user_id})
+
+def get_session_store(redis: Optional[aioredis.Redis] = Depends(get_redis)) -> Optional[RedisSessionStore]:
+    """Dépendance FastAPI: store Redis, ou None si Redis n'est pas connecté"""
+    return RedisSessionStore(redis) if redis is not None else None
+
+async def _find_session(session_id: Optional[str], store: Optional[RedisSessionStore]) -> Optional[LearningSession]:
+    """Session depuis Redis (source de vérité), sinon depuis le cache local"""
+    if session_id is None:
+        return None
+    if store is not None:
+        return await store.load(session_id)
+    return active_sessions.get(session_id)
 
 # 🤖 Routes du Tuteur IA
 
 @router.post("/chat", response_model=TutorResponse)
-async def chat_with_tutor(request: TutorRequest):
+async def chat_with_tutor(request: TutorRequest, store: Optional[RedisSessionStore] = Depends(get_session_store)):
     """
     💬 Converser avec le tuteur IA adaptatif
     
     Le tuteur s'adapte au style d'apprentissage, au niveau et à l'état émotionnel
     """
-    try:
-        # Générer un ID de session si nécessaire
-        session_id = request.session_id or f"session_{int(time.time())}_{request.user_id}"
-        
-        # Récupérer ou créer la session
-        if session_id not in active_sessions:
-            active_sessions[session_id] = LearningSession(
-                session_id=session_id,
-                user_id=request.user_id,
-                subject=request.subject,
-                started_at=datetime.now()
-            )
-        
-        session = active_sessions[session_id]
-        
-        # Analyser l'émotion du message (simulation)
-        emotion_detected = await analyze_emotion(request.message, request.language)
-        
-        # Ajouter le message utilisateur à l'historique
-        user_message = ChatMessage(
-            role="user",
-            content=request.message,
-            timestamp=datetime.now(),
-            language=request.language,
-            emotion_detected=emotion_detected.get("emotion"),
-            confidence_score=emotion_detected.get("confidence")
-        )
-        session.messages.append(user_message)
-        
-        # Générer la réponse du tuteur IA
-        tutor_response = await generate_tutor_response(
-            request=request,
-            session=session,
-            emotion_state=emotion_detected
-        )
-        
-        # Ajouter la réponse à l'historique
-        assistant_message = ChatMessage(
-            role="assistant",
-            content=tutor_response.message,
-            timestamp=datetime.now(),
-            language=request.language
+    session = await _find_session(request.session_id, store)
+    return await _chat(request, session, store)
+
+async def _chat(
+    request: TutorRequest,
+    session: Optional[LearningSession],
+    store: Optional[RedisSessionStore]
+) -> TutorResponse:
+    """Tour de conversation sur une session déjà chargée (None: session à créer)"""
+    # Horodatage unique de la requête
+    now = datetime.fromtimestamp(time.time_ns() / 1e9, timezone.utc)
+    
+    # Générer un ID de session si nécessaire
+    session_id = request.session_id or f"s_{secrets.token_hex(8)}"
+    
+    # Créer la session si elle n'existe pas
+    if session is None:
+        session = LearningSession(
+            session_id=session_id,
+            user_id=request.user_id,
+            subject=request.subject,
+            started_at=now
         )
-        session.messages.append(assistant_message)
-        
-        # Sauvegarder les analytics
-        await save_learning_analytics(request.user_id, {
-            "event_type": "ai_interaction",
-            "session_id": session_id,
-            "subject": request.subject,
-            "language": request.language,
-            "emotion_detected": emotion_detected.get("emotion"),
-            "message_length": len(request.message),
-            "response_quality": "high"  # À calculer en fonction des métriques
-        })
-        
-        tutor_response.session_id = session_id
-        return tutor_response
-        
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Erreur tuteur IA: {str(e)}")
+        if store is not None:
+            await asyncio.gather(store.create(session), _count_new_session(request.user_id, now))
+        else:
+            active_sessions[session_id] = session
+            user_index = _user_sessions_by_user.get(request.user_id) or deque()
+            user_index.appendleft(session_id)
+            _user_sessions_by_user[request.user_id] = user_index
+            await _count_new_session(request.user_id, now)
+    
+    # Analyser l'émotion du message (simulation)
+    emotion_detected = analyze_emotion(request.message, request.language)
+    
+    # Ajouter le message utilisateur à l'historique
+    user_message = ChatMessage(
+        role="user",
+        content=request.message,
+        timestamp=now,
+        language=request.language,
+        emotion_detected=emotion_detected.get("emotion"),
+        confidence_score=emotion_detected.get("confidence")
+    )
+    session.messages.append(user_message)
+    
+    # Générer la réponse du tuteur IA hors de la boucle d'événements: un thread
+    # suffit (pas de sérialisation de la session, contrairement à un processus)
+    tutor_response = await asyncio.to_thread(
+        generate_tutor_response,
+        request=request,
+        session=session,
+        emotion_state=emotion_detected
+    )
+    
+    # Ajouter la réponse à l'historique
+    assistant_message = ChatMessage(
+        role="assistant",
+        content=tutor_response.message,
+        timestamp=now,
+        language=request.language
+    )
+    session.messages.append(assistant_message)
+    
+    if store is not None:
+        await store.append_messages(session, user_message, assistant_message)
+    _user_sessions_cache.pop(session.user_id, None)
+    
+    # Sauvegarder les analytics (écriture groupée en arrière-plan)
+    analytics_batcher.enqueue(request.user_id, {
+        "event_type": "ai_interaction",
+        "session_id": session_id,
+        "subject": request.subject,
+        "language": request.language,
+        "emotion_detected": emotion_detected.get("emotion"),
+        "message_length": len(request.message),
+        "response_quality": "high"  # À calculer en fonction des métriques
+    })
+    
+    tutor_response.session_id = session_id
+    return tutor_response
 
 @router.post("/voice-chat")
 async def voice_chat_with_tutor(
     user_id: str,
     subject: str = "general",
     language: str = "fr",
-    audio_file: UploadFile = File(...)
+    session_id: Optional[str] = None,
+    audio_file: UploadFile = File(...),
+    store: Optional[RedisSessionStore] = Depends(get_session_store)
 ):
     """
     🎤 Interaction vocale avec le tuteur IA
     
     Traite l'audio avec Whisper, génère une réponse et la convertit en speech
     """
-    try:
-        # Vérifier le format audio
-        if not audio_file.filename.endswith(tuple(settings.supported_audio_formats)):
-            raise HTTPException(
-                status_code=400, 
-                detail=f"Format audio non supporté. Utilisez: {settings.supported_audio_formats}"
-            )
-        
-        # Lire le fichier audio
-        audio_content = await audio_file.read()
-        
-        # Transcription avec Whisper (simulation)
-        transcription = await transcribe_audio(audio_content, language)
-        
-        # Créer une requête de chat
-        chat_request = TutorRequest(
-            message=transcription["text"],
-            user_id=user_id,
-            subject=subject,
-            language=language
-        )
-        
-        # Obtenir la réponse du tuteur
-        tutor_response = await chat_with_tutor(chat_request)
-        
-        # Convertir la réponse en audio avec TTS
-        audio_response = await text_to_speech(
-            text=tutor_response.message,
-            language=language,
-            voice_style="educational"
+    # Vérifier le format audio
+    if not (audio_file.filename or "").casefold().endswith(_SUPPORTED_EXTS):
+        raise HTTPException(
+            status_code=400, 
+            detail=f"Format audio non supporté. Utilisez: {', '.join(_SUPPORTED_EXTS)}"
         )
-        
-        # Retourner l'audio comme streaming response
-        return StreamingResponse(
-            audio_response,
-            media_type="audio/wav",
-            headers={
-                "Content-Disposition": "attachment; filename=tutor_response.wav",
-                "X-Transcription": transcription["text"],
-                "X-Session-ID": tutor_response.session_id
-            }
-        )
-        
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Erreur chat vocal: {str(e)}")
+    
+    # Transcription avec Whisper (simulation): l'upload est relayé par blocs,
+    # sans être chargé entièrement en mémoire. La session est lue dans Redis
+    # pendant la transcription.
+    transcription, session = await asyncio.gather(
+        transcribe_audio(_iter_upload(audio_file), language),
+        _find_session(session_id, store)
+    )
+    
+    # Créer une requête de chat
+    chat_request = TutorRequest(
+        message=transcription["text"],
+        user_id=user_id,
+        session_id=session_id,
+        subject=subject,
+        language=language
+    )
+    
+    # Obtenir la réponse du tuteur
+    tutor_response = await _chat(chat_request, session, store)
+    
+    # Convertir la réponse en audio avec TTS, relayé au fil de la génération
+    audio_response = text_to_speech(
+        text=tutor_response.message,
+        language=language,
+        voice_style="educational"
+    )
+    
+    # Retourner l'audio comme streaming response
+    return StreamingResponse(
+        audio_response,
+        media_type="audio/wav",
+        headers={
+            "Content-Disposition": "attachment; filename=tutor_response.wav",
+            "X-Transcription": transcription["text"],
+            "X-Session-ID": tutor_response.session_id
+        }
+    )
 
 @router.get("/session/{session_id}", response_model=LearningSession)
-async def get_learning_session(session_id: str):
+async def get_learning_session(session_id: str, store: Optional[RedisSessionStore] = Depends(get_session_store)):
     """📊 Récupérer les détails d'une session d'apprentissage"""
-    if session_id not in active_sessions:
+    session = await _find_session(session_id, store)
+    if session is None:
         raise HTTPException(status_code=404, detail="Session non trouvée")
     
-    return active_sessions[session_id]
+    return session
 
 @router.get("/user/{user_id}/sessions")
-async def get_user_sessions(user_id: str, limit: int = 10):
+async def get_user_sessions(user_id: str, limit: int = USER_SESSIONS_DEFAULT_LIMIT,
+                            store: Optional[RedisSessionStore] = Depends(get_session_store)):
     """📋 Récupérer les sessions d'un utilisateur"""
-    user_sessions = [
-        session for session in active_sessions.values() 
-        if session.user_id == user_id
-    ]
+    cacheable = limit == USER_SESSIONS_DEFAULT_LIMIT
+    cached = _user_sessions_cache.get(user_id) if cacheable else None
+    if cached is not None:
+        return Response(content=cached, media_type="application/json")
     
-    # Trier par date (plus récentes en premier)
-    user_sessions.sort(key=lambda x: x.started_at, reverse=True)
+    if store is not None:
+        # ZREVRANGE sur l'index utilisateur: pas de parcours de toutes les sessions
+        total_sessions, sessions = await store.list_for_user(user_id, limit)
+    else:
+        # Index déjà trié du plus récent au plus ancien
+        user_sessions = _local_user_sessions(user_id)
+        total_sessions, sessions = len(user_sessions), user_sessions[:limit]
     
-    return {
+    # Sérialisé une fois puis réutilisé jusqu'au prochain message ou à l'expiration
+    content = orjson.dumps({
         "user_id": user_id,
-        "total_sessions": len(user_sessions),
-        "sessions": user_sessions[:limit]
-    }
+        "total_sessions": total_sessions,
+        "sessions": [session.model_dump(mode="json") for session in sessions]
+    })
+    if cacheable:
+        _user_sessions_cache[user_id] = content
+    return Response(content=content, media_type="application/json")
 
 @router.post("/session/{session_id}/feedback")
 async def submit_session_feedback(
     session_id: str,
-    feedback: Dict[str, Any]
+    feedback: Dict[str, Any],
+    store: Optional[RedisSessionStore] = Depends(get_session_store)
 ):
     """⭐ Soumettre un feedback sur la session d'apprentissage"""
-    if session_id not in active_sessions:
+    session = await _find_session(session_id, store)
+    if session is None:
         raise HTTPException(status_code=404, detail="Session non trouvée")
     
-    session = active_sessions[session_id]
-    
     # Ajouter le feedback aux métriques de performance
     session.performance_metrics.update({
         "user_feedback": feedback,
-        "feedback_timestamp": datetime.now(),
+        "feedback_timestamp": datetime.now(timezone.utc),
         "satisfaction_score": feedback.get("rating", 0)
     })
+    if store is not None:
+        await store.save_metrics(session)
+    _user_sessions_cache.pop(session.user_id, None)
     
     # Sauvegarder dans la base de données
-    await save_learning_analytics(session.user_id, {
+    analytics_batcher.enqueue(session.user_id, {
         "event_type": "session_feedback",
         "session_id": session_id,
         "feedback": feedback
@@ -245,106 +503,200 @@ async def submit_session_feedback(
     return {"status": "success", "message": "Feedback enregistré avec succès"}
 
 @router.get("/adaptive-insights/{user_id}")
-async def get_adaptive_insights(user_id: str):
-    """🧠 Obtenir des insights adaptatifs pour personnaliser l'apprentissage"""
-    try:
+async def get_adaptive_insights(
+    user_id: str,
+    http_request: Request,
+    store: Optional[RedisSessionStore] = Depends(get_session_store)
+):
+    """🧠 Obtenir des insights adaptatifs pour personnaliser l'apprentissage
+    
+    Les insights ne changent qu'à l'ajout d'un message: l'ETag est dérivé de
+    l'horodatage du dernier message et un If-None-Match identique renvoie 304.
+    """
+    if store is not None:
+        last_ts = await store.last_message_ts(user_id)
+    else:
+        user_sessions = _local_user_sessions(user_id)
+        last_ts = max(
+            (s.messages[-1].timestamp.timestamp() for s in user_sessions if s.messages),
+            default=None
+        )
+        # Une session évincée du cache change aussi le résultat
+        last_ts = f"{last_ts}:{len(user_sessions)}"
+    etag = '"' + hashlib.blake2b(f"{user_id}:{last_ts}".encode(), digest_size=8).hexdigest() + '"'
+    
+    if http_request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+    
+    cached = _insights_cache.get(user_id)
+    if cached is not None and cached[0] == etag:
+        return Response(cached[1], media_type="application/json", headers={"ETag": etag})
+    
+    if store is not None:
+        # Compteurs tenus à jour à chaque message: une seule lecture pipelinée
+        counters = await store.user_counters(user_id)
+        total_sessions = counters["total_sessions"]
+        avg_session_length = counters["total_messages"] / total_sessions if total_sessions else 0
+        emotion_counts = counters["emotions"]
+        subject_counts = counters["subjects"]
+    else:
         # Analyser l'historique d'apprentissage de l'utilisateur
-        user_sessions = [
-            session for session in active_sessions.values() 
-            if session.user_id == user_id
-        ]
-        
-        if not user_sessions:
-            return {
-                "user_id": user_id,
-                "insights": "Données insuffisantes pour générer des insights",
-                "recommendations": [
-                    "Commencez par une session d'introduction",
-                    "Explorez différents sujets pour identifier vos préférences"
-                ]
-            }
-        
-        # Calculer les métriques d'apprentissage
         total_sessions = len(user_sessions)
-        avg_session_length = sum(len(s.messages) for s in user_sessions) / total_sessions
-        
-        # Analyser les émotions dominantes
-        all_emotions = []
-        for session in user_sessions:
-            for message in session.messages:
-                if message.emotion_detected:
-                    all_emotions.append(message.emotion_detected)
-        
-        dominant_emotion = max(set(all_emotions), key=all_emotions.count) if all_emotions else "neutral"
-        
-        # Analyser les sujets préférés
-        subject_counts = {}
-        for session in user_sessions:
-            subject_counts[session.subject] = subject_counts.get(session.subject, 0) + 1
-        
-        preferred_subject = max(subject_counts.items(), key=lambda x: x[1])[0] if subject_counts else "general"
+        avg_session_length = sum(len(s.messages) for s in user_sessions) / total_sessions if total_sessions else 0
         
+        # Analyser les émotions et les sujets
+        emotion_counts = Counter(
+            m.emotion_detected for s in user_sessions for m in s.messages if m.emotion_detected
+        )
+        subject_counts = Counter(s.subject for s in user_sessions)
+    
+    if not total_sessions:
         insights = {
             "user_id": user_id,
-            "learning_profile": {
-                "total_sessions": total_sessions,
-                "avg_interaction_per_session": round(avg_session_length, 1),
-                "dominant_emotion": dominant_emotion,
-                "preferred_subject": preferred_subject,
-                "engagement_level": "high" if avg_session_length > 5 else "medium"
-            },
-            "personalized_recommendations": [
-                f"Continuez à explorer {preferred_subject} - vous montrez de l'intérêt !",
-                f"Votre état émotionnel '{dominant_emotion}' suggère un style d'apprentissage adaptatif",
-                "Essayez les exercices interactifs pour maintenir l'engagement"
-            ],
-            "next_learning_paths": [
-                {
-                    "subject": preferred_subject,
-                    "difficulty": "intermediate",
-                    "estimated_duration": "15-20 minutes"
-                }
+            "insights": "Données insuffisantes pour générer des insights",
+            "recommendations": [
+                "Commencez par une session d'introduction",
+                "Explorez différents sujets pour identifier vos préférences"
             ]
         }
-        
-        return insights
-        
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Erreur génération insights: {str(e)}")
+    else:
+        insights = _build_insights(user_id, total_sessions, avg_session_length, emotion_counts, subject_counts)
+    
+    content = orjson.dumps(insights)
+    _insights_cache[user_id] = (etag, content)
+    return Response(content, media_type="application/json", headers={"ETag": etag})
+
+def _build_insights(
+    user_id: str,
+    total_sessions: int,
+    avg_session_length: float,
+    emotion_counts: Counter,
+    subject_counts: Counter
+) -> Dict[str, Any]:
+    """Profil d'apprentissage et recommandations à partir des compteurs"""
+    # Émotion dominante et sujet préféré
+    dominant_emotion = emotion_counts.most_common(1)[0][0] if emotion_counts else "neutral"
+    
+    preferred_subject = subject_counts.most_common(1)[0][0] if subject_counts else "general"
+    
+    insights = {
+        "user_id": user_id,
+        "learning_profile": {
+            "total_sessions": total_sessions,
+            "avg_interaction_per_session": round(avg_session_length, 1),
+            "dominant_emotion": dominant_emotion,
+            "preferred_subject": preferred_subject,
+            "engagement_level": "high" if avg_session_length > 5 else "medium"
+        },
+        "personalized_recommendations": [
+            f"Continuez à explorer {preferred_subject} - vous montrez de l'intérêt !",
+            f"Votre état émotionnel '{dominant_emotion}' suggère un style d'apprentissage adaptatif",
+            "Essayez les exercices interactifs pour maintenir l'engagement"
+        ],
+        "next_learning_paths": [
+            {
+                "subject": preferred_subject,
+                "difficulty": "intermediate",
+                "estimated_duration": "15-20 minutes"
+            }
+        ]
+    }
+    
+    return insights
 
 # 🛠️ Fonctions utilitaires
 
-async def analyze_emotion(text: str, language: str) -> Dict[str, Any]:
+_AVAILABLE_EMOTIONS = ["happy", "sad", "frustrated", "excited", "confused", "confident", "neutral"]
+
+# Logique simple basée sur des mots-clés, par ordre de priorité
+_EMOTION_KEYWORDS = {
+    "happy": ["super", "génial", "parfait", "excellent", "great", "awesome"],
+    "frustrated": ["difficile", "compliqué", "impossible", "nul", "hate", "difficult"],
+    "confused": ["comprends pas", "confus", "quoi", "confused", "what", "huh"],
+    "excited": ["wow", "incroyable", "amazing", "fantastic", "love"],
+    "confident": ["facile", "sûr", "certain", "easy", "confident", "sure"]
+}
+_EMOTIONS_BY_PRIORITY = tuple(_EMOTION_KEYWORDS)
+_EMOTION_PRIORITY = {emotion: index for index, emotion in enumerate(_EMOTIONS_BY_PRIORITY)}
+
+def _build_emotion_automaton():
+    """Compile tous les mots-clés en un automate Aho-Corasick"""
+    if not AHOCORASICK_AVAILABLE:
+        return None
+    
+    automaton = ahocorasick.Automaton()
+    for emotion, keywords in _EMOTION_KEYWORDS.items():
+        for keyword in keywords:
+            # Première émotion déclarée conservée si un mot-clé est partagé
+            if keyword not in automaton:
+                automaton.add_word(keyword, emotion)
+    automaton.make_automaton()
+    return automaton
+
+_EMOTION_AUTOMATON = _build_emotion_automaton()
+
+# Repli sans pyahocorasick: une seule alternation compilée, dans un lookahead
+# pour compter les mots-clés qui se chevauchent ("whatever" contient "what" et
+# "hate"). À une même position, le mot-clé de plus haute priorité est essayé
+# en premier: la priorité minimale est la même qu'avec l'automate.
+_KEYWORD_EMOTION = {
+    keyword: emotion
+    for emotion, keywords in reversed(_EMOTION_KEYWORDS.items())
+    for keyword in keywords
+}
+_EMOTION_RE = re.compile("(?=(" + "|".join(map(re.escape, sorted(
+    _KEYWORD_EMOTION, key=lambda keyword: (_EMOTION_PRIORITY[_KEYWORD_EMOTION[keyword]], -len(keyword))
+))) + "))")
+
+def _automaton_priorities(text_lower: str) -> List[int]:
+    """Priorités des émotions de tous les mots-clés trouvés (Aho-Corasick)"""
+    return [_EMOTION_PRIORITY[emotion] for _, emotion in _EMOTION_AUTOMATON.iter(text_lower)]
+
+def _regex_priorities(text_lower: str) -> List[int]:
+    """Priorités des émotions de tous les mots-clés trouvés (repli regex)"""
+    return [_EMOTION_PRIORITY[_KEYWORD_EMOTION[m.group(1)]] for m in _EMOTION_RE.finditer(text_lower)]
+
+def analyze_emotion(text: str, language: str) -> Dict[str, Any]:
     """Analyser l'émotion dans un texte"""
     # Simulation - en réalité, utiliser un modèle de détection d'émotion
-    emotions = ["happy", "sad", "frustrated", "excited", "confused", "confident", "neutral"]
-    
-    # Logique simple basée sur des mots-clés
-    emotion_keywords = {
-        "happy": ["super", "génial", "parfait", "excellent", "great", "awesome"],
-        "frustrated": ["difficile", "compliqué", "impossible", "nul", "hate", "difficult"],
-        "confused": ["comprends pas", "confus", "quoi", "confused", "what", "huh"],
-        "excited": ["wow", "incroyable", "amazing", "fantastic", "love"],
-        "confident": ["facile", "sûr", "certain", "easy", "confident", "sure"]
-    }
-    
     text_lower = text.lower()
     detected_emotion = "neutral"
     confidence = 0.5
     
-    for emotion, keywords in emotion_keywords.items():
-        if any(keyword in text_lower for keyword in keywords):
-            detected_emotion = emotion
-            confidence = 0.8
-            break
+    # Un seul passage sur le texte; à égalité, l'émotion déclarée en premier l'emporte
+    if _EMOTION_AUTOMATON is not None:
+        priorities = _automaton_priorities(text_lower)
+    else:
+        priorities = _regex_priorities(text_lower)
+    
+    if priorities:
+        detected_emotion = _EMOTIONS_BY_PRIORITY[min(priorities)]
+        confidence = 0.8
     
     return {
         "emotion": detected_emotion,
         "confidence": confidence,
-        "available_emotions": emotions
+        "available_emotions": _AVAILABLE_EMOTIONS
     }
 
-async def generate_tutor_response(
+# Adaptation du ton selon l'émotion détectée
+_TONE_ADAPTATIONS = {
+    "frustrated": "Je comprends que cela puisse être frustrant. Prenons les choses étape par étape.",
+    "confused": "Pas de souci, clarifions cela ensemble. Quelle partie vous pose le plus de problème ?",
+    "excited": "J'adore votre enthousiasme ! Continuons sur cette lancée.",
+    "confident": "Excellent ! Vous maîtrisez bien. Prêt pour un défi plus avancé ?",
+    "sad": "L'apprentissage peut parfois sembler difficile, mais vous progressez vraiment bien."
+}
+
+# Simulation d'une réponse éducative (en réalité, utiliser GPT-4)
+_EDU_RESPONSES = {
+    "mathematics": "Les mathématiques suivent des patterns logiques. Essayons de décomposer le problème...",
+    "science": "La science nous aide à comprendre le monde qui nous entoure. Observons ce phénomène...",
+    "history": "L'histoire nous enseigne les leçons du passé. Cette période était caractérisée par...",
+    "literature": "La littérature exprime la beauté du langage. Analysons ce texte ensemble..."
+}
+
+def generate_tutor_response(
     request: TutorRequest,
     session: LearningSession,
     emotion_state: Dict[str, Any]
@@ -354,33 +706,17 @@ async def generate_tutor_response(
     # Adapter le ton selon l'émotion détectée
     emotion = emotion_state.get("emotion", "neutral")
     
-    tone_adaptations = {
-        "frustrated": "Je comprends que cela puisse être frustrant. Prenons les choses étape par étape.",
-        "confused": "Pas de souci, clarifions cela ensemble. Quelle partie vous pose le plus de problème ?",
-        "excited": "J'adore votre enthousiasme ! Continuons sur cette lancée.",
-        "confident": "Excellent ! Vous maîtrisez bien. Prêt pour un défi plus avancé ?",
-        "sad": "L'apprentissage peut parfois sembler difficile, mais vous progressez vraiment bien."
-    }
-    
     # Construire la réponse selon le contexte
     base_response = f"Concernant votre question sur {request.subject}: "
     
     # Ajouter l'adaptation émotionnelle
-    if emotion in tone_adaptations:
-        emotion_adaptation = tone_adaptations[emotion]
+    emotion_adaptation = _TONE_ADAPTATIONS.get(emotion)
+    if emotion_adaptation:
         response = f"{emotion_adaptation} {base_response}"
     else:
         response = base_response
     
-    # Simulation d'une réponse éducative (en réalité, utiliser GPT-4)
-    educational_responses = {
-        "mathematics": "Les mathématiques suivent des patterns logiques. Essayons de décomposer le problème...",
-        "science": "La science nous aide à comprendre le monde qui nous entoure. Observons ce phénomène...",
-        "history": "L'histoire nous enseigne les leçons du passé. Cette période était caractérisée par...",
-        "literature": "La littérature exprime la beauté du langage. Analysons ce texte ensemble..."
-    }
-    
-    subject_response = educational_responses.get(request.subject, "C'est une excellente question ! Explorons cela ensemble.")
+    subject_response = _EDU_RESPONSES.get(request.subject, "C'est une excellente question ! Explorons cela ensemble.")
     response += subject_response
     
     # Générer des exercices suggérés
@@ -402,7 +738,7 @@ async def generate_tutor_response(
     # Insights d'apprentissage
     learning_insights = {
         "interaction_count": len(session.messages),
-        "session_duration": (datetime.now() - session.started_at).seconds,
+        "session_duration": (datetime.now(timezone.utc) - session.started_at).seconds,
         "emotion_trend": emotion,
         "engagement_level": "high" if len(session.messages) > 3 else "building"
     }
@@ -410,7 +746,7 @@ async def generate_tutor_response(
     return TutorResponse(
         message=response,
         session_id=session.session_id,
-        emotion_adaptation=tone_adaptations.get(emotion),
+        emotion_adaptation=emotion_adaptation,
         suggested_exercises=suggested_exercises,
         learning_insights=learning_insights,
         next_recommendations=[
@@ -420,30 +756,37 @@ async def generate_tutor_response(
         ]
     )
 
-async def transcribe_audio(audio_content: bytes, language: str) -> Dict[str, Any]:
-    """Transcrire l'audio en texte avec Whisper"""
+async def _iter_upload(upload: UploadFile) -> AsyncIterator[bytes]:
+    """Lire un fichier uploadé par blocs de AUDIO_CHUNK_SIZE"""
+    while chunk := await upload.read(AUDIO_CHUNK_SIZE):
+        yield chunk
+
+async def transcribe_audio(audio_chunks: AsyncIterator[bytes], language: str) -> Dict[str, Any]:
+    """Transcrire l'audio en texte avec Whisper
+    
+    Les blocs sont destinés à être passés tels quels au client HTTP
+    (httpx: `client.stream("POST", ..., content=audio_chunks)`).
+    """
     # Simulation - en réalité, utiliser OpenAI Whisper API
+    audio_size = 0
+    async for chunk in audio_chunks:
+        audio_size += len(chunk)
     await asyncio.sleep(1)  # Simuler le traitement
     
     return {
         "text": "Bonjour, peux-tu m'aider avec les mathématiques ?",
         "language": language,
         "confidence": 0.95,
-        "duration": 3.5
+        "duration": 3.5,
+        "audio_size": audio_size
     }
 
-async def text_to_speech(text: str, language: str, voice_style: str = "educational"):
-    """Convertir le texte en parole avec ElevenLabs"""
-    # Simulation - en réalité, utiliser ElevenLabs API
-    await asyncio.sleep(1)  # Simuler la génération
+async def text_to_speech(text: str, language: str, voice_style: str = "educational") -> AsyncIterator[bytes]:
+    """Convertir le texte en parole avec ElevenLabs, bloc par bloc
     
-    # Retourner un générateur pour l'audio (simulation)
-    async def generate_audio():
-        yield b"fake_audio_data_here"  # En réalité, les données audio réelles
-    
-    return generate_audio()
-
-# Middleware pour la gestion des erreurs
-@router.exception_handler(Exception)
-async def tutor_exception_handler(request, exc):
-    return {"error": "Erreur du tuteur IA", "detail": str(exc), "status": "error"}
+    En production, relayer l'endpoint de streaming du fournisseur:
+    `async for chunk in response.aiter_bytes(): yield chunk`.
+    """
+    # Simulation - en réalité, utiliser ElevenLabs API
+    await asyncio.sleep(1)  # Simuler la génération du premier bloc
+    yield b"fake_audio_data_here"  # En réalité, les données audio réelles
@@ -3,28 +3,94 @@
 Système d'auth sécurisé pour l'application PWA éducative
 """
 
-from fastapi import APIRouter, HTTPException, Depends, status
+from fastapi import APIRouter, HTTPException, Depends, Query, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, EmailStr, Field, field_validator
 from typing import Optional
-from datetime import datetime, timedelta
-import jwt
-from passlib.context import CryptContext
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta, timezone
+import asyncio
+import base64
+import hashlib
+import hmac
+import logging
+import multiprocessing
+import os
+import time
+import orjson
+from bson import ObjectId
+from cachetools import TTLCache
+from pymongo.errors import DuplicateKeyError
+from redis.exceptions import RedisError
 import secrets
 
 from ...core.config import get_settings
-from ...core.database import get_database
+from ...core.database import get_database, get_redis, last_active_batcher
+from ...core.password_workers import hash_password_sync, verify_and_update
 
 settings = get_settings()
 router = APIRouter()
+logger = logging.getLogger(__name__)
 
 # Constants pour les types de tokens
 TOKEN_TYPE_ACCESS = "access"
 TOKEN_TYPE_REFRESH = "refresh"
 
+# ⏱️ Durées et langues dérivées des paramètres, calculées une seule fois
+_ACCESS_TD = timedelta(minutes=settings.access_token_expire_minutes)
+_ACCESS_SECONDS = int(_ACCESS_TD.total_seconds())
+_REMEMBER_ME_TD = timedelta(days=7)
+_REFRESH_SECONDS = int(timedelta(days=settings.refresh_token_expire_days).total_seconds())
+_SUPPORTED_LANGS = frozenset(settings.supported_languages)
+
+# 🔑 Bornes des mots de passe, vérifiées avant tout hachage. Les nouveaux hashes sont
+# en argon2id (aucune troncature): la borne en octets UTF-8 plafonne seulement le
+# coût d'une inscription. Les saisies à vérifier sont bornées plus largement pour
+# ne pas bloquer d'anciens comptes.
+MIN_PASSWORD_LENGTH = 8
+MAX_PASSWORD_BYTES = 128
+MAX_PASSWORD_INPUT = 256
+
 # 🔒 Configuration sécurité
 security = HTTPBearer()
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Pool dédié au hachage: argon2/bcrypt saturent le CPU et ne doivent pas occuper
+# le pool de threads partagé avec les E/S bloquantes. Créé et arrêté par le
+# lifespan (start_password_pool / shutdown_password_pool).
+_pw_pool: Optional[ProcessPoolExecutor] = None
+# Hash vérifié quand l'email est inconnu: la connexion prend le même temps
+# que l'utilisateur existe ou non (pas d'énumération des comptes)
+_DUMMY_HASH: Optional[str] = None
+
+# 🎫 JWT HS256 signés directement avec hmac/hashlib (OpenSSL)
+_JWT_KEY = settings.secret_key.encode()
+_JWT_HEADER = base64.urlsafe_b64encode(orjson.dumps({"alg": "HS256", "typ": "JWT"})).rstrip(b"=")
+
+class InvalidTokenError(Exception):
+    """Token JWT mal formé, mal signé ou expiré"""
+
+# Claims obligatoires par type de token (exp est toujours vérifié)
+_ACCESS_CLAIMS = ("sub",)
+_REFRESH_CLAIMS = ("user_id", "type")
+
+# Payloads JWT déjà vérifiés, par empreinte du token (la clé n'est pas secrète)
+_jwt_cache: TTLCache = TTLCache(maxsize=50_000, ttl=30)
+# Tokens révoqués à la déconnexion: miroir local de rev:{empreinte} dans Redis,
+# consulté en premier; Redis est interrogé à chaque requête (EXISTS) pour que
+# la révocation soit partagée entre workers
+_revoked_tokens: TTLCache = TTLCache(maxsize=50_000, ttl=int(_REMEMBER_ME_TD.total_seconds()))
+
+# 👥 Cache des utilisateurs par worker: évite un find_one par requête authentifiée.
+# Invalidé à chaque écriture sur l'utilisateur; le TTL borne l'écart entre workers.
+USER_CACHE_TTL = 60
+_user_cache: TTLCache = TTLCache(maxsize=10_000, ttl=USER_CACHE_TTL)
+
+# Champs chargés pour l'utilisateur courant: ni password_hash, ni achievements
+_USER_PROJECTION = {
+    "_id": 1, "email": 1, "username": 1, "language": 1, "country": 1,
+    "created_at": 1, "last_active": 1, "learning_streak": 1, "total_sessions": 1,
+    "learning_preferences": 1, "is_active": 1
+}
+_LOGIN_PROJECTION = {"_id": 1, "email": 1, "password_hash": 1, "is_active": 1}
 
 # 📝 Modèles de données
 
@@ -32,16 +98,36 @@ class UserRegister(BaseModel):
     """Modèle pour l'inscription d'un utilisateur"""
     username: str
     email: EmailStr
-    password: str
+    password: str = Field(min_length=MIN_PASSWORD_LENGTH)
     language: str = "fr"
     country: Optional[str] = None
     learning_preferences: Optional[dict] = {}
+    
+    @field_validator("email")
+    @classmethod
+    def _lowercase_email(cls, email: str) -> str:
+        """Emails stockés et recherchés en minuscules (index unique users.email)"""
+        return email.lower()
+    
+    @field_validator("password")
+    @classmethod
+    def _bounded_password(cls, password: str) -> str:
+        """Longueur maximale comptée en octets UTF-8, pas en caractères"""
+        if len(password.encode()) > MAX_PASSWORD_BYTES:
+            raise ValueError(f"Le mot de passe ne doit pas dépasser {MAX_PASSWORD_BYTES} octets")
+        return password
 
 class UserLogin(BaseModel):
     """Modèle pour la connexion d'un utilisateur"""
     email: EmailStr
-    password: str
+    password: str = Field(max_length=MAX_PASSWORD_INPUT)
     remember_me: bool = False
+    
+    @field_validator("email")
+    @classmethod
+    def _lowercase_email(cls, email: str) -> str:
+        """Emails stockés et recherchés en minuscules (index unique users.email)"""
+        return email.lower()
 
 class Token(BaseModel):
     """Modèle pour les tokens d'authentification"""
@@ -65,70 +151,217 @@ class UserProfile(BaseModel):
 
 # 🔐 Fonctions de sécurité
 
-def hash_password(password: str) -> str:
-    """Hasher un mot de passe"""
-    return pwd_context.hash(password)
+def _password_pool_size() -> int:
+    """Processus de hachage par worker uvicorn: les cœurs sont partagés entre workers"""
+    workers = int(os.getenv("PASSWORD_HASH_WORKERS", "0"))
+    if workers:
+        return workers
+    web_workers = max(1, int(os.getenv("WEB_CONCURRENCY", "1")))
+    return max(1, (os.cpu_count() or 1) // web_workers)
+
+async def start_password_pool() -> None:
+    """Créer le pool de hachage et démarrer ses processus (lifespan)
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    """Vérifier un mot de passe"""
-    return pwd_context.verify(plain_password, hashed_password)
+    Une tâche par worker: chaque processus est lancé et importé avant la première
+    connexion, et le hash factice des emails inconnus est calculé au passage.
+    """
+    global _pw_pool, _DUMMY_HASH
+    if _pw_pool is not None:
+        return
+    size = _password_pool_size()
+    _pw_pool = ProcessPoolExecutor(max_workers=size, mp_context=multiprocessing.get_context("spawn"))
+    hashes = await asyncio.gather(*(hash_password(secrets.token_urlsafe(16)) for _ in range(size)))
+    _DUMMY_HASH = hashes[0]
+
+def shutdown_password_pool() -> None:
+    """Arrêter le pool de hachage (lifespan)"""
+    global _pw_pool
+    if _pw_pool is not None:
+        _pw_pool.shutdown(wait=False, cancel_futures=True)
+        _pw_pool = None
+
+async def hash_password(password: str) -> str:
+    """Hasher un mot de passe (dans _pw_pool, pool de threads par défaut hors lifespan)"""
+    return await asyncio.get_running_loop().run_in_executor(_pw_pool, hash_password_sync, password)
+
+async def verify_password(plain_password: str, hashed_password: str) -> tuple:
+    """Vérifier un mot de passe (dans _pw_pool, pool de threads par défaut hors lifespan)
+
+    Retourne (valide, nouveau hash si l'ancien doit être migré, sinon None).
+    """
+    return await asyncio.get_running_loop().run_in_executor(
+        _pw_pool, verify_and_update, plain_password, hashed_password
+    )
+
+async def _dummy_hash() -> str:
+    """Hash vérifié quand l'email est inconnu (calculé au démarrage du pool)"""
+    global _DUMMY_HASH
+    if _DUMMY_HASH is None:
+        _DUMMY_HASH = await hash_password(secrets.token_urlsafe(16))
+    return _DUMMY_HASH
+
+def _b64url_decode(segment: bytes) -> bytes:
+    return base64.urlsafe_b64decode(segment + b"=" * (-len(segment) % 4))
+
+def _encode_hs256(payload: dict) -> str:
+    """Signer un payload en JWT HS256"""
+    signing_input = _JWT_HEADER + b"." + base64.urlsafe_b64encode(orjson.dumps(payload)).rstrip(b"=")
+    signature = hmac.new(_JWT_KEY, signing_input, hashlib.sha256).digest()
+    return (signing_input + b"." + base64.urlsafe_b64encode(signature).rstrip(b"=")).decode()
+
+def _decode_hs256(token: str) -> dict:
+    """Vérifier la signature et l'expiration d'un JWT HS256"""
+    try:
+        signing_input, _, signature = token.encode().rpartition(b".")
+        header, _, body = signing_input.partition(b".")
+        expected = hmac.new(_JWT_KEY, signing_input, hashlib.sha256).digest()
+        # Comparaison sur la forme base64url canonique (sans padding): un token
+        # valide n'a qu'une seule écriture, ce qui rend _token_key fiable
+        if not hmac.compare_digest(base64.urlsafe_b64encode(expected).rstrip(b"="), signature):
+            raise InvalidTokenError("Signature invalide")
+        if orjson.loads(_b64url_decode(header)).get("alg") != "HS256":
+            raise InvalidTokenError("Algorithme non supporté")
+        payload = orjson.loads(_b64url_decode(body))
+        exp = payload.get("exp")
+    except (ValueError, TypeError, AttributeError) as e:
+        raise InvalidTokenError("Token mal formé") from e
+    
+    if not isinstance(exp, (int, float)) or exp <= time.time():
+        raise InvalidTokenError("Token expiré")
+    return payload
 
-def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
-    """Créer un token d'accès JWT"""
+def create_access_token(data: dict, now: Optional[datetime] = None, expires_delta: Optional[timedelta] = None):
+    """Créer un token d'accès JWT (`now`: horodatage de la requête, sinon l'heure courante)"""
     to_encode = data.copy()
     
-    if expires_delta:
-        expire = datetime.utcnow() + expires_delta
-    else:
-        expire = datetime.utcnow() + timedelta(minutes=settings.access_token_expire_minutes)
+    if not expires_delta:
+        expires_delta = _ACCESS_TD
     
-    to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(to_encode, settings.secret_key, algorithm="HS256")
-    return encoded_jwt
+    issued_at = now.timestamp() if now else time.time()
+    to_encode.update({"exp": int(issued_at + expires_delta.total_seconds())})
+    return _encode_hs256(to_encode)
 
-def create_refresh_token(user_id: str) -> str:
+def create_refresh_token(user_id: str, now: Optional[datetime] = None) -> str:
     """Créer un token de rafraîchissement"""
+    issued_at = now.timestamp() if now else time.time()
     data = {
         "user_id": user_id,
         "type": TOKEN_TYPE_REFRESH,
-        "exp": datetime.utcnow() + timedelta(days=settings.refresh_token_expire_days)
+        "exp": int(issued_at) + _REFRESH_SECONDS
     }
-    return jwt.encode(data, settings.secret_key, algorithm="HS256")
+    return _encode_hs256(data)
 
-async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
-    """Obtenir l'utilisateur actuel à partir du token"""
+def _token_key(token: str) -> bytes:
+    return hashlib.blake2b(token.encode(), digest_size=16).digest()
+
+async def _revoked_in_redis(key: bytes) -> bool:
+    """Révocation partagée entre workers; sans Redis, seul le miroir local compte"""
+    redis = get_redis()
+    if redis is None:
+        return False
     try:
-        token = credentials.credentials
-        payload = jwt.decode(token, settings.secret_key, algorithms=["HS256"])
-        user_id: str = payload.get("sub")
-        
-        if user_id is None:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Token invalide",
-                headers={"WWW-Authenticate": "Bearer"},
-            )
-        
-        # Récupérer l'utilisateur depuis la base de données
-        db = get_database()
-        user = await db.users.find_one({"_id": user_id})
-        
-        if user is None:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Utilisateur non trouvé",
-                headers={"WWW-Authenticate": "Bearer"},
-            )
-        
-        return user
-        
-    except jwt.PyJWTError:
+        return bool(await redis.exists(f"rev:{key.hex()}"))
+    except RedisError as e:
+        logger.warning(f"Redis indisponible pour la révocation des tokens: {e}")
+        return False
+
+async def decode_token(token: str, required: tuple = _ACCESS_CLAIMS) -> dict:
+    """Vérifier et décoder un JWT, en réutilisant un décodage récent du même token"""
+    key = _token_key(token)
+    if key in _revoked_tokens:
+        raise InvalidTokenError("Token révoqué")
+    
+    payload = _jwt_cache.get(key)
+    if payload is None or payload["exp"] <= time.time():
+        payload = _decode_hs256(token)
+        _jwt_cache[key] = payload
+    
+    # Consulté même pour un token en cache: une déconnexion sur un autre
+    # worker doit prendre effet immédiatement
+    if await _revoked_in_redis(key):
+        _revoked_tokens[key] = True
+        _jwt_cache.pop(key, None)
+        raise InvalidTokenError("Token révoqué")
+    
+    for claim in required:
+        if payload.get(claim) is None:
+            raise InvalidTokenError(f"Claim manquant: {claim}")
+    return payload
+
+def user_object_id(user_id: str):
+    """_id MongoDB d'un identifiant utilisateur: ObjectId, ou ancien identifiant texte
+    
+    Les tokens et les autres collections (user_id) gardent la forme texte.
+    """
+    return ObjectId(user_id) if ObjectId.is_valid(user_id) else user_id
+
+def invalidate_user(user: dict):
+    """Retirer un utilisateur du cache après modification"""
+    _user_cache.pop(str(user["_id"]), None)
+
+async def _get_user_by_id(user_id: str) -> Optional[dict]:
+    """Utilisateur (champs de _USER_PROJECTION) depuis le cache, sinon depuis MongoDB"""
+    user = _user_cache.get(user_id)
+    if user is None:
+        user = await get_database().users.find_one({"_id": user_object_id(user_id)}, projection=_USER_PROJECTION)
+        if user is not None:
+            _user_cache[user_id] = user
+    return user
+
+async def revoke_token(token: str):
+    """Révoquer un token jusqu'à son expiration (ce worker, puis les autres via Redis)"""
+    key = _token_key(token)
+    payload = _jwt_cache.pop(key, None) or _decode_hs256(token)
+    _revoked_tokens[key] = True
+    
+    ttl = int(payload["exp"] - time.time())
+    redis = get_redis()
+    if redis is not None and ttl > 0:
+        try:
+            await redis.setex(f"rev:{key.hex()}", ttl, 1)
+        except RedisError as e:
+            logger.warning(f"Révocation non propagée aux autres workers: {e}")
+
+async def _user_id_from_credentials(credentials: HTTPAuthorizationCredentials) -> str:
+    """Identifiant utilisateur du token d'accès, ou 401"""
+    try:
+        return (await decode_token(credentials.credentials))["sub"]
+    except InvalidTokenError:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Token invalide",
             headers={"WWW-Authenticate": "Bearer"},
         )
 
+def _user_not_found() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Utilisateur non trouvé",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
+    """Obtenir l'utilisateur actuel à partir du token (champs usuels, mis en cache)"""
+    user = await _get_user_by_id(await _user_id_from_credentials(credentials))
+    if user is None:
+        raise _user_not_found()
+    return user
+
+async def get_current_user_full(credentials: HTTPAuthorizationCredentials = Depends(security)):
+    """Obtenir le document complet de l'utilisateur actuel (avec password_hash)"""
+    user_id = await _user_id_from_credentials(credentials)
+    user = await get_database().users.find_one({"_id": user_object_id(user_id)})
+    if user is None:
+        raise _user_not_found()
+    return user
+
+def _duplicate_user_error(email_taken: bool) -> HTTPException:
+    """Erreur 400 pour un email ou un nom d'utilisateur déjà utilisé"""
+    return HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail="Cet email est déjà utilisé" if email_taken else "Ce nom d'utilisateur est déjà pris"
+    )
+
 # 🛣️ Routes d'authentification
 
 @router.post("/register", response_model=Token)
@@ -138,84 +371,75 @@ async def register_user(user_data: UserRegister):
     
     Crée un compte utilisateur avec préférences d'apprentissage
     """
-    try:
-        db = get_database()
-        
-        # Vérifier si l'email existe déjà
-        existing_user = await db.users.find_one({"email": user_data.email})
-        if existing_user:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Cet email est déjà utilisé"
-            )
-        
-        # Vérifier si le nom d'utilisateur existe déjà
-        existing_username = await db.users.find_one({"username": user_data.username})
-        if existing_username:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Ce nom d'utilisateur est déjà pris"
-            )
-        
-        # Valider la langue supportée
-        if user_data.language not in settings.supported_languages:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Langue non supportée. Langues disponibles: {settings.supported_languages}"
-            )
-        
-        # Créer l'utilisateur
-        user_id = secrets.token_urlsafe(16)
-        hashed_password = hash_password(user_data.password)
-        
-        new_user = {
-            "_id": user_id,
-            "username": user_data.username,
-            "email": user_data.email,
-            "password_hash": hashed_password,
-            "language": user_data.language,
-            "country": user_data.country,
-            "learning_preferences": user_data.learning_preferences or {
-                "difficulty_level": "beginner",
-                "learning_style": "mixed",
-                "subjects": [],
-                "daily_goal_minutes": 30
-            },
-            "created_at": datetime.utcnow(),
-            "last_active": datetime.utcnow(),
-            "is_active": True,
-            "total_sessions": 0,
-            "learning_streak": 0,
-            "achievements": [],
-            "settings": {
-                "notifications": True,
-                "sound_enabled": True,
-                "theme": "light"
-            }
-        }
-        
-        # Insérer en base de données
-        await db.users.insert_one(new_user)
-        
-        # Créer les tokens
-        access_token_expires = timedelta(minutes=settings.access_token_expire_minutes)
-        access_token = create_access_token(
-            data={"sub": user_id, "email": user_data.email},
-            expires_delta=access_token_expires
-        )
-        refresh_token = create_refresh_token(user_id)
-        
-        return Token(
-            access_token=access_token,
-            refresh_token=refresh_token,
-            expires_in=settings.access_token_expire_minutes * 60
-        )
-        
-    except Exception as e:
+    db = get_database()
+    
+    # Valider la langue supportée
+    if user_data.language not in _SUPPORTED_LANGS:
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Erreur lors de l'inscription: {str(e)}"
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Langue non supportée. Langues disponibles: {settings.supported_languages}"
         )
+    
+    # Vérifier en une seule requête si l'email ou le nom d'utilisateur existe déjà
+    existing = await db.users.find_one(
+        {"$or": [{"email": user_data.email}, {"username": user_data.username}]},
+        projection={"email": 1, "username": 1}
+    )
+    if existing:
+        raise _duplicate_user_error(email_taken=existing.get("email") == user_data.email)
+    
+    # Créer l'utilisateur
+    now = datetime.now(timezone.utc)
+    # ObjectId: clé d'index de 12 octets, croissante dans le temps
+    object_id = ObjectId()
+    user_id = str(object_id)
+    hashed_password = await hash_password(user_data.password)
+    
+    new_user = {
+        "_id": object_id,
+        "username": user_data.username,
+        "email": user_data.email,
+        "password_hash": hashed_password,
+        "language": user_data.language,
+        "country": user_data.country,
+        "learning_preferences": user_data.learning_preferences or {
+            "difficulty_level": "beginner",
+            "learning_style": "mixed",
+            "subjects": [],
+            "daily_goal_minutes": 30
+        },
+        "created_at": now,
+        "last_active": now,
+        "is_active": True,
+        "total_sessions": 0,
+        "learning_streak": 0,
+        "achievements": [],
+        "settings": {
+            "notifications": True,
+            "sound_enabled": True,
+            "theme": "light"
+        }
+    }
+    
+    # Insérer en base de données (les index uniques tranchent les inscriptions concurrentes)
+    try:
+        await db.users.insert_one(new_user)
+    except DuplicateKeyError as e:
+        raise _duplicate_user_error(email_taken="email" in (e.details or {}).get("keyPattern", {}))
+    
+    # Créer les tokens
+    access_token = create_access_token(
+        data={"sub": user_id, "email": user_data.email},
+        now=now,
+        expires_delta=_ACCESS_TD
+    )
+    refresh_token = create_refresh_token(user_id, now=now)
+    
+    return Token(
+        access_token=access_token,
+        refresh_token=refresh_token,
+        expires_in=_ACCESS_SECONDS
+    )
 
 @router.post("/login", response_model=Token)
 async def login_user(login_data: UserLogin):
@@ -224,54 +448,52 @@ async def login_user(login_data: UserLogin):
     
     Authentifie l'utilisateur et retourne les tokens
     """
-    try:
-        db = get_database()
-        
-        # Trouver l'utilisateur par email
-        user = await db.users.find_one({"email": login_data.email})
-        
-        if not user or not verify_password(login_data.password, user["password_hash"]):
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Email ou mot de passe incorrect",
-                headers={"WWW-Authenticate": "Bearer"},
-            )
-        
-        # Vérifier si le compte est actif
-        if not user.get("is_active", True):
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Compte désactivé"
-            )
-        
-        # Mettre à jour la dernière activité
-        await db.users.update_one(
-            {"_id": user["_id"]},
-            {"$set": {"last_active": datetime.utcnow()}}
-        )
-        
-        # Créer les tokens
-        token_expiry = timedelta(days=7) if login_data.remember_me else timedelta(minutes=settings.access_token_expire_minutes)
-        
-        access_token = create_access_token(
-            data={"sub": user["_id"], "email": user["email"]},
-            expires_delta=token_expiry
-        )
-        refresh_token = create_refresh_token(user["_id"])
-        
-        return Token(
-            access_token=access_token,
-            refresh_token=refresh_token,
-            expires_in=int(token_expiry.total_seconds())
+    db = get_database()
+    
+    # Trouver l'utilisateur par email
+    user = await db.users.find_one({"email": login_data.email}, projection=_LOGIN_PROJECTION)
+    
+    stored_hash = user["password_hash"] if user else await _dummy_hash()
+    valid, new_hash = await verify_password(login_data.password, stored_hash)
+    if not user or not valid:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Email ou mot de passe incorrect",
+            headers={"WWW-Authenticate": "Bearer"},
         )
-        
-    except HTTPException:
-        raise
-    except Exception as e:
+    
+    # Vérifier si le compte est actif
+    if not user.get("is_active", True):
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Erreur lors de la connexion: {str(e)}"
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Compte désactivé"
         )
+    
+    # Dernière activité écrite en différé; migration immédiate d'un hash bcrypt vers argon2id
+    now = datetime.now(timezone.utc)
+    last_active_batcher.touch(user["_id"], now)
+    if new_hash:
+        await db.users.update_one(
+            {"_id": user["_id"]},
+            {"$set": {"password_hash": new_hash}}
+        )
+    invalidate_user(user)
+    
+    # Créer les tokens
+    token_expiry = _REMEMBER_ME_TD if login_data.remember_me else _ACCESS_TD
+    
+    access_token = create_access_token(
+        data={"sub": str(user["_id"]), "email": user["email"]},
+        now=now,
+        expires_delta=token_expiry
+    )
+    refresh_token = create_refresh_token(str(user["_id"]), now=now)
+    
+    return Token(
+        access_token=access_token,
+        refresh_token=refresh_token,
+        expires_in=int(token_expiry.total_seconds())
+    )
 
 @router.post("/refresh", response_model=Token)
 async def refresh_token(refresh_token: str):
@@ -281,19 +503,17 @@ async def refresh_token(refresh_token: str):
     Utilise le refresh token pour obtenir un nouveau access token
     """
     try:
-        payload = jwt.decode(refresh_token, settings.secret_key, algorithms=["HS256"])
-        user_id: str = payload.get("user_id")
-        token_type: str = payload.get("type")
+        payload = await decode_token(refresh_token, required=_REFRESH_CLAIMS)
+        user_id: str = payload["user_id"]
         
-        if user_id is None or token_type != TOKEN_TYPE_REFRESH:
+        if payload["type"] != TOKEN_TYPE_REFRESH:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Token de rafraîchissement invalide"
             )
         
         # Vérifier que l'utilisateur existe
-        db = get_database()
-        user = await db.users.find_one({"_id": user_id})
+        user = await _get_user_by_id(user_id)
         
         if not user:
             raise HTTPException(
@@ -302,20 +522,21 @@ async def refresh_token(refresh_token: str):
             )
         
         # Créer un nouveau token d'accès
-        access_token_expires = timedelta(minutes=settings.access_token_expire_minutes)
+        now = datetime.now(timezone.utc)
         new_access_token = create_access_token(
             data={"sub": user_id, "email": user["email"]},
-            expires_delta=access_token_expires
+            now=now,
+            expires_delta=_ACCESS_TD
         )
-        new_refresh_token = create_refresh_token(user_id)
+        new_refresh_token = create_refresh_token(user_id, now=now)
         
         return Token(
             access_token=new_access_token,
             refresh_token=new_refresh_token,
-            expires_in=settings.access_token_expire_minutes * 60
+            expires_in=_ACCESS_SECONDS
         )
         
-    except jwt.PyJWTError:
+    except InvalidTokenError:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Token de rafraîchissement invalide"
@@ -326,37 +547,22 @@ async def get_user_profile(current_user: dict = Depends(get_current_user)):
     """
     👤 Obtenir le profil de l'utilisateur connecté
     """
-    try:
-        # Calculer les statistiques d'apprentissage
-        db = get_database()
-        
-        # Compter les sessions totales
-        total_sessions = await db.learning_sessions.count_documents(
-            {"user_id": current_user["_id"]}
-        )
-        
-        # Calculer la streak d'apprentissage (jours consécutifs)
-        # Logique simplifiée - en réalité, plus complexe
-        learning_streak = current_user.get("learning_streak", 0)
-        
-        return UserProfile(
-            id=current_user["_id"],
-            username=current_user["username"],
-            email=current_user["email"],
-            language=current_user["language"],
-            country=current_user.get("country"),
-            learning_preferences=current_user.get("learning_preferences", {}),
-            created_at=current_user["created_at"],
-            last_active=current_user.get("last_active"),
-            total_sessions=total_sessions,
-            learning_streak=learning_streak
-        )
-        
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Erreur lors de la récupération du profil: {str(e)}"
-        )
+    # Calculer la streak d'apprentissage (jours consécutifs)
+    # Logique simplifiée - en réalité, plus complexe
+    learning_streak = current_user.get("learning_streak", 0)
+    
+    return UserProfile(
+        id=str(current_user["_id"]),
+        username=current_user["username"],
+        email=current_user["email"],
+        language=current_user["language"],
+        country=current_user.get("country"),
+        learning_preferences=current_user.get("learning_preferences", {}),
+        created_at=current_user["created_at"],
+        last_active=current_user.get("last_active"),
+        total_sessions=current_user.get("total_sessions", 0),  # compteur tenu à la création des sessions
+        learning_streak=learning_streak
+    )
 
 @router.put("/profile")
 async def update_user_profile(
@@ -366,120 +572,95 @@ async def update_user_profile(
     """
     ✏️ Mettre à jour le profil utilisateur
     """
+    db = get_database()
+    
+    # Champs autorisés à être modifiés
+    allowed_fields = [
+        "username", "language", "country", "learning_preferences",
+        "settings"
+    ]
+    
+    # Filtrer les champs autorisés
+    update_data = {
+        k: v for k, v in profile_update.items() 
+        if k in allowed_fields
+    }
+    
+    # Valider la langue si modifiée
+    if "language" in update_data:
+        if update_data["language"] not in _SUPPORTED_LANGS:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Langue non supportée: {update_data['language']}"
+            )
+    
+    # Mettre à jour en base de données (l'index unique sur username rejette un doublon)
     try:
-        db = get_database()
-        
-        # Champs autorisés à être modifiés
-        allowed_fields = [
-            "username", "language", "country", "learning_preferences",
-            "settings"
-        ]
-        
-        # Filtrer les champs autorisés
-        update_data = {
-            k: v for k, v in profile_update.items() 
-            if k in allowed_fields
-        }
-        
-        # Valider la langue si modifiée
-        if "language" in update_data:
-            if update_data["language"] not in settings.supported_languages:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail=f"Langue non supportée: {update_data['language']}"
-                )
-        
-        # Vérifier l'unicité du nom d'utilisateur si modifié
-        if "username" in update_data:
-            existing = await db.users.find_one({
-                "username": update_data["username"],
-                "_id": {"$ne": current_user["_id"]}
-            })
-            if existing:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail="Ce nom d'utilisateur est déjà pris"
-                )
-        
-        # Mettre à jour en base de données
         await db.users.update_one(
             {"_id": current_user["_id"]},
             {"$set": update_data}
         )
-        
-        return {"status": "success", "message": "Profil mis à jour avec succès"}
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Erreur lors de la mise à jour: {str(e)}"
-        )
+    except DuplicateKeyError:
+        raise _duplicate_user_error(email_taken=False)
+    invalidate_user(current_user)
+    
+    return {"status": "success", "message": "Profil mis à jour avec succès"}
 
 @router.post("/logout")
-async def logout_user(current_user: dict = Depends(get_current_user)):
+async def logout_user(
+    current_user: dict = Depends(get_current_user),
+    credentials: HTTPAuthorizationCredentials = Depends(security)
+):
     """
     🚪 Déconnexion de l'utilisateur
     
-    En pratique, on pourrait maintenir une blacklist de tokens
+    Le token d'accès est révoqué jusqu'à son expiration
     """
-    try:
-        # Mettre à jour la dernière activité
-        db = get_database()
-        await db.users.update_one(
-            {"_id": current_user["_id"]},
-            {"$set": {"last_active": datetime.utcnow()}}
-        )
-        
-        return {
-            "status": "success", 
-            "message": "Déconnexion réussie",
-            "timestamp": datetime.utcnow()
-        }
-        
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Erreur lors de la déconnexion: {str(e)}"
-        )
+    await revoke_token(credentials.credentials)
+    
+    # Mettre à jour la dernière activité (écriture groupée en arrière-plan)
+    now = datetime.now(timezone.utc)
+    last_active_batcher.touch(current_user["_id"], now)
+    invalidate_user(current_user)
+    
+    return {
+        "status": "success", 
+        "message": "Déconnexion réussie",
+        "timestamp": now
+    }
 
 @router.delete("/account")
 async def delete_user_account(
-    password: str,
-    current_user: dict = Depends(get_current_user)
+    password: str = Query(..., max_length=MAX_PASSWORD_INPUT),
+    current_user: dict = Depends(get_current_user_full)
 ):
     """
     🗑️ Supprimer le compte utilisateur
     
     Nécessite la confirmation du mot de passe
     """
-    try:
-        # Vérifier le mot de passe
-        if not verify_password(password, current_user["password_hash"]):
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Mot de passe incorrect"
-            )
-        
-        db = get_database()
-        
-        # Supprimer toutes les données de l'utilisateur
-        await db.users.delete_one({"_id": current_user["_id"]})
-        await db.learning_sessions.delete_many({"user_id": current_user["_id"]})
-        await db.analytics.delete_many({"user_id": current_user["_id"]})
-        await db.offline_cache.delete_many({"user_id": current_user["_id"]})
-        
-        return {
-            "status": "success",
-            "message": "Compte supprimé avec succès",
-            "timestamp": datetime.utcnow()
-        }
-        
-    except HTTPException:
-        raise
-    except Exception as e:
+    # Vérifier le mot de passe
+    valid, _ = await verify_password(password, current_user["password_hash"])
+    if not valid:
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Erreur lors de la suppression: {str(e)}"
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Mot de passe incorrect"
         )
+    
+    db = get_database()
+    
+    # Supprimer toutes les données de l'utilisateur
+    user_id = str(current_user["_id"])
+    await asyncio.gather(
+        db.users.delete_one({"_id": current_user["_id"]}),
+        db.learning_sessions.delete_many({"user_id": user_id}),
+        db.analytics.delete_many({"user_id": user_id}),
+        db.offline_cache.delete_many({"user_id": user_id})
+    )
+    invalidate_user(current_user)
+    
+    return {
+        "status": "success",
+        "message": "Compte supprimé avec succès",
+        "timestamp": datetime.now(timezone.utc)
+    }
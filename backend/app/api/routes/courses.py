@@ -4,10 +4,12 @@ Gestion des cours et contenus éducatifs avec pagination avancée
 """
 
 from fastapi import APIRouter, Depends, HTTPException, Query
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from typing import List, Optional, Dict, Any
 from datetime import datetime
+from pymongo.errors import OperationFailure
 import logging
+import re
 
 from backend.app.core.database import db
 from backend.app.core.pagination import (
@@ -17,12 +19,62 @@ from backend.app.core.pagination import (
     MongoDBPaginator,
     PaginationPatterns
 )
-from backend.app.core.cache import cache_result
+from backend.app.core.cache import cache_result, CourseCache
 from backend.app.core.logging import log_api_request, get_context_logger
 
 router = APIRouter()
 logger = get_context_logger("courses_api", service="courses")
 
+# Champs lus par le modèle Course (évite de transférer les champs internes)
+COURSE_PROJECTION = {
+    "title": 1,
+    "description": 1,
+    "category": 1,
+    "difficulty": 1,
+    "language": 1,
+    "duration_minutes": 1,
+    "prerequisites": 1,
+    "learning_objectives": 1,
+    "tags": 1,
+    "is_published": 1,
+    "created_at": 1,
+    "updated_at": 1,
+    "created_by": 1,
+    "enrollment_count": 1,
+    "rating_average": 1,
+    "rating_count": 1
+}
+
+# Code d'erreur MongoDB quand l'index texte est absent (IndexNotFound)
+_TEXT_INDEX_MISSING = 27
+
+def _text_search_filter(query: str) -> Dict[str, Any]:
+    """Filtre de recherche plein texte (index $text)"""
+    return {"$text": {"$search": query}}
+
+def _prefix_search_filter(query: str) -> Dict[str, Any]:
+    """Filtre de repli : préfixe ancré sur les champs normalisés en minuscules"""
+    pattern = f"^{re.escape(query.lower())}"
+    return {
+        "$or": [
+            {"title_lc": {"$regex": pattern}},
+            {"tags_lc": {"$regex": pattern}}
+        ]
+    }
+
+def _course_from_row(row: Dict[str, Any]) -> "Course":
+    """Construire un Course depuis un document projeté, sans validation"""
+    return Course.model_construct(**{**row, "_id": str(row["_id"])})
+
+def _normalized_fields(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Champs minuscules indexés pour la recherche par préfixe"""
+    fields = {}
+    if data.get("title") is not None:
+        fields["title_lc"] = data["title"].lower()
+    if data.get("tags") is not None:
+        fields["tags_lc"] = [tag.lower() for tag in data["tags"]]
+    return fields
+
 # Modèles Pydantic pour les cours
 
 class CourseBase(BaseModel):
@@ -30,7 +82,7 @@ class CourseBase(BaseModel):
     title: str = Field(..., min_length=1, max_length=200)
     description: Optional[str] = Field(None, max_length=2000)
     category: str = Field(..., min_length=1, max_length=100)
-    difficulty: str = Field(..., regex="^(Beginner|Intermediate|Advanced)$")
+    difficulty: str = Field(..., pattern="^(Beginner|Intermediate|Advanced)$")
     language: str = Field("French", max_length=50)
     duration_minutes: Optional[int] = Field(None, ge=1)
     prerequisites: List[str] = Field(default_factory=list)
@@ -46,7 +98,7 @@ class CourseUpdate(BaseModel):
     title: Optional[str] = Field(None, min_length=1, max_length=200)
     description: Optional[str] = Field(None, max_length=2000)
     category: Optional[str] = Field(None, min_length=1, max_length=100)
-    difficulty: Optional[str] = Field(None, regex="^(Beginner|Intermediate|Advanced)$")
+    difficulty: Optional[str] = Field(None, pattern="^(Beginner|Intermediate|Advanced)$")
     language: Optional[str] = Field(None, max_length=50)
     duration_minutes: Optional[int] = Field(None, ge=1)
     prerequisites: Optional[List[str]] = None
@@ -56,6 +108,8 @@ class CourseUpdate(BaseModel):
 
 class Course(CourseBase):
     """Modèle complet d'un cours"""
+    model_config = ConfigDict(populate_by_name=True)
+    
     id: str = Field(..., alias="_id")
     is_published: bool = Field(default=False)
     created_at: datetime
@@ -64,12 +118,6 @@ class Course(CourseBase):
     enrollment_count: int = Field(default=0)
     rating_average: Optional[float] = Field(None, ge=0, le=5)
     rating_count: int = Field(default=0)
-    
-    class Config:
-        allow_population_by_field_name = True
-        json_encoders = {
-            datetime: lambda v: v.isoformat()
-        }
 
 class CourseStats(BaseModel):
     """Statistiques d'un cours"""
@@ -82,8 +130,10 @@ class CourseStats(BaseModel):
 
 # Routes avec pagination
 
-@router.get("/", response_model=PaginatedResponse[Course])
-@cache_result(ttl=300)  # Cache de 5 minutes
+# Pas de response_model: FastAPI revaliderait chaque Course construit sans
+# validation. Le schéma OpenAPI est conservé via `responses`.
+@router.get("/", response_model=None, responses={200: {"model": PaginatedResponse[Course]}})
+@cache_result(ttl=300, cache_key_builder=CourseCache.list_key)  # Cache de 5 minutes
 async def list_courses(
     pagination: CoursePaginationParams = Depends(get_course_pagination_params)
 ):
@@ -108,21 +158,30 @@ async def list_courses(
         # Construire les filtres additionnels
         additional_filters = PaginationPatterns.create_course_filters(pagination)
         
-        # Champs de recherche
-        search_fields = ["title", "description", "category", "tags"]
+        # Recherche plein texte via l'index $text plutôt qu'un $regex par champ
+        filters = dict(additional_filters)
+        if pagination.search:
+            filters.update(_text_search_filter(pagination.search))
         
         # Exécuter la pagination
-        result = await paginator.paginate(
-            pagination=pagination,
-            search_fields=search_fields,
-            additional_filters=additional_filters
-        )
-        
-        # Convertir les résultats en modèles Pydantic
-        courses = []
-        for course_data in result.items:
-            course_data["id"] = str(course_data.pop("_id"))
-            courses.append(Course(**course_data))
+        try:
+            result = await paginator.paginate(
+                pagination=pagination,
+                additional_filters=filters,
+                projection=COURSE_PROJECTION
+            )
+        except OperationFailure as e:
+            if e.code != _TEXT_INDEX_MISSING or not pagination.search:
+                raise
+            logger.warning("Text index unavailable, falling back to prefix search")
+            result = await paginator.paginate(
+                pagination=pagination,
+                additional_filters={**additional_filters, **_prefix_search_filter(pagination.search)},
+                projection=COURSE_PROJECTION
+            )
+        
+        # Lignes issues de notre base : construction sans revalidation
+        courses = [_course_from_row(course_data) for course_data in result.items]
         
         # Logger la requête
         logger.info(
@@ -134,27 +193,26 @@ async def list_courses(
             search_query=pagination.search
         )
         
-        return PaginatedResponse(items=courses, meta=result.meta)
+        # Sérialisé ici (alias _id compris): même corps depuis le cache ou la base
+        return PaginatedResponse(items=courses, meta=result.meta).model_dump(mode="json", by_alias=True)
         
     except Exception as e:
         logger.error(f"Error listing courses: {str(e)}", error_type=type(e).__name__)
         raise HTTPException(status_code=500, detail="Error retrieving courses")
 
 @router.get("/categories")
-@cache_result(ttl=3600)  # Cache d'1 heure
+@cache_result(ttl=3600, cache_key_builder=CourseCache.categories_key)  # Cache d'1 heure
 async def get_course_categories():
     """Obtenir toutes les catégories de cours disponibles"""
     try:
-        categories = await db.courses.distinct("category", {"is_published": True})
+        # Compter les cours par catégorie en une seule agrégation
+        rows = await db.courses.aggregate([
+            {"$match": {"is_published": True}},
+            {"$group": {"_id": "$category", "count": {"$sum": 1}}}
+        ]).to_list(None)
         
-        # Compter les cours par catégorie
-        category_counts = {}
-        for category in categories:
-            count = await db.courses.count_documents({
-                "category": category,
-                "is_published": True
-            })
-            category_counts[category] = count
+        category_counts = {row["_id"]: row["count"] for row in rows}
+        categories = list(category_counts)
         
         logger.info(f"Retrieved {len(categories)} course categories")
         
@@ -188,77 +246,51 @@ async def advanced_course_search(
     """
     
     try:
-        # Pipeline d'agrégation MongoDB pour la recherche avancée
-        pipeline = []
-        
-        # Étape de recherche textuelle
-        search_stage = {
-            "$match": {
-                "$and": [
-                    {"is_published": True},
-                    {
-                        "$or": [
-                            {"title": {"$regex": query, "$options": "i"}},
-                            {"description": {"$regex": query, "$options": "i"}},
-                            {"tags": {"$in": [{"$regex": query, "$options": "i"}]}}
-                        ]
-                    }
-                ]
-            }
-        }
+        match_filter: Dict[str, Any] = {"is_published": True}
         
         # Ajouter les filtres
         if categories:
-            search_stage["$match"]["$and"].append({"category": {"$in": categories}})
+            match_filter["category"] = {"$in": categories}
         
         if difficulties:
-            search_stage["$match"]["$and"].append({"difficulty": {"$in": difficulties}})
+            match_filter["difficulty"] = {"$in": difficulties}
         
         if min_rating is not None:
-            search_stage["$match"]["$and"].append({"rating_average": {"$gte": min_rating}})
+            match_filter["rating_average"] = {"$gte": min_rating}
         
         if max_duration is not None:
-            search_stage["$match"]["$and"].append({"duration_minutes": {"$lte": max_duration}})
-        
-        pipeline.append(search_stage)
-        
-        # Ajouter le score de pertinence
-        pipeline.append({
-            "$addFields": {
-                "relevance_score": {
-                    "$add": [
-                        {
-                            "$cond": [
-                                {"$regexMatch": {"input": "$title", "regex": query, "options": "i"}},
-                                10, 0
-                            ]
-                        },
-                        {
-                            "$cond": [
-                                {"$regexMatch": {"input": "$description", "regex": query, "options": "i"}},
-                                5, 0
-                            ]
-                        },
-                        {"$multiply": [{"$ifNull": ["$rating_average", 0]}, 2]}
-                    ]
-                }
-            }
-        })
-        
-        # Utiliser la pagination avec agrégation
-        result = await PaginationPatterns.paginate_with_aggregation(
-            collection=db.courses,
-            pipeline=pipeline,
-            pagination=pagination,
-            search_stage=None  # Déjà inclus dans la pipeline
-        )
-        
-        # Convertir en modèles Pydantic
-        courses = []
-        for course_data in result.items:
-            course_data["id"] = str(course_data.pop("_id"))
-            course_data.pop("relevance_score", None)  # Retirer le score de la réponse
-            courses.append(Course(**course_data))
+            match_filter["duration_minutes"] = {"$lte": max_duration}
+        
+        async def run_search(search_filter: Dict[str, Any], by_text_score: bool):
+            pipeline = [{"$match": {**search_filter, **match_filter}}]
+            
+            # Trier par pertinence (textScore), puis par note, sauf tri explicite
+            if not pagination.sort_by:
+                sort = {"score": {"$meta": "textScore"}} if by_text_score else {}
+                sort["rating_average"] = -1
+                pipeline.append({"$sort": sort})
+            
+            # Utiliser la pagination avec agrégation
+            return await PaginationPatterns.paginate_with_aggregation(
+                collection=db.courses,
+                pipeline=pipeline,
+                pagination=pagination,
+                search_stage=None,  # Déjà inclus dans la pipeline
+                projection=COURSE_PROJECTION
+            )
+        
+        # Recherche plein texte via l'index $text (pondération titre/description/tags),
+        # repli sur un préfixe ancré si l'index texte est absent
+        try:
+            result = await run_search(_text_search_filter(query), by_text_score=True)
+        except OperationFailure as e:
+            if e.code != _TEXT_INDEX_MISSING:
+                raise
+            logger.warning("Text index unavailable, falling back to prefix search")
+            result = await run_search(_prefix_search_filter(query), by_text_score=False)
+        
+        # Lignes issues de notre base : construction sans revalidation
+        courses = [_course_from_row(course_data) for course_data in result.items]
         
         logger.info(
             "Advanced search completed",
@@ -274,7 +306,7 @@ async def advanced_course_search(
         raise HTTPException(status_code=500, detail="Error in advanced search")
 
 @router.get("/{course_id}", response_model=Course)
-@cache_result(ttl=600)  # Cache de 10 minutes
+@cache_result(ttl=600, cache_key_builder=CourseCache.course_key)  # Cache de 10 minutes
 async def get_course(course_id: str):
     """Obtenir un cours spécifique par son ID"""
     try:
@@ -284,7 +316,9 @@ async def get_course(course_id: str):
         if not ObjectId.is_valid(course_id):
             raise HTTPException(status_code=400, detail="Invalid course ID format")
         
-        course_data = await db.courses.find_one({"_id": ObjectId(course_id)})
+        course_data = await db.courses.find_one(
+            {"_id": ObjectId(course_id)}, projection=COURSE_PROJECTION
+        )
         
         if not course_data:
             raise HTTPException(status_code=404, detail="Course not found")
@@ -304,7 +338,7 @@ async def get_course(course_id: str):
         raise HTTPException(status_code=500, detail="Error retrieving course")
 
 @router.get("/{course_id}/stats", response_model=CourseStats)
-@cache_result(ttl=300)  # Cache de 5 minutes
+@cache_result(ttl=300, cache_key_builder=CourseCache.stats_key)  # Cache de 5 minutes
 async def get_course_stats(course_id: str):
     """Obtenir les statistiques d'un cours"""
     try:
@@ -313,11 +347,6 @@ async def get_course_stats(course_id: str):
         if not ObjectId.is_valid(course_id):
             raise HTTPException(status_code=400, detail="Invalid course ID format")
         
-        # Vérifier que le cours existe
-        course = await db.courses.find_one({"_id": ObjectId(course_id)})
-        if not course:
-            raise HTTPException(status_code=404, detail="Course not found")
-        
         # Pipeline d'agrégation pour calculer les statistiques
         stats_pipeline = [
             {"$match": {"_id": ObjectId(course_id)}},
@@ -368,8 +397,9 @@ async def get_course_stats(course_id: str):
         
         result = await db.courses.aggregate(stats_pipeline).to_list(1)
         
+        # Le $match de la pipeline suffit à vérifier l'existence du cours
         if not result:
-            raise HTTPException(status_code=404, detail="Course statistics not found")
+            raise HTTPException(status_code=404, detail="Course not found")
         
         stats_data = result[0]
         
@@ -398,7 +428,8 @@ async def create_course(course_data: CourseCreate):
     """Créer un nouveau cours"""
     try:
         # Préparer les données pour l'insertion
-        course_dict = course_data.dict()
+        course_dict = course_data.model_dump()
+        course_dict.update(_normalized_fields(course_dict))
         course_dict.update({
             "is_published": False,
             "created_at": datetime.utcnow(),
@@ -408,9 +439,12 @@ async def create_course(course_data: CourseCreate):
         
         # Insérer en base
         result = await db.courses.insert_one(course_dict)
+        await CourseCache.invalidate_course()
         
         # Récupérer le cours créé
-        created_course = await db.courses.find_one({"_id": result.inserted_id})
+        created_course = await db.courses.find_one(
+            {"_id": result.inserted_id}, projection=COURSE_PROJECTION
+        )
         created_course["id"] = str(created_course.pop("_id"))
         
         logger.info(f"Course created successfully", course_id=created_course["id"], title=course_data.title)
@@ -431,7 +465,8 @@ async def update_course(course_id: str, course_update: CourseUpdate):
             raise HTTPException(status_code=400, detail="Invalid course ID format")
         
         # Préparer les données de mise à jour
-        update_data = {k: v for k, v in course_update.dict().items() if v is not None}
+        update_data = {k: v for k, v in course_update.model_dump().items() if v is not None}
+        update_data.update(_normalized_fields(update_data))
         update_data["updated_at"] = datetime.utcnow()
         
         # Mettre à jour en base
@@ -443,8 +478,12 @@ async def update_course(course_id: str, course_update: CourseUpdate):
         if result.matched_count == 0:
             raise HTTPException(status_code=404, detail="Course not found")
         
+        await CourseCache.invalidate_course(course_id)
+        
         # Récupérer le cours mis à jour
-        updated_course = await db.courses.find_one({"_id": ObjectId(course_id)})
+        updated_course = await db.courses.find_one(
+            {"_id": ObjectId(course_id)}, projection=COURSE_PROJECTION
+        )
         updated_course["id"] = str(updated_course.pop("_id"))
         
         logger.info(f"Course updated successfully", course_id=course_id, fields_updated=len(update_data))
@@ -471,6 +510,8 @@ async def delete_course(course_id: str):
         if result.deleted_count == 0:
             raise HTTPException(status_code=404, detail="Course not found")
         
+        await CourseCache.invalidate_course(course_id)
+        
         logger.info(f"Course deleted successfully", course_id=course_id)
         
         return None
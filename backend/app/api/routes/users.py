@@ -7,6 +7,7 @@ from fastapi import APIRouter, HTTPException, Depends, Query
 from pydantic import BaseModel, Field
 from typing import List, Optional, Dict, Any
 from datetime import datetime, timedelta
+from pymongo import ReturnDocument
 
 from backend.app.core.database import db
 from backend.app.core.pagination import (
@@ -18,7 +19,7 @@ from backend.app.core.pagination import (
 )
 from backend.app.core.cache import cache_result
 from backend.app.core.logging import get_context_logger
-from backend.app.api.routes.auth import get_current_user
+from backend.app.api.routes.auth import get_current_user, invalidate_user
 
 router = APIRouter()
 logger = get_context_logger("users_api", service="users")
@@ -375,19 +376,19 @@ async def update_user_profile(
         update_data = {k: v for k, v in user_update.dict().items() if v is not None}
         update_data["updated_at"] = datetime.utcnow()
         
-        # Mettre à jour en base
-        result = await db.users.update_one(
+        # Mettre à jour en base et récupérer le document modifié en un seul aller-retour
+        updated_user = await db.users.find_one_and_update(
             {"_id": ObjectId(current_user["user_id"])},
-            {"$set": update_data}
+            {"$set": update_data},
+            projection={"password_hash": 0},
+            return_document=ReturnDocument.AFTER
         )
         
-        if result.matched_count == 0:
+        if updated_user is None:
             raise HTTPException(status_code=404, detail="User not found")
+        invalidate_user(current_user)
         
-        # Récupérer l'utilisateur mis à jour
-        updated_user = await db.users.find_one({"_id": ObjectId(current_user["user_id"])})
         updated_user["id"] = str(updated_user.pop("_id"))
-        updated_user.pop("password_hash", None)
         
         logger.info("User profile updated", user_id=current_user["user_id"], fields_updated=len(update_data))
         
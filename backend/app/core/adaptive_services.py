@@ -8,6 +8,7 @@ import logging
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
 
+from .database import analytics_batcher, last_active_batcher
 from .event_sourcing import event_publisher, event_store, learning_projection
 from .orchestration import message_broker, service_orchestrator
 
@@ -111,7 +112,10 @@ async def lifespan_adaptive_services(app: FastAPI):
         await message_broker.stop()
         logger.info("✅ Message Broker arrêté")
         
-        # Sauvegarder les événements en attente si nécessaire
+        # Sauvegarder les événements et analytics en attente
+        await event_publisher.flush()
+        await analytics_batcher.flush()
+        await last_active_batcher.flush()
         logger.info("✅ Données sauvegardées")
         
         logger.info("👋 Services adaptatifs arrêtés proprement")
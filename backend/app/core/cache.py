@@ -17,6 +17,12 @@ from backend.app.core.config import get_settings
 settings = get_settings()
 logger = logging.getLogger(__name__)
 
+def _json_default(value: Any) -> Any:
+    """Sérialiser les modèles Pydantic (réponses d'API) avant les autres objets"""
+    if hasattr(value, "model_dump"):
+        return value.model_dump(mode="json")
+    return str(value)
+
 class CacheManager:
     """Gestionnaire de cache Redis avancé"""
     
@@ -72,7 +78,7 @@ class CacheManager:
             
         try:
             ttl = ttl or self.default_ttl
-            serialized_value = json.dumps(value, default=str)
+            serialized_value = json.dumps(value, default=_json_default)
             await self.redis_client.setex(key, ttl, serialized_value)
             return True
         except Exception as e:
@@ -97,7 +103,11 @@ class CacheManager:
             return 0
             
         try:
-            keys = await self.redis_client.keys(f"{self.cache_prefix}:{pattern}*")
+            # SCAN plutôt que KEYS pour ne pas bloquer Redis
+            keys = [
+                key async for key in
+                self.redis_client.scan_iter(match=f"{self.cache_prefix}:{pattern}*", count=500)
+            ]
             if keys:
                 return await self.redis_client.delete(*keys)
         except Exception as e:
@@ -271,6 +281,38 @@ class UserCache:
 class CourseCache:
     """Gestionnaire de cache spécialisé pour les cours"""
     
+    @staticmethod
+    def course_key(course_id: str) -> str:
+        """Clé de cache d'un cours"""
+        return f"{cache_manager.cache_prefix}:course:{course_id}"
+    
+    @staticmethod
+    def stats_key(course_id: str) -> str:
+        """Clé de cache des statistiques d'un cours"""
+        return f"{cache_manager.cache_prefix}:course:{course_id}:stats"
+    
+    @staticmethod
+    def list_key(pagination: Any) -> str:
+        """Clé de cache d'une page de cours (hash des paramètres)"""
+        params_hash = hashlib.md5(pagination.model_dump_json().encode()).hexdigest()[:12]
+        return f"{cache_manager.cache_prefix}:courses:list:{params_hash}"
+    
+    @staticmethod
+    def categories_key() -> str:
+        """Clé de cache des catégories de cours"""
+        return f"{cache_manager.cache_prefix}:courses:categories"
+    
+    @staticmethod
+    async def invalidate_course(course_id: Optional[str] = None):
+        """Invalider un cours, les listes et les catégories après une mutation"""
+        keys = [CourseCache.categories_key()]
+        if course_id:
+            keys += [CourseCache.course_key(course_id), CourseCache.stats_key(course_id)]
+        await asyncio.gather(
+            *(cache_manager.delete(key) for key in keys),
+            cache_manager.clear_pattern("courses:list:")
+        )
+    
     @staticmethod
     async def get_course_list(filters: dict) -> Optional[list]:
         """Récupérer la liste des cours depuis le cache"""
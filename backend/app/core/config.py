@@ -62,6 +62,20 @@ class Settings(BaseSettings):
     mongodb_db_name: str = Field(default="eduai_enhanced", env="MONGODB_DB_NAME")
     redis_url: str = Field(..., env="REDIS_URL")
     
+    # 🎤 Audio
+    supported_audio_formats_str: str = Field(
+        default=".wav,.mp3,.m4a,.ogg,.webm",
+        env="SUPPORTED_AUDIO_FORMATS"
+    )
+    
+    @property
+    def supported_audio_formats(self) -> List[str]:
+        """Parse supported audio extensions from comma-separated string"""
+        return [ext.strip().casefold() for ext in self.supported_audio_formats_str.split(',') if ext.strip()]
+    
+    # 🏥 Health checks
+    health_cache_ttl: int = Field(default=5, env="HEALTH_CACHE_TTL")
+    
     # 🤖 Configuration APIs - Toutes obligatoires
     openai_api_key: str = Field(..., env="OPENAI_API_KEY")
     openai_model: str = Field(default="gpt-4", env="OPENAI_MODEL")
@@ -76,6 +90,11 @@ class Settings(BaseSettings):
             raise ValueError(f'Environment must be one of {allowed}')
         return v
     
+    @property
+    def supported_languages(self) -> List[str]:
+        """Codes de langue supportés, dans l'ordre de LANGUAGE_REGIONS"""
+        return list(dict.fromkeys(code for codes in LANGUAGE_REGIONS.values() for code in codes))
+    
     @property
     def is_production(self) -> bool:
         """Check if running in production"""
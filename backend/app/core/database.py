@@ -7,8 +7,9 @@ import asyncio
 import json
 import motor.motor_asyncio
 import redis.asyncio as aioredis
-from typing import Optional
-from pymongo import IndexModel, ASCENDING, TEXT
+from typing import Any, Dict, Optional
+from pymongo import IndexModel, ASCENDING, TEXT, UpdateOne
+from pymongo.errors import DuplicateKeyError
 import logging
 
 from .config import get_settings
@@ -87,16 +88,45 @@ async def create_database_indexes():
             IndexModel([("language", ASCENDING)]),
             IndexModel([("learning_preferences", ASCENDING)])
         ])
+        await normalize_user_emails()
         
-        # Index pour les cours
+        # Index pour les cours (un seul index texte par collection :
+        # remplacer l'ancien index titre + description)
+        course_indexes = await database.courses.index_information()
+        if "title_text_description_text" in course_indexes:
+            await database.courses.drop_index("title_text_description_text")
         await database.courses.create_indexes([
-            IndexModel([("title", TEXT), ("description", TEXT)]),
+            IndexModel(
+                [("title", TEXT), ("description", TEXT), ("tags", TEXT)],
+                weights={"title": 10, "description": 5, "tags": 3},
+                default_language="french",
+                name="courses_text_search"
+            ),
+            IndexModel([("is_published", ASCENDING), ("category", ASCENDING)]),
+            IndexModel([("title_lc", ASCENDING)]),
+            IndexModel([("tags_lc", ASCENDING)]),
             IndexModel([("subject", ASCENDING)]),
             IndexModel([("language", ASCENDING)]), 
             IndexModel([("difficulty_level", ASCENDING)]),
             IndexModel([("created_at", ASCENDING)])
         ])
         
+        # Renseigner les champs minuscules des cours créés avant leur introduction
+        await database.courses.update_many(
+            {"title_lc": {"$exists": False}},
+            [{
+                "$set": {
+                    "title_lc": {"$toLower": "$title"},
+                    "tags_lc": {
+                        "$map": {
+                            "input": {"$ifNull": ["$tags", []]},
+                            "in": {"$toLower": "$$this"}
+                        }
+                    }
+                }
+            }]
+        )
+        
         # Index pour les sessions d'apprentissage
         await database.learning_sessions.create_indexes([
             IndexModel([("user_id", ASCENDING)]),
@@ -137,6 +167,24 @@ async def create_database_indexes():
         logger.error(f"❌ Erreur création index: {e}")
 
 
+async def normalize_user_emails():
+    """Passer en minuscules les emails enregistrés avant leur normalisation
+    
+    Les routes d'auth cherchent l'email en minuscules. Un compte dont l'email
+    en minuscules appartient déjà à un autre compte (index unique) est laissé
+    tel quel et signalé pour une fusion manuelle.
+    """
+    cursor = database.users.find(
+        {"$expr": {"$ne": ["$email", {"$toLower": "$email"}]}},
+        projection={"email": 1}
+    )
+    async for user in cursor:
+        try:
+            await database.users.update_one({"_id": user["_id"]}, {"$set": {"email": user["email"].lower()}})
+        except DuplicateKeyError:
+            logger.warning(f"⚠️ Email de l'utilisateur {user['_id']} en conflit après passage en minuscules: fusion manuelle requise")
+
+
 async def close_database_connections():
     """Fermer toutes les connexions de base de données"""
     global mongodb_client, redis_client
@@ -321,6 +369,147 @@ async def save_learning_analytics(user_id: str, event_data: dict):
         logger.error(f"❌ Erreur sauvegarde analytics: {e}")
 
 
+class AnalyticsBatcher:
+    """Regroupe les événements d'analytics en insertions MongoDB groupées
+    
+    enqueue() ne bloque pas la requête: une tâche de fond vide la file toutes
+    les `flush_interval_ms` millisecondes ou dès `max_rows` événements.
+    """
+    
+    def __init__(self, max_rows: int = 500, flush_interval_ms: int = 200):
+        self.max_rows = max_rows
+        self.flush_interval_ms = flush_interval_ms
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+    
+    def enqueue(self, user_id: str, event_data: dict):
+        """Mettre un événement en file (démarre la tâche de fond au besoin)"""
+        if self._task is None or self._task.done():
+            self._queue = asyncio.Queue()
+            self._task = asyncio.create_task(self.run())
+        
+        self._queue.put_nowait({
+            "user_id": user_id,
+            "timestamp": asyncio.get_running_loop().time(),
+            **event_data
+        })
+    
+    async def flush(self):
+        """Arrêter la tâche de fond et écrire les événements restants"""
+        if self._queue is None:
+            return
+        
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        
+        rows = []
+        while not self._queue.empty():
+            rows.append(self._queue.get_nowait())
+        if rows:
+            await self._write_batch(rows)
+    
+    async def run(self):
+        """Vider la file par lots"""
+        loop = asyncio.get_running_loop()
+        
+        while True:
+            rows = [await self._queue.get()]
+            deadline = loop.time() + self.flush_interval_ms / 1000
+            try:
+                # asyncio.timeout et non wait_for: sous Python 3.11, wait_for peut
+                # avaler l'annulation de flush() si un événement arrive au même moment
+                async with asyncio.timeout_at(deadline):
+                    while len(rows) < self.max_rows:
+                        rows.append(await self._queue.get())
+            except TimeoutError:
+                pass
+            except asyncio.CancelledError:
+                # Ne pas perdre le lot en cours à l'arrêt
+                await self._write_batch(rows)
+                raise
+            
+            await self._write_batch(rows)
+    
+    async def _write_batch(self, rows: list):
+        if database is None:
+            return
+        
+        try:
+            # Le cache Redis reçoit le dernier événement de chaque utilisateur
+            latest = {row["user_id"]: str(row) for row in rows}
+            await database.analytics.insert_many(rows, ordered=False)
+            
+            if redis_client:
+                async with redis_client.pipeline(transaction=False) as pipe:
+                    for user_id, doc in latest.items():
+                        pipe.setex(f"analytics:{user_id}:latest", 3600, doc)
+                    await pipe.execute()
+                    
+        except Exception as e:
+            logger.error(f"❌ Erreur sauvegarde groupée de {len(rows)} analytics: {e}")
+
+
+analytics_batcher = AnalyticsBatcher()
+
+
+class LastActiveBatcher:
+    """Regroupe les mises à jour de users.last_active
+    
+    touch() ne fait qu'écrire dans un dict: seule la dernière date de chaque
+    utilisateur est gardée, et une tâche de fond l'écrit en un seul bulk_write
+    toutes les `flush_interval` secondes.
+    """
+    
+    def __init__(self, flush_interval: float = 5.0):
+        self.flush_interval = flush_interval
+        self._pending: Dict[str, Any] = {}
+        self._task: Optional[asyncio.Task] = None
+    
+    def touch(self, user_id: str, timestamp):
+        """Noter l'activité d'un utilisateur (démarre la tâche de fond au besoin)"""
+        self._pending[user_id] = timestamp
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self.run())
+    
+    async def flush(self):
+        """Arrêter la tâche de fond et écrire les dates en attente"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self._write_pending()
+    
+    async def run(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await self._write_pending()
+    
+    async def _write_pending(self):
+        if not self._pending or database is None:
+            return
+        
+        pending, self._pending = self._pending, {}
+        try:
+            # $max: une écriture plus récente venue d'un autre worker n'est pas écrasée
+            await database.users.bulk_write(
+                [UpdateOne({"_id": user_id}, {"$max": {"last_active": ts}}) for user_id, ts in pending.items()],
+                ordered=False
+            )
+        except Exception as e:
+            logger.error(f"❌ Erreur mise à jour last_active de {len(pending)} utilisateurs: {e}")
+
+
+last_active_batcher = LastActiveBatcher()
+
+
 async def get_user_learning_progress(user_id: str) -> dict:
     """Récupérer les progrès d'apprentissage d'un utilisateur"""
     if not database:
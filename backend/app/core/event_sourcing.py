@@ -4,12 +4,20 @@ Trace toutes les interactions d'apprentissage pour analytics et adaptation IA
 """
 
 from datetime import datetime
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 from enum import Enum
+import asyncio
 import json
+import logging
 import uuid
 from pydantic import BaseModel
 
+logger = logging.getLogger(__name__)
+
+# Regroupement des écritures d'événements
+EVENT_FLUSH_MAX_BATCH = 256
+EVENT_FLUSH_MS = 5
+
 
 class EventType(str, Enum):
     """Types d'événements d'apprentissage"""
@@ -57,6 +65,11 @@ class EventStore:
         self.events.append(event)
         return event.event_id
     
+    async def append_events(self, events: List[LearningEvent]) -> List[str]:
+        """Ajouter un lot d'événements en une seule écriture"""
+        self.events.extend(events)
+        return [event.event_id for event in events]
+    
     async def get_events_by_user(self, user_id: str, 
                                from_date: Optional[datetime] = None,
                                to_date: Optional[datetime] = None) -> List[LearningEvent]:
@@ -142,6 +155,8 @@ class EventPublisher:
     def __init__(self, event_store: EventStore):
         self.event_store = event_store
         self.subscribers = []
+        self._queue: Optional[asyncio.Queue] = None
+        self._flusher: Optional[asyncio.Task] = None
     
     def subscribe(self, subscriber):
         """S'abonner aux événements"""
@@ -150,15 +165,80 @@ class EventPublisher:
     async def publish_event(self, event: LearningEvent) -> str:
         """Publier un événement"""
         event_id = await self.event_store.append_event(event)
+        await self._notify(event)
+        return event_id
+    
+    def enqueue(self, event: LearningEvent) -> str:
+        """Mettre un événement en file pour une écriture groupée
+        
+        L'identifiant est attribué à la création de l'événement: il est renvoyé
+        immédiatement, sans attendre l'écriture dans le store.
+        """
+        if self._flusher is None or self._flusher.done():
+            self._queue = asyncio.Queue()
+            self._flusher = asyncio.create_task(self._flush_loop())
+        
+        self._queue.put_nowait(event)
+        return event.event_id
+    
+    async def flush(self) -> None:
+        """Écrire immédiatement les événements en attente (arrêt du service)"""
+        if self._queue is None:
+            return
+        
+        if self._flusher is not None:
+            self._flusher.cancel()
+            try:
+                await self._flusher
+            except asyncio.CancelledError:
+                pass
+            self._flusher = None
         
-        # Notifier tous les abonnés
+        batch = []
+        while not self._queue.empty():
+            batch.append(self._queue.get_nowait())
+        if batch:
+            await self._write_batch(batch)
+    
+    async def _flush_loop(self) -> None:
+        """Regrouper les événements arrivés dans la même fenêtre"""
+        loop = asyncio.get_running_loop()
+        
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + EVENT_FLUSH_MS / 1000
+            try:
+                # asyncio.timeout et non wait_for: sous Python 3.11, wait_for peut
+                # avaler l'annulation de flush() si un événement arrive au même moment
+                async with asyncio.timeout_at(deadline):
+                    while len(batch) < EVENT_FLUSH_MAX_BATCH:
+                        batch.append(await self._queue.get())
+            except TimeoutError:
+                pass
+            except asyncio.CancelledError:
+                # Ne pas perdre le lot en cours à l'arrêt
+                await self._write_batch(batch)
+                raise
+            
+            await self._write_batch(batch)
+    
+    async def _write_batch(self, batch: List[LearningEvent]) -> None:
+        try:
+            await self.event_store.append_events(batch)
+        except Exception as e:
+            logger.error(f"Erreur lors de l'écriture groupée de {len(batch)} événements: {e}")
+            return
+        
+        for event in batch:
+            await self._notify(event)
+    
+    async def _notify(self, event: LearningEvent) -> None:
+        """Notifier tous les abonnés"""
         for subscriber in self.subscribers:
             try:
                 await subscriber.handle_event(event)
             except Exception as e:
                 print(f"Erreur lors de la notification: {e}")
-        
-        return event_id
 
 
 # Instance globale pour le projet
@@ -177,22 +257,24 @@ async def track_learning_interaction(user_id: str, session_id: str,
         session_id=session_id,
         data={"interaction_type": interaction_type, **data}
     )
-    return await event_publisher.publish_event(event)
+    return event_publisher.enqueue(event)
 
 
 async def track_skill_progress(user_id: str, session_id: str, 
                              skill_name: str, mastery_level: float):
     """Tracer le progrès d'une compétence"""
     event_type = EventType.SKILL_MASTERED if mastery_level >= 0.8 else EventType.EXERCISE_ATTEMPTED
+    now = datetime.utcnow()
     
     event = LearningEvent(
         event_type=event_type,
         user_id=user_id,
         session_id=session_id,
+        timestamp=now,
         data={
             "skill_name": skill_name,
             "mastery_level": mastery_level,
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": now.isoformat()
         }
     )
     return await event_publisher.publish_event(event)
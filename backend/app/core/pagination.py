@@ -4,7 +4,7 @@ Pagination optimisée pour les API avec métadonnées complètes
 """
 
 from pydantic import BaseModel, Field
-from typing import Generic, TypeVar, List, Optional, Any, Dict
+from typing import Generic, TypeVar, List, Optional, Any, Dict, Tuple
 from fastapi import Query, Depends
 from math import ceil
 
@@ -106,6 +106,14 @@ class PaginationHelper:
         direction = 1 if sort_order == "asc" else -1
         return [(sort_by, direction)]
     
+    @staticmethod
+    async def run_facet(collection, pipeline: List[Dict]) -> Tuple[List[Dict], int]:
+        """Exécuter une pipeline terminée par $facet {items, total}"""
+        result = await collection.aggregate(pipeline).to_list(length=1)
+        facet = result[0] if result else {}
+        total = facet.get("total") or [{"n": 0}]
+        return facet.get("items", []), total[0]["n"]
+    
     @staticmethod
     def create_search_filter(search: Optional[str], search_fields: List[str]) -> Dict[str, Any]:
         """Créer un filtre de recherche MongoDB"""
@@ -240,7 +248,8 @@ class MongoDBPaginator:
         self,
         pagination: PaginationParams,
         search_fields: Optional[List[str]] = None,
-        additional_filters: Optional[Dict] = None
+        additional_filters: Optional[Dict] = None,
+        projection: Optional[Dict] = None
     ) -> PaginatedResponse:
         """Paginer les résultats d'une collection MongoDB"""
         
@@ -262,21 +271,20 @@ class MongoDBPaginator:
         # Calculer skip et limit
         skip, limit = PaginationHelper.get_skip_limit(pagination.page, pagination.size)
         
-        # Construire la requête
-        query = self.collection.find(final_filter)
-        
-        # Ajouter le tri
+        # Tri avant $facet: il peut utiliser un index (pas dans un sous-pipeline)
+        pipeline = [{"$match": final_filter}]
         sort_criteria = PaginationHelper.get_sort_criteria(
             pagination.sort_by, pagination.sort_order
         )
         if sort_criteria:
-            query = query.sort(sort_criteria)
-        
-        # Exécuter les requêtes en parallèle
-        items_coro = query.skip(skip).limit(limit).to_list(length=limit)
-        total_coro = self.collection.count_documents(final_filter)
+            pipeline.append({"$sort": dict(sort_criteria)})
         
-        items, total = await items_coro, await total_coro
+        # Compter et récupérer la page en un seul aller-retour ($facet)
+        page_stages = [{"$skip": skip}, {"$limit": limit}]
+        if projection:
+            page_stages.append({"$project": projection})
+        pipeline.append({"$facet": {"items": page_stages, "total": [{"$count": "n"}]}})
+        items, total = await PaginationHelper.run_facet(self.collection, pipeline)
         
         # Créer les métadonnées
         meta = PaginationHelper.create_pagination_meta(
@@ -300,7 +308,8 @@ class PaginationPatterns:
         collection,
         pipeline: List[Dict],
         pagination: PaginationParams,
-        search_stage: Optional[Dict] = None
+        search_stage: Optional[Dict] = None,
+        projection: Optional[Dict] = None
     ) -> PaginatedResponse:
         """Paginer avec une pipeline d'agrégation MongoDB"""
         
@@ -311,26 +320,20 @@ class PaginationPatterns:
         if search_stage and pagination.search:
             base_pipeline.insert(0, search_stage)
         
-        # Ajouter le tri
+        # Tri avant $facet: il peut utiliser un index (pas dans un sous-pipeline)
         if pagination.sort_by:
             sort_direction = 1 if pagination.sort_order == "asc" else -1
             base_pipeline.append({"$sort": {pagination.sort_by: sort_direction}})
-        
-        # Pipeline pour compter le total
-        count_pipeline = base_pipeline + [{"$count": "total"}]
-        
-        # Pipeline pour les données paginées
         skip, limit = PaginationHelper.get_skip_limit(pagination.page, pagination.size)
-        data_pipeline = base_pipeline + [
-            {"$skip": skip},
-            {"$limit": limit}
-        ]
-        
-        # Exécuter les deux pipelines
-        count_result = list(await collection.aggregate(count_pipeline).to_list(length=1))
-        total = count_result[0]["total"] if count_result else 0
+        page_stages = [{"$skip": skip}, {"$limit": limit}]
+        if projection:
+            page_stages.append({"$project": projection})
         
-        items = await collection.aggregate(data_pipeline).to_list(length=limit)
+        # Compter et récupérer la page en un seul aller-retour ($facet)
+        facet_pipeline = base_pipeline + [{
+            "$facet": {"items": page_stages, "total": [{"$count": "n"}]}
+        }]
+        items, total = await PaginationHelper.run_facet(collection, facet_pipeline)
         
         # Créer les métadonnées
         meta = PaginationHelper.create_pagination_meta(
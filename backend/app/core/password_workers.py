@@ -0,0 +1,37 @@
+"""
+🔐 EduAI Enhanced - Hachage des mots de passe dans les processus du pool
+Les workers sont lancés avec le contexte 'spawn' : ce module n'importe ni la
+configuration ni les routes, pour que chaque processus démarre vite et sans
+travail à l'import.
+"""
+
+import bcrypt
+from argon2 import PasswordHasher
+from argon2.exceptions import InvalidHashError, VerificationError
+
+# argon2id (paramètres OWASP) appelé directement, sans la couche passlib;
+# les anciens hashes bcrypt sont vérifiés avec bcrypt puis migrés à la connexion
+password_hasher = PasswordHasher(time_cost=2, memory_cost=19456, parallelism=1)
+
+
+def hash_password_sync(password: str) -> str:
+    return password_hasher.hash(password)
+
+
+def verify_and_update(plain_password: str, hashed_password: str) -> tuple:
+    """(valide, nouveau hash argon2id si l'ancien doit être migré, sinon None)"""
+    if hashed_password.startswith("$argon2"):
+        try:
+            password_hasher.verify(hashed_password, plain_password)
+        except (VerificationError, InvalidHashError):
+            return False, None
+        if password_hasher.check_needs_rehash(hashed_password):
+            return True, password_hasher.hash(plain_password)
+        return True, None
+
+    try:
+        # bcrypt n'a jamais lu au-delà de 72 octets (passlib tronquait)
+        valid = bcrypt.checkpw(plain_password.encode()[:72], hashed_password.encode())
+    except ValueError:
+        return False, None
+    return valid, password_hasher.hash(plain_password) if valid else None
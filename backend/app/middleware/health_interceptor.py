@@ -0,0 +1,53 @@
+"""
+🎓 EduAI Enhanced - Intercepteur ASGI des sondes de santé
+Répond à /health/quick et /healthz avant la pile FastAPI (middlewares,
+routage, sérialisation Pydantic) : les sondes Kubernetes n'ont besoin que
+d'un 200 pré-sérialisé.
+"""
+
+import orjson
+
+PROBE_PATHS = frozenset({"/health/quick", "/healthz"})
+
+# Messages ASGI construits une seule fois à l'import
+_OK_BODY = orjson.dumps({"status": "healthy"})
+_OK_START = {
+    "type": "http.response.start",
+    "status": 200,
+    "headers": [
+        (b"content-type", b"application/json"),
+        (b"content-length", str(len(_OK_BODY)).encode()),
+    ],
+}
+_OK_RESPONSE_BODY = {"type": "http.response.body", "body": _OK_BODY}
+
+_NOT_ALLOWED_BODY = orjson.dumps({"detail": "Method Not Allowed"})
+_NOT_ALLOWED_START = {
+    "type": "http.response.start",
+    "status": 405,
+    "headers": [
+        (b"content-type", b"application/json"),
+        (b"content-length", str(len(_NOT_ALLOWED_BODY)).encode()),
+        (b"allow", b"GET"),
+    ],
+}
+_NOT_ALLOWED_RESPONSE_BODY = {"type": "http.response.body", "body": _NOT_ALLOWED_BODY}
+
+
+class HealthCheckInterceptor:
+    """Application ASGI qui court-circuite les sondes de santé"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["path"] in PROBE_PATHS:
+            if scope["method"] == "GET":
+                await send(_OK_START)
+                await send(_OK_RESPONSE_BODY)
+            else:
+                await send(_NOT_ALLOWED_START)
+                await send(_NOT_ALLOWED_RESPONSE_BODY)
+            return
+
+        await self.app(scope, receive, send)
@@ -8,7 +8,7 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import HTMLResponse, JSONResponse
+from fastapi.responses import HTMLResponse, JSONResponse, ORJSONResponse
 from contextlib import asynccontextmanager
 import uvicorn
 import os
@@ -24,6 +24,7 @@ from app.core.i18n import init_i18n
 from app.core.adaptive_services import lifespan_adaptive_services
 from app.middleware.security import SecurityMiddleware
 from app.middleware.rate_limiting import RateLimitMiddleware
+from app.middleware.health_interceptor import HealthCheckInterceptor
 
 # Import des routes API
 from app.api.routes import (
@@ -38,6 +39,8 @@ from app.api.routes import (
     offline
 )
 from app.api.adaptive_learning import router as adaptive_router
+from app.api.health import router as health_router, health_checker
+from app.api.routes.auth import shutdown_password_pool, start_password_pool
 
 # Charger les variables d'environnement
 load_dotenv()
@@ -56,13 +59,20 @@ async def lifespan(app: FastAPI):
     await init_database()
     setup_logging()
     init_i18n()
+    await start_password_pool()
     
     # Démarrer les services adaptatifs
     async with lifespan_adaptive_services(app):
         logger.info("✅ Services adaptatifs démarrés")
-        yield
+        health_checker.start()
+        try:
+            yield
+        finally:
+            # Tâches de fond des health checks et client HTTP partagé
+            await health_checker.stop()
     
     # 🛑 SHUTDOWN  
+    shutdown_password_pool()
     logger.info("👋 Arrêt d'EduAI Enhanced Backend...")
 
 # Créer l'application FastAPI
@@ -126,6 +136,14 @@ if settings.environment == "production":
         allowed_hosts=settings.trusted_hosts
     )
 
+# 🚨 Gestionnaire global des erreurs non prévues (les routes ne les enveloppent plus)
+@app.exception_handler(Exception)
+async def unhandled_exception_handler(request: Request, exc: Exception):
+    return ORJSONResponse(
+        {"error": "Erreur interne du serveur", "detail": str(exc), "status": "error"},
+        status_code=500
+    )
+
 # 📊 Middleware pour les métriques de performance
 @app.middleware("http")
 async def add_process_time_header(request: Request, call_next):
@@ -153,6 +171,7 @@ app.include_router(emotion.router, prefix="/api/emotion", tags=["🎭 Reconnaiss
 app.include_router(analytics.router, prefix="/api/analytics", tags=["📊 Analytics"])
 app.include_router(offline.router, prefix="/api/offline", tags=["📱 Mode Offline"])
 app.include_router(adaptive_router, tags=["🎯 Apprentissage Adaptatif"])
+app.include_router(health_router, tags=["🏥 Santé"])
 
 @app.get("/", response_class=HTMLResponse, include_in_schema=False)
 async def root():
@@ -315,30 +334,6 @@ async def root():
     </html>
     """
 
-@app.get("/health", response_class=JSONResponse)
-async def health_check():
-    """Endpoint de vérification de l'état de santé de l'API"""
-    return {
-        "status": "healthy",
-        "service": "EduAI Enhanced API",
-        "version": "1.0.0",
-        "timestamp": time.time(),
-        "features": {
-            "ai_tutor": "✅ Opérationnel",
-            "speech_processing": "✅ Opérationnel", 
-            "emotion_recognition": "✅ Opérationnel",
-            "multilingual_support": "✅ 50+ langues",
-            "pwa_ready": "✅ Offline intelligent",
-            "adaptive_learning": "✅ ML personnalisé"
-        },
-        "performance": {
-            "api_latency": "< 100ms",
-            "ai_response": "< 2s",
-            "uptime": "99.9%"
-        },
-        "message": "🚀 Service IA éducative opérationnel"
-    }
-
 @app.get("/api/manifest", response_class=JSONResponse)
 async def pwa_manifest():
     """Manifest PWA pour installation mobile"""
@@ -367,12 +362,18 @@ async def pwa_manifest():
         "orientation": "any"
     }
 
+# 🏥 Sondes de santé servies avant la pile FastAPI
+fastapi_app = app
+app = HealthCheckInterceptor(fastapi_app)
+
 if __name__ == "__main__":
     uvicorn.run(
         "main:app",
         host=settings.api_host,
         port=settings.api_port,
         reload=settings.debug,
+        loop="uvloop",
+        http="httptools",
         log_level="info",
         access_log=True
     )
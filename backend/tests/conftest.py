@@ -0,0 +1,16 @@
+"""
+Configuration des tests du backend: variables d'environnement obligatoires
+et accès aux modules `app.*` depuis le répertoire backend
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+os.environ.setdefault("SECRET_KEY", "test-secret-key-for-unit-tests-only-0123456789")
+os.environ.setdefault("MONGODB_URL", "mongodb://localhost:27017")
+os.environ.setdefault("REDIS_URL", "redis://localhost:6379/0")
+os.environ.setdefault("OPENAI_API_KEY", "test")
+os.environ.setdefault("ANTHROPIC_API_KEY", "test")
+os.environ.setdefault("ELEVENLABS_API_KEY", "test")
@@ -0,0 +1,123 @@
+import asyncio
+import time
+import unittest
+from unittest.mock import AsyncMock, patch
+
+from pydantic import ValidationError
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from app.api.routes import auth
+
+
+class FakeRedis:
+    """Sous-ensemble de redis.asyncio utilisé par la révocation des tokens"""
+
+    def __init__(self):
+        self.keys = {}
+
+    async def exists(self, key):
+        return int(key in self.keys)
+
+    async def setex(self, key, ttl, value):
+        self.keys[key] = value
+
+
+class TestJwtTokens(unittest.TestCase):
+    def setUp(self):
+        auth._jwt_cache.clear()
+        auth._revoked_tokens.clear()
+        self.redis = FakeRedis()
+        patcher = patch.object(auth, "get_redis", return_value=self.redis)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_access_token_round_trip(self):
+        token = auth.create_access_token({"sub": "user-1"})
+        payload = asyncio.run(auth.decode_token(token))
+        self.assertEqual(payload["sub"], "user-1")
+        self.assertGreater(payload["exp"], time.time())
+
+    def test_refresh_token_requires_refresh_claims(self):
+        token = auth.create_refresh_token("user-1")
+        payload = asyncio.run(auth.decode_token(token, auth._REFRESH_CLAIMS))
+        self.assertEqual(payload["type"], auth.TOKEN_TYPE_REFRESH)
+        with self.assertRaises(auth.InvalidTokenError):
+            asyncio.run(auth.decode_token(token))
+
+    def test_tampered_payload_is_rejected(self):
+        token = auth.create_access_token({"sub": "user-1"})
+        other = auth.create_access_token({"sub": "admin"})
+        header, _, signature = token.split(".")
+        forged = ".".join([header, other.split(".")[1], signature])
+        with self.assertRaises(auth.InvalidTokenError):
+            asyncio.run(auth.decode_token(forged))
+
+    def test_expired_token_is_rejected(self):
+        token = auth._encode_hs256({"sub": "user-1", "exp": int(time.time()) - 1})
+        with self.assertRaises(auth.InvalidTokenError):
+            asyncio.run(auth.decode_token(token))
+
+    def test_token_without_exp_is_rejected(self):
+        token = auth._encode_hs256({"sub": "user-1"})
+        with self.assertRaises(auth.InvalidTokenError):
+            asyncio.run(auth.decode_token(token))
+
+    def test_revoked_token_is_rejected(self):
+        token = auth.create_access_token({"sub": "user-1"})
+        asyncio.run(auth.decode_token(token))
+        asyncio.run(auth.revoke_token(token))
+        with self.assertRaises(auth.InvalidTokenError):
+            asyncio.run(auth.decode_token(token))
+
+    def test_padded_signature_does_not_bypass_revocation(self):
+        token = auth.create_access_token({"sub": "user-1"})
+        asyncio.run(auth.revoke_token(token))
+        for variant in (token + "=", token + "=="):
+            with self.assertRaises(auth.InvalidTokenError):
+                asyncio.run(auth.decode_token(variant))
+
+    def test_revocation_is_shared_through_redis(self):
+        token = auth.create_access_token({"sub": "user-1"})
+        asyncio.run(auth.revoke_token(token))
+        # Autre worker: ni cache local ni miroir de révocation
+        auth._jwt_cache.clear()
+        auth._revoked_tokens.clear()
+        with self.assertRaises(auth.InvalidTokenError):
+            asyncio.run(auth.decode_token(token))
+
+    def test_revocation_on_another_worker_skips_cached_payload(self):
+        token = auth.create_access_token({"sub": "user-1"})
+        asyncio.run(auth.decode_token(token))
+        self.assertTrue(auth._jwt_cache)
+        # Révocation écrite par un autre worker, ce worker a le token en cache
+        self.redis.keys[f"rev:{auth._token_key(token).hex()}"] = 1
+        with self.assertRaises(auth.InvalidTokenError):
+            asyncio.run(auth.decode_token(token))
+
+    def test_redis_outage_falls_back_to_local_revocation(self):
+        token = auth.create_access_token({"sub": "user-1"})
+        self.redis.exists = AsyncMock(side_effect=RedisConnectionError("down"))
+        self.redis.setex = AsyncMock(side_effect=RedisConnectionError("down"))
+        self.assertEqual(asyncio.run(auth.decode_token(token))["sub"], "user-1")
+        asyncio.run(auth.revoke_token(token))
+        with self.assertRaises(auth.InvalidTokenError):
+            asyncio.run(auth.decode_token(token))
+
+
+class TestPasswordBounds(unittest.TestCase):
+    def _register(self, password):
+        return auth.UserRegister(username="ana", email="Ana@Example.com", password=password)
+
+    def test_limit_counts_utf8_bytes(self):
+        # 64 caractères, 128 octets: accepté; un caractère de plus dépasse la borne
+        self.assertEqual(len(self._register("é" * 64).password), 64)
+        with self.assertRaises(ValidationError):
+            self._register("é" * 64 + "a")
+
+    def test_short_password_is_rejected(self):
+        with self.assertRaises(ValidationError):
+            self._register("a" * (auth.MIN_PASSWORD_LENGTH - 1))
+
+
+if __name__ == "__main__":
+    unittest.main()
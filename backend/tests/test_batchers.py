@@ -0,0 +1,102 @@
+import asyncio
+import unittest
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from app.core import database as db_module
+from app.core.database import AnalyticsBatcher, LastActiveBatcher
+
+
+class FakeCollection:
+    """Enregistre les écritures groupées des batchers"""
+
+    def __init__(self):
+        self.inserted = []
+        self.bulk_ops = []
+
+    async def insert_many(self, rows, ordered=True):
+        self.inserted.extend(rows)
+
+    async def bulk_write(self, ops, ordered=True):
+        self.bulk_ops.extend(ops)
+
+
+class BatcherTestCase(unittest.TestCase):
+    def setUp(self):
+        self.db = SimpleNamespace(analytics=FakeCollection(), users=FakeCollection())
+        for name, value in (("database", self.db), ("redis_client", None)):
+            patcher = patch.object(db_module, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+
+class TestAnalyticsBatcher(BatcherTestCase):
+    def test_flush_on_shutdown_writes_queued_events(self):
+        # Intervalle long: seul le flush d'arrêt peut écrire les événements
+        batcher = AnalyticsBatcher(flush_interval_ms=60_000)
+
+        async def scenario():
+            for i in range(3):
+                batcher.enqueue(f"user-{i}", {"event": "lesson_completed"})
+            await asyncio.sleep(0)
+            await batcher.flush()
+
+        asyncio.run(scenario())
+        self.assertEqual([row["user_id"] for row in self.db.analytics.inserted], ["user-0", "user-1", "user-2"])
+        self.assertTrue(all(row["event"] == "lesson_completed" for row in self.db.analytics.inserted))
+
+    def test_batches_are_bounded_by_max_rows(self):
+        batcher = AnalyticsBatcher(max_rows=2, flush_interval_ms=60_000)
+
+        async def scenario():
+            for i in range(5):
+                batcher.enqueue(f"user-{i}", {"event": "quiz"})
+            for _ in range(10):
+                await asyncio.sleep(0)
+            written_before_flush = len(self.db.analytics.inserted)
+            await batcher.flush()
+            return written_before_flush
+
+        written_before_flush = asyncio.run(scenario())
+        self.assertEqual(written_before_flush, 4)
+        self.assertEqual(len(self.db.analytics.inserted), 5)
+
+    def test_flush_without_events_is_a_no_op(self):
+        asyncio.run(AnalyticsBatcher().flush())
+        self.assertEqual(self.db.analytics.inserted, [])
+
+
+class TestLastActiveBatcher(BatcherTestCase):
+    def test_flush_on_shutdown_keeps_latest_timestamp_per_user(self):
+        batcher = LastActiveBatcher(flush_interval=60)
+        earlier = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        later = earlier + timedelta(minutes=5)
+
+        async def scenario():
+            batcher.touch("user-1", earlier)
+            batcher.touch("user-2", earlier)
+            batcher.touch("user-1", later)
+            await batcher.flush()
+
+        asyncio.run(scenario())
+        updates = {op._filter["_id"]: op._doc for op in self.db.users.bulk_ops}
+        self.assertEqual(updates, {
+            "user-1": {"$max": {"last_active": later}},
+            "user-2": {"$max": {"last_active": earlier}},
+        })
+
+    def test_pending_updates_are_written_once(self):
+        batcher = LastActiveBatcher(flush_interval=60)
+
+        async def scenario():
+            batcher.touch("user-1", datetime.now(timezone.utc))
+            await batcher.flush()
+            await batcher.flush()
+
+        asyncio.run(scenario())
+        self.assertEqual(len(self.db.users.bulk_ops), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
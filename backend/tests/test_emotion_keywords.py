@@ -0,0 +1,38 @@
+import unittest
+
+from app.api.routes import ai_tutor
+
+SAMPLES = [
+    "whatever",
+    "C'est super, mais je ne comprends pas",
+    "Wow, c'est facile et génial",
+    "I hate this, it's so difficult",
+    "huh? confused",
+    "Je suis sûr et certain",
+    "amazing, I love it",
+    "rien de spécial",
+    "",
+]
+
+
+class TestEmotionKeywords(unittest.TestCase):
+    def test_overlapping_keywords_keep_baseline_priority(self):
+        self.assertEqual(ai_tutor._EMOTIONS_BY_PRIORITY[min(ai_tutor._regex_priorities("whatever"))], "frustrated")
+
+    def test_regex_fallback_matches_automaton(self):
+        if ai_tutor._EMOTION_AUTOMATON is None:
+            self.skipTest("pyahocorasick non installé")
+        for text in SAMPLES:
+            with self.subTest(text=text):
+                self.assertEqual(
+                    min(ai_tutor._regex_priorities(text.lower()), default=None),
+                    min(ai_tutor._automaton_priorities(text.lower()), default=None)
+                )
+
+    def test_analyze_emotion(self):
+        self.assertEqual(ai_tutor.analyze_emotion("Whatever", "en")["emotion"], "frustrated")
+        self.assertEqual(ai_tutor.analyze_emotion("rien", "fr")["emotion"], "neutral")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,51 @@
+import asyncio
+import unittest
+
+from app.core.event_sourcing import EventPublisher, EventStore, EventType, LearningEvent
+
+
+class RecordingSubscriber:
+    def __init__(self):
+        self.events = []
+
+    async def handle_event(self, event):
+        self.events.append(event)
+
+
+def _event(i):
+    return LearningEvent(
+        event_type=EventType.INTERACTION_RECORDED,
+        user_id=f"user-{i}",
+        session_id="s_1",
+        data={"interaction_type": "question"}
+    )
+
+
+class TestEventPublisher(unittest.TestCase):
+    def setUp(self):
+        self.store = EventStore()
+        self.publisher = EventPublisher(self.store)
+        self.subscriber = RecordingSubscriber()
+        self.publisher.subscribe(self.subscriber)
+
+    def test_flush_on_shutdown_writes_queued_events(self):
+        events = [_event(i) for i in range(3)]
+
+        async def scenario():
+            ids = [self.publisher.enqueue(event) for event in events]
+            await asyncio.sleep(0)
+            await self.publisher.flush()
+            return ids
+
+        ids = asyncio.run(asyncio.wait_for(scenario(), timeout=5))
+        self.assertEqual(ids, [event.event_id for event in events])
+        self.assertEqual([e.event_id for e in self.store.events], ids)
+        self.assertEqual([e.event_id for e in self.subscriber.events], ids)
+
+    def test_flush_without_events_is_a_no_op(self):
+        asyncio.run(self.publisher.flush())
+        self.assertEqual(self.store.events, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
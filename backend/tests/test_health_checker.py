@@ -0,0 +1,48 @@
+import asyncio
+import unittest
+from unittest.mock import AsyncMock, patch
+
+from app.api import health
+
+
+class TestHealthCheckerLifecycle(unittest.TestCase):
+    def setUp(self):
+        self.checker = health.HealthChecker()
+        # Pas de MongoDB: seules les tâches de fond et le client HTTP sont testés
+        patcher = patch.object(self.checker, "_fetch_dbstats", AsyncMock(return_value={}))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_http_client_survives_a_second_lifespan(self):
+        async def lifespan():
+            self.checker.start()
+            client = self.checker.http
+            open_during_run = not client.is_closed
+            await self.checker.stop()
+            return client, open_during_run
+
+        async def scenario():
+            first, first_open = await lifespan()
+            second, second_open = await lifespan()
+            return first, first_open, second, second_open
+
+        first, first_open, second, second_open = asyncio.run(scenario())
+        self.assertTrue(first_open and second_open)
+        self.assertIsNot(first, second)
+        self.assertTrue(first.is_closed and second.is_closed)
+
+    def test_stop_cancels_background_tasks(self):
+        async def scenario():
+            self.checker.start()
+            tasks = list(self.checker._background_tasks)
+            await self.checker.stop()
+            return tasks
+
+        tasks = asyncio.run(scenario())
+        self.assertTrue(tasks)
+        self.assertTrue(all(task.cancelled() or task.done() for task in tasks))
+        self.assertEqual(self.checker._background_tasks, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
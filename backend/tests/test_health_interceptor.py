@@ -0,0 +1,67 @@
+import asyncio
+import unittest
+
+import orjson
+
+from app.middleware.health_interceptor import HealthCheckInterceptor
+
+
+class RecordingApp:
+    """Application ASGI aval: note les chemins qui la traversent"""
+
+    def __init__(self):
+        self.paths = []
+
+    async def __call__(self, scope, receive, send):
+        self.paths.append(scope["path"])
+        await send({"type": "http.response.start", "status": 204, "headers": []})
+        await send({"type": "http.response.body", "body": b""})
+
+
+def _call(app, path, method="GET", scope_type="http"):
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    asyncio.run(app({"type": scope_type, "path": path, "method": method}, receive, send))
+    return messages
+
+
+class TestHealthCheckInterceptor(unittest.TestCase):
+    def setUp(self):
+        self.downstream = RecordingApp()
+        self.app = HealthCheckInterceptor(self.downstream)
+
+    def test_probe_paths_are_answered_without_the_app(self):
+        for path in ("/health/quick", "/healthz"):
+            with self.subTest(path=path):
+                start, body = _call(self.app, path)
+                self.assertEqual(start["status"], 200)
+                self.assertEqual(orjson.loads(body["body"]), {"status": "healthy"})
+                headers = dict(start["headers"])
+                self.assertEqual(headers[b"content-length"], str(len(body["body"])).encode())
+        self.assertEqual(self.downstream.paths, [])
+
+    def test_non_get_probe_is_rejected(self):
+        start, body = _call(self.app, "/healthz", method="POST")
+        self.assertEqual(start["status"], 405)
+        self.assertEqual(dict(start["headers"])[b"allow"], b"GET")
+        self.assertEqual(self.downstream.paths, [])
+
+    def test_other_paths_reach_the_app(self):
+        for path in ("/health", "/health/deep", "/api/courses"):
+            start, _ = _call(self.app, path)
+            self.assertEqual(start["status"], 204)
+        self.assertEqual(self.downstream.paths, ["/health", "/health/deep", "/api/courses"])
+
+    def test_non_http_scopes_are_passed_through(self):
+        _call(self.app, "/healthz", scope_type="websocket")
+        self.assertEqual(self.downstream.paths, ["/healthz"])
+
+
+if __name__ == "__main__":
+    unittest.main()
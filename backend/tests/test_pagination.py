@@ -0,0 +1,93 @@
+import asyncio
+import unittest
+
+from app.core.pagination import (
+    CoursePaginationParams,
+    MongoDBPaginator,
+    PaginationParams,
+    PaginationPatterns,
+)
+
+
+class FakeCursor:
+    def __init__(self, result):
+        self.result = result
+
+    async def to_list(self, length=None):
+        return self.result
+
+
+class FakeCollection:
+    """Collection qui évalue le $match/$skip/$limit d'un $facet sur des documents en mémoire"""
+
+    def __init__(self, docs):
+        self.docs = docs
+        self.pipelines = []
+
+    def aggregate(self, pipeline):
+        self.pipelines.append(pipeline)
+        docs = list(self.docs)
+        for stage in pipeline:
+            if "$match" in stage:
+                docs = [d for d in docs if all(d.get(k) == v for k, v in stage["$match"].items())]
+            elif "$sort" in stage:
+                for field, direction in reversed(list(stage["$sort"].items())):
+                    docs.sort(key=lambda d: d[field], reverse=direction == -1)
+            elif "$facet" in stage:
+                items = docs
+                for page_stage in stage["$facet"]["items"]:
+                    if "$skip" in page_stage:
+                        items = items[page_stage["$skip"]:]
+                    elif "$limit" in page_stage:
+                        items = items[:page_stage["$limit"]]
+                total = [{"n": len(docs)}] if docs else []
+                return FakeCursor([{"items": items, "total": total}])
+        raise AssertionError("pipeline sans $facet")
+
+
+DOCS = [{"_id": i, "title": f"Cours {i:02d}", "is_published": i % 2 == 0} for i in range(25)]
+
+
+class TestFacetPagination(unittest.TestCase):
+    def test_page_and_total_in_one_pipeline(self):
+        collection = FakeCollection(DOCS)
+        pagination = CoursePaginationParams(page=2, size=10, sort_by="title", sort_order="desc")
+        result = asyncio.run(MongoDBPaginator(collection).paginate(pagination=pagination))
+
+        self.assertEqual(len(collection.pipelines), 1)
+        self.assertEqual(result.meta.total_items, 25)
+        self.assertEqual(result.meta.total_pages, 3)
+        self.assertEqual([d["_id"] for d in result.items], list(range(14, 4, -1)))
+
+    def test_sort_runs_before_facet(self):
+        collection = FakeCollection(DOCS)
+        pagination = PaginationParams(page=1, size=5, sort_by="title")
+        asyncio.run(MongoDBPaginator(collection).paginate(pagination=pagination, projection={"title": 1}))
+
+        stages = [next(iter(stage)) for stage in collection.pipelines[0]]
+        self.assertEqual(stages, ["$match", "$sort", "$facet"])
+        self.assertIn({"$project": {"title": 1}}, collection.pipelines[0][-1]["$facet"]["items"])
+
+    def test_filters_apply_to_total(self):
+        collection = FakeCollection(DOCS)
+        result = asyncio.run(MongoDBPaginator(collection).paginate(
+            pagination=PaginationParams(page=1, size=5),
+            additional_filters={"is_published": True}
+        ))
+        self.assertEqual(result.meta.total_items, 13)
+        self.assertTrue(result.meta.has_next)
+
+    def test_empty_result_has_zero_total(self):
+        collection = FakeCollection([])
+        result = asyncio.run(PaginationPatterns.paginate_with_aggregation(
+            collection=collection,
+            pipeline=[{"$match": {"is_published": True}}],
+            pagination=PaginationParams(page=1, size=5)
+        ))
+        self.assertEqual(result.items, [])
+        self.assertEqual(result.meta.total_items, 0)
+        self.assertFalse(result.meta.has_next)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,104 @@
+import asyncio
+import unittest
+from datetime import datetime, timezone
+
+import fakeredis
+
+from app.api.routes import ai_tutor
+from app.api.routes.ai_tutor import ChatMessage, LearningSession, RedisSessionStore
+
+
+def _session(session_id="s_1", user_id="user-1"):
+    return LearningSession(
+        session_id=session_id,
+        user_id=user_id,
+        subject="mathematics",
+        started_at=datetime(2024, 1, 1, tzinfo=timezone.utc)
+    )
+
+
+def _message(content, emotion=None):
+    return ChatMessage(
+        role="user",
+        content=content,
+        timestamp=datetime.now(timezone.utc),
+        emotion_detected=emotion
+    )
+
+
+class TestRedisSessionStore(unittest.TestCase):
+    def setUp(self):
+        self.redis = fakeredis.aioredis.FakeRedis(decode_responses=True)
+        self.store = RedisSessionStore(self.redis)
+
+    def run_async(self, coro):
+        return asyncio.run(coro)
+
+    def test_session_round_trip(self):
+        session = _session()
+
+        async def scenario():
+            await self.store.create(session)
+            await self.store.append_messages(session, _message("bonjour"), _message("super", "happy"))
+            session.performance_metrics["satisfaction_score"] = 4
+            await self.store.save_metrics(session)
+            return await self.store.load(session.session_id)
+
+        loaded = self.run_async(scenario())
+        self.assertEqual(loaded.user_id, "user-1")
+        self.assertEqual(loaded.subject, "mathematics")
+        self.assertEqual([m.content for m in loaded.messages], ["bonjour", "super"])
+        self.assertEqual(loaded.performance_metrics, {"satisfaction_score": 4})
+
+    def test_unknown_session_loads_as_none(self):
+        self.assertIsNone(self.run_async(self.store.load("missing")))
+
+    def test_messages_are_bounded(self):
+        session = _session()
+        messages = [_message(str(i)) for i in range(ai_tutor.MAX_SESSION_MESSAGES + 5)]
+
+        async def scenario():
+            await self.store.create(session)
+            await self.store.append_messages(session, *messages)
+            return await self.store.load(session.session_id)
+
+        loaded = self.run_async(scenario())
+        self.assertEqual(len(loaded.messages), ai_tutor.MAX_SESSION_MESSAGES)
+        self.assertEqual(loaded.messages[-1].content, messages[-1].content)
+
+    def test_keys_expire_with_session_ttl(self):
+        session = _session()
+
+        async def scenario():
+            await self.store.create(session)
+            await self.store.append_messages(session, _message("quoi ?", "confused"))
+            keys = await self.redis.keys("*")
+            return {key: await self.redis.ttl(key) for key in keys}
+
+        ttls = self.run_async(scenario())
+        self.assertEqual(len(ttls), 7)
+        for key, ttl in ttls.items():
+            self.assertTrue(0 < ttl <= ai_tutor.SESSION_TTL_SECONDS, key)
+
+    def test_list_for_user_and_counters(self):
+        first, second = _session("s_1"), _session("s_2")
+        second.started_at = datetime(2024, 1, 2, tzinfo=timezone.utc)
+
+        async def scenario():
+            for session in (first, second):
+                await self.store.create(session)
+                await self.store.append_messages(session, _message("génial", "happy"))
+            listed = await self.store.list_for_user("user-1", limit=1)
+            counters = await self.store.user_counters("user-1")
+            return listed, counters
+
+        (total, sessions), counters = self.run_async(scenario())
+        self.assertEqual(total, 2)
+        self.assertEqual([s.session_id for s in sessions], ["s_2"])
+        self.assertEqual(counters["total_messages"], 2)
+        self.assertEqual(counters["emotions"]["happy"], 2)
+        self.assertEqual(counters["subjects"]["mathematics"], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()